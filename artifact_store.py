@@ -0,0 +1,97 @@
+"""Armazenamento persistente dos artefatos gerados, por projeto (SQLite, conteúdo comprimido)
+
+Cada geração grava uma nova versão do artefato; ao reconectar (refresh, queda
+do websocket, reinício do pod) a sessão recupera a versão mais recente de cada
+um, sem chamar os modelos de novo.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from config import ARTIFACT_DB, ARTIFACT_MAX_VERSIONS
+
+
+class ArtifactStore:
+    """Versões de cada artefato por projeto, serializadas em JSON e comprimidas com zlib"""
+
+    def __init__(self, path: str, max_versions: int):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.max_versions = max_versions
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS artifacts (
+                project_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (project_id, name, version)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def save(self, project_id: str, name: str, value: Any) -> int:
+        """Grava uma nova versão e retorna o número dela; versões além do limite são descartadas"""
+        raw = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            latest = self._conn.execute(
+                "SELECT COALESCE(MAX(version), 0) FROM artifacts WHERE project_id = ? AND name = ?",
+                (project_id, name),
+            ).fetchone()[0]
+            version = latest + 1
+            self._conn.execute(
+                "INSERT INTO artifacts (project_id, name, version, created_at, size, data) VALUES (?, ?, ?, ?, ?, ?)",
+                (project_id, name, version, time.time(), len(raw), zlib.compress(raw)),
+            )
+            self._conn.execute(
+                "DELETE FROM artifacts WHERE project_id = ? AND name = ? AND version <= ?",
+                (project_id, name, version - self.max_versions),
+            )
+            self._conn.commit()
+        return version
+
+    def load(self, project_id: str, name: str, version: Optional[int] = None) -> Any:
+        """Versão pedida (ou a mais recente) do artefato; None se não existir"""
+        query = "SELECT data FROM artifacts WHERE project_id = ? AND name = ?"
+        params = [project_id, name]
+        if version is not None:
+            query += " AND version = ?"
+            params.append(version)
+        with self._lock:
+            row = self._conn.execute(query + " ORDER BY version DESC LIMIT 1", params).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def latest_versions(self, project_id: str) -> Dict[str, int]:
+        """Nome -> versão mais recente, sem descomprimir o conteúdo"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, MAX(version) FROM artifacts WHERE project_id = ? GROUP BY name",
+                (project_id,),
+            ).fetchall()
+        return dict(rows)
+
+    def versions(self, project_id: str, name: str) -> List[Dict]:
+        """Histórico de versões de um artefato, da mais recente para a mais antiga"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT version, created_at, size FROM artifacts WHERE project_id = ? AND name = ? "
+                "ORDER BY version DESC",
+                (project_id, name),
+            ).fetchall()
+        return [{"version": v, "created_at": created_at, "size": size} for v, created_at, size in rows]
+
+
+@lru_cache(maxsize=None)
+def get_artifact_store() -> ArtifactStore:
+    """Instância única do armazenamento por processo"""
+    return ArtifactStore(ARTIFACT_DB, max_versions=ARTIFACT_MAX_VERSIONS)
@@ -0,0 +1,262 @@
+"""Cliente da Data API do Astra DB com conexões persistentes e retentativas"""
+import asyncio
+import random
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+from config import (
+    ASTRA_CONNECT_TIMEOUT,
+    ASTRA_DB_API_BASE,
+    ASTRA_DB_TOKEN,
+    ASTRA_MAX_RETRIES,
+    ASTRA_POOL_SIZE,
+    ASTRA_READ_TIMEOUT,
+    EMBEDDING_DIMENSION,
+    NAMESPACE,
+)
+from rag import clean_projection
+from rate_limit import get_scheduler
+from telemetry import note, span
+
+try:
+    import httpx
+    import h2  # noqa: F401  (o httpx só negocia HTTP/2 com o pacote h2 instalado)
+except ImportError:
+    httpx = None
+
+# Falhas de rede que valem uma nova tentativa, conforme o transporte em uso
+TRANSIENT_ERRORS = (
+    (httpx.TransportError,) if httpx is not None else (requests.ConnectionError, requests.Timeout)
+)
+
+# Status que indicam sobrecarga ou falha transitória do servidor
+RETRY_STATUS = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 0.25  # segundos
+BACKOFF_MAX = 8.0
+
+
+def _backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Espera exponencial com jitter completo, respeitando Retry-After quando informado"""
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX)
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def vector_search_payload(vector: List[float], limit: int, projection: Optional[Dict],
+                          include_vector: bool) -> Dict:
+    """Comando find da busca vetorial; include_vector pede também $vector e $similarity"""
+    projection = clean_projection(projection)
+    options = {"limit": limit}
+    if include_vector:
+        # Numa projeção de exclusão ({"$vector": 0}) o vetor exige pedir todos os campos
+        inclusive = any(projection.values())
+        projection = {**projection, "$vector": 1} if inclusive else {"*": 1}
+        options["includeSimilarity"] = True
+    return {
+        "find": {
+            "sort": {"$vector": vector},
+            "projection": projection,
+            "options": options
+        }
+    }
+
+
+class AstraDBClient:
+    def __init__(self, api_base: str = ASTRA_DB_API_BASE, token: str = ASTRA_DB_TOKEN,
+                 namespace: str = NAMESPACE, pool_size: int = ASTRA_POOL_SIZE,
+                 max_retries: int = ASTRA_MAX_RETRIES,
+                 connect_timeout: float = ASTRA_CONNECT_TIMEOUT,
+                 read_timeout: float = ASTRA_READ_TIMEOUT):
+        self.base_url = f"{api_base}/api/json/v1/{namespace}"
+        self.headers = {
+            "Content-Type": "application/json",
+            "x-cassandra-token": token,
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip"
+        }
+        self.max_retries = max_retries
+        self.timeout = (connect_timeout, read_timeout)
+        self._session = self._build_session(pool_size)
+
+    def _build_session(self, pool_size: int):
+        """Sessão HTTP reutilizável: HTTP/2 via httpx quando disponível, senão requests com pool"""
+        if httpx is not None:
+            return httpx.Client(
+                http2=True,
+                headers=self.headers,
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0])
+            )
+        session = requests.Session()
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _post(self, url: str, payload: Dict):
+        """POST com retentativas em 429/5xx e falhas de conexão; retorna a última resposta"""
+        scheduler = get_scheduler("astra")
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                with scheduler.slot():
+                    if httpx is not None:
+                        response = self._session.post(url, json=payload)
+                    else:
+                        response = self._session.post(url, json=payload, timeout=self.timeout)
+            except TRANSIENT_ERRORS:
+                if last_attempt:
+                    raise
+                note("retries")
+                time.sleep(_backoff(attempt))
+                continue
+            if response.status_code == 429:
+                scheduler.report_rate_limited()
+            if response.status_code not in RETRY_STATUS or last_attempt:
+                return response
+            note("retries")
+            time.sleep(_backoff(attempt, response.headers.get("Retry-After")))
+
+    def create_collection(self, collection: str, dimension: int = EMBEDDING_DIMENSION, metric: str = "cosine"):
+        """Cria a coleção vetorial com a dimensão do perfil de embedding (sem efeito se já existe igual)"""
+        payload = {"createCollection": {
+            "name": collection,
+            "options": {"vector": {"dimension": dimension, "metric": metric}},
+        }}
+        response = self._post(self.base_url, payload)
+        response.raise_for_status()
+        data = response.json()
+        if data.get("errors"):
+            raise RuntimeError(f"Erro da Data API: {data['errors']}")
+
+    def find(self, collection: str, filter: Optional[Dict] = None, projection: Optional[Dict] = None,
+             page_state: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Lê uma página de documentos; retorna os documentos e o estado da próxima página"""
+        options = {"pageState": page_state} if page_state else {}
+        payload = {"find": {"filter": filter or {}, "options": options}}
+        if projection:
+            payload["find"]["projection"] = projection
+        response = self._post(f"{self.base_url}/{collection}", payload)
+        response.raise_for_status()
+        data = response.json()
+        if data.get("errors"):
+            raise RuntimeError(f"Erro da Data API: {data['errors']}")
+        return data["data"]["documents"], data["data"].get("nextPageState")
+
+    def insert_many(self, collection: str, documents: List[Dict]) -> Tuple[int, int]:
+        """Insere sem ordem; retorna (inseridos, já existentes). _ids repetidos não contam como erro"""
+        payload = {"insertMany": {"documents": documents, "options": {"ordered": False}}}
+        response = self._post(f"{self.base_url}/{collection}", payload)
+        response.raise_for_status()
+        data = response.json()
+        errors = [error for error in data.get("errors", []) if error.get("errorCode") != "DOCUMENT_ALREADY_EXISTS"]
+        if errors:
+            raise RuntimeError(f"Erro da Data API: {errors}")
+        inserted = len(data.get("status", {}).get("insertedIds", []))
+        return inserted, len(documents) - inserted
+
+    def vector_search(self, collection: str, vector: List[float], limit: int = 3,
+                      projection: Optional[Dict] = None, include_vector: bool = False) -> List[Dict]:
+        """Realiza busca por similaridade vetorial, retornando apenas os campos projetados.
+
+        include_vector devolve também $vector e $similarity, para reordenação local.
+        """
+        url = f"{self.base_url}/{collection}"
+        payload = vector_search_payload(vector, limit, projection, include_vector)
+        with span("astra.vector_search") as current:
+            try:
+                response = self._post(url, payload)
+                response.raise_for_status()
+                documents = response.json()["data"]["documents"]
+                current.set(documents=len(documents))
+                return documents
+            except Exception as e:
+                # O erro é exibido e não propagado, então é anotado no span aqui
+                current.error = type(e).__name__
+                st.error(f"Erro na busca vetorial: {str(e)}")
+                st.error(f"Resposta da API: {response.text if 'response' in locals() else 'N/A'}")
+                return []
+
+
+@lru_cache(maxsize=None)
+def get_astra_client() -> AstraDBClient:
+    """Cliente único por processo, compartilhado entre sessões e reruns"""
+    return AstraDBClient()
+
+
+
+
+class AsyncAstraDBClient:
+    """Busca vetorial com httpx.AsyncClient, para o laço de eventos de async_providers.py (busca antecipada).
+
+    Mesmas retentativas e escalonador do cliente síncrono; os erros são
+    propagados, pois o laço não tem como exibir st.error na página.
+    """
+
+    def __init__(self, api_base: str = ASTRA_DB_API_BASE, token: str = ASTRA_DB_TOKEN,
+                 namespace: str = NAMESPACE, pool_size: int = ASTRA_POOL_SIZE,
+                 max_retries: int = ASTRA_MAX_RETRIES,
+                 connect_timeout: float = ASTRA_CONNECT_TIMEOUT,
+                 read_timeout: float = ASTRA_READ_TIMEOUT):
+        from httpx import AsyncClient, Limits, Timeout, TransportError
+
+        self.base_url = f"{api_base}/api/json/v1/{namespace}"
+        self.max_retries = max_retries
+        self._transient = (TransportError,)
+        self._session = AsyncClient(
+            http2=httpx is not None,
+            headers={
+                "Content-Type": "application/json",
+                "x-cassandra-token": token,
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip"
+            },
+            limits=Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=Timeout(read_timeout, connect=connect_timeout)
+        )
+
+    async def _post(self, url: str, payload: Dict):
+        scheduler = get_scheduler("astra")
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                async with scheduler.async_slot():
+                    response = await self._session.post(url, json=payload)
+            except self._transient:
+                if last_attempt:
+                    raise
+                note("retries")
+                await asyncio.sleep(_backoff(attempt))
+                continue
+            if response.status_code == 429:
+                scheduler.report_rate_limited()
+            if response.status_code not in RETRY_STATUS or last_attempt:
+                return response
+            note("retries")
+            await asyncio.sleep(_backoff(attempt, response.headers.get("Retry-After")))
+
+    async def vector_search(self, collection: str, vector: List[float], limit: int = 3,
+                            projection: Optional[Dict] = None, include_vector: bool = False) -> List[Dict]:
+        """Versão assíncrona de AstraDBClient.vector_search"""
+        payload = vector_search_payload(vector, limit, projection, include_vector)
+        with span("astra.vector_search") as current:
+            response = await self._post(f"{self.base_url}/{collection}", payload)
+            response.raise_for_status()
+            documents = response.json()["data"]["documents"]
+            current.set(documents=len(documents))
+            return documents
+
+
+@lru_cache(maxsize=None)
+def get_async_astra_client() -> AsyncAstraDBClient:
+    """Cliente assíncrono único por processo (só usado no laço de eventos de async_providers.py)"""
+    return AsyncAstraDBClient()
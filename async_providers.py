@@ -0,0 +1,184 @@
+"""Camada assíncrona dos provedores: Gemini, OpenAI e Astra num único laço de eventos.
+
+O laço roda numa thread própria do processo e é compartilhado por todas as
+sessões. As páginas enviam corrotinas com get_async_runner().submit() e
+recebem futures comuns, então várias gerações correm juntas sem uma thread
+por chamada. Cada provedor continua passando pelo seu escalonador (limites
+por minuto, prioridade e AIMD), e o laço limita as corrotinas simultâneas em
+ASYNC_MAX_CONCURRENCY. Os caches (pré-computado, de respostas, semântico e
+de embeddings) são os mesmos da versão síncrona. A busca vetorial no Astra
+usa astra.AsyncAstraDBClient (httpx.AsyncClient) e é usada pela busca
+antecipada de prefetch.py.
+"""
+import asyncio
+import contextlib
+import contextvars
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Coroutine, List, Optional
+
+from config import (
+    ASYNC_MAX_CONCURRENCY,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_DIMENSION,
+    EMBEDDING_MODEL,
+    GEMINI_GENERATION_CONFIG,
+    GEMINI_MODEL,
+    SEMANTIC_CACHE_ENABLED,
+)
+from embedding_cache import get_embedding_cache
+from llm_cache import cache_key, get_completion_cache
+from prompting import count_tokens
+from providers import get_async_openai_client, get_gemini_model
+from rate_limit import get_scheduler
+from semantic_cache import SemanticPrompt, get_semantic_cache, semantic_scope, semantic_text
+from telemetry import record_usage, span
+from warm_cache import get_warm_cache
+
+
+@dataclass
+class GeneratedText:
+    """Resposta completa e de onde veio (warm, hit, semantic, miss ou bypass)"""
+    text: str
+    cache: str
+    similarity: float = 0.0
+
+
+def _transfer(future: Future, task: asyncio.Task):
+    if task.cancelled():
+        future.set_exception(asyncio.CancelledError())
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+
+class AsyncRunner:
+    """Laço de eventos numa thread daemon; aceita corrotinas de qualquer thread"""
+
+    def __init__(self, max_concurrency: int):
+        self.loop = asyncio.new_event_loop()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        threading.Thread(target=self.loop.run_forever, name="async-providers", daemon=True).start()
+
+    async def _limited(self, coro: Coroutine, gate: Optional[asyncio.Semaphore]):
+        # O limite próprio (gate) vem antes do global, para quem espera por ele não ocupar vaga do laço
+        async with gate or contextlib.nullcontext(), self._semaphore:
+            return await coro
+
+    def submit(self, coro: Coroutine, gate: Optional[asyncio.Semaphore] = None) -> Future:
+        """Agenda a corrotina com o contexto de quem chamou (marcas da telemetria e prioridade)
+
+        gate é um limite adicional de um grupo de corrotinas (as buscas antecipadas, por exemplo).
+        """
+        future = Future()
+        future.set_running_or_notify_cancel()
+        context = contextvars.copy_context()
+
+        def start():
+            # A task herda o contexto vigente na sua criação
+            task = context.run(self.loop.create_task, self._limited(coro, gate))
+            task.add_done_callback(lambda done: _transfer(future, done))
+
+        self.loop.call_soon_threadsafe(start)
+        return future
+
+
+@lru_cache(maxsize=None)
+def get_async_runner() -> AsyncRunner:
+    """Laço único por processo"""
+    return AsyncRunner(ASYNC_MAX_CONCURRENCY)
+
+
+async def embed_texts_async(texts: List[str], dimension: int = EMBEDDING_DIMENSION) -> List[List[float]]:
+    """Versão assíncrona de generation.embed_texts, com o AsyncOpenAI"""
+    with span("openai.embed") as current:
+        cache = get_embedding_cache(EMBEDDING_MODEL, dimension)
+        unique = [text for text in dict.fromkeys(texts) if text]
+        # Os caches são SQLite síncronos: ficam fora do laço para não travar as outras gerações
+        found = await asyncio.to_thread(cache.get_many, unique)
+        missing = [text for text in unique if text not in found]
+        current.set(texts=len(unique), cache_hits=len(found), cache="hit" if not missing else "miss")
+        for start in range(0, len(missing), EMBEDDING_BATCH_SIZE):
+            batch = missing[start:start + EMBEDDING_BATCH_SIZE]
+            response = await get_scheduler("openai").call_async(
+                get_async_openai_client().embeddings.create,
+                input=batch,
+                model=EMBEDDING_MODEL,
+                dimensions=dimension,
+                tokens=sum(count_tokens(text) for text in batch)
+            )
+            record_usage(current, getattr(response, "usage", None), "\n".join(batch))
+            vectors = {batch[item.index]: item.embedding for item in response.data}
+            await asyncio.to_thread(cache.put_many, vectors)
+            found.update(vectors)
+        return [found.get(text, []) for text in texts]
+
+
+async def _semantic_lookup(prompt: str, semantic: Optional[SemanticPrompt], bypass_cache: bool):
+    """Mesma consulta de shared._semantic_lookup; falha no embedding só desativa o cache semântico"""
+    if not SEMANTIC_CACHE_ENABLED or semantic is None or not any(semantic.inputs()):
+        return None, None
+    scope = semantic_scope(GEMINI_MODEL, GEMINI_GENERATION_CONFIG, prompt, semantic)
+    if scope is None:
+        return None, None
+    query = semantic_text(semantic.inputs())
+    try:
+        vector = (await embed_texts_async([query]))[0]
+    except Exception:
+        return None, None
+    if not vector:
+        return None, None
+    entry = (scope, query, vector)
+    if bypass_cache:
+        return entry, None
+    return entry, await asyncio.to_thread(get_semantic_cache().get, *entry)
+
+
+async def generate_stream_async(prompt: str, on_text: Optional[Callable[[str], None]] = None,
+                                semantic: Optional[SemanticPrompt] = None,
+                                bypass_cache: bool = False) -> GeneratedText:
+    """Geração do Gemini em streaming (generate_content_async); on_text recebe o texto parcial"""
+    with span("gemini.stream") as current:
+        cache = get_completion_cache()
+        key = cache_key(GEMINI_MODEL, GEMINI_GENERATION_CONFIG, prompt)
+        if not bypass_cache:
+            warmed = await asyncio.to_thread(get_warm_cache().get, key)
+            if warmed is not None:
+                current.set(cache="warm")
+                return GeneratedText(warmed, "warm")
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                current.set(cache="hit")
+                return GeneratedText(cached, "hit")
+
+        semantic_entry, hit = await _semantic_lookup(prompt, semantic, bypass_cache)
+        if hit is not None:
+            current.set(cache="semantic", similarity=hit["similarity"])
+            return GeneratedText(hit["value"], "semantic", hit["similarity"])
+        status = "bypass" if bypass_cache else "miss"
+        current.set(cache=status)
+
+        text = ""
+        usage = None
+        started = time.perf_counter()
+        async with get_scheduler("gemini").async_slot(tokens=count_tokens(prompt)):
+            response = await get_gemini_model().generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                try:
+                    text += chunk.text
+                except ValueError:
+                    continue
+                if "first_token_ms" not in current.attributes:
+                    current.set(first_token_ms=(time.perf_counter() - started) * 1000)
+                if on_text is not None:
+                    on_text(text)
+        record_usage(current, usage, prompt, text)
+        await asyncio.to_thread(cache.set, key, GEMINI_MODEL, text)
+        if semantic_entry is not None:
+            await asyncio.to_thread(get_semantic_cache().set, *semantic_entry, text)
+        return GeneratedText(text, status)
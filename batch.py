@@ -0,0 +1,152 @@
+"""Modo em lote: executa os pipelines sobre um arquivo de briefs (JSONL ou CSV).
+
+Uso: python batch.py briefs.jsonl --pipelines tension,insights,swot --workers 4 --output resultados.jsonl
+
+Cada brief concluído é gravado imediatamente no arquivo de saída; ao rodar de
+novo com a mesma saída, os briefs já concluídos são pulados. Etapas refeitas
+de um brief interrompido saem do cache de respostas, sem nova chamada ao modelo.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Set
+
+from config import BATCH_WORKERS
+from pipelines import PIPELINES, run_pipelines
+from rate_limit import PRIORITY_BATCH, set_default_priority
+from telemetry import tagged
+
+
+def read_briefs(path: str) -> List[Dict]:
+    """Lê os briefs; sem campo id (ou com id vazio), usa "#<posição no arquivo>".
+
+    Levanta ValueError com ids repetidos, que fariam um brief ser pulado como já concluído.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            briefs = list(csv.DictReader(f))
+        else:
+            briefs = [json.loads(line) for line in f if line.strip()]
+    # O prefixo # separa os ids por posição dos ids explícitos ("3" não colide com o 4º brief)
+    positions: Dict[str, List[int]] = {}
+    for position, brief in enumerate(briefs):
+        explicit = "id" in brief and brief["id"] not in (None, "")
+        brief["id"] = str(brief["id"]) if explicit else f"#{position}"
+        positions.setdefault(brief["id"], []).append(position)
+    repeated = {brief_id: found for brief_id, found in positions.items() if len(found) > 1}
+    if repeated:
+        details = "; ".join(f"{brief_id} (posições {', '.join(map(str, found))})" for brief_id, found in repeated.items())
+        raise ValueError(f"Ids de brief repetidos em {path}: {details}")
+    return briefs
+
+
+def completed_ids(path: str) -> Set[str]:
+    """Ids já concluídos com sucesso em uma execução anterior"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Última linha truncada por uma interrupção no meio da escrita
+                continue
+            if "error" not in record:
+                done.add(str(record["id"]))
+    return done
+
+
+class CheckpointWriter:
+    """Anexa um registro por brief ao JSONL de saída, com fsync para sobreviver a quedas"""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, record: Dict):
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def run_batch(briefs: List[Dict], pipelines: List[str], output: str, workers: int = BATCH_WORKERS) -> Dict:
+    """Processa os briefs pendentes com até `workers` em paralelo e devolve as estatísticas da execução"""
+    done = completed_ids(output)
+    pending = [brief for brief in briefs if brief["id"] not in done]
+    writer = CheckpointWriter(output)
+    started = time.perf_counter()
+    succeeded = failed = 0
+
+    def process(brief: Dict) -> Dict:
+        brief_started = time.perf_counter()
+        try:
+            with tagged(page="lote"):
+                results = run_pipelines(brief, pipelines)
+            record = {"id": brief["id"], **results}
+        except Exception as e:
+            record = {"id": brief["id"], "error": f"{type(e).__name__}: {e}"}
+        record["seconds"] = round(time.perf_counter() - brief_started, 2)
+        writer.write(record)
+        return record
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(process, brief) for brief in pending]
+            for count, future in enumerate(as_completed(futures), start=1):
+                record = future.result()
+                if "error" in record:
+                    failed += 1
+                else:
+                    succeeded += 1
+                elapsed = time.perf_counter() - started
+                print(f"[{count}/{len(pending)}] {record['id']} "
+                      f"{'erro' if 'error' in record else 'ok'} · {count / elapsed * 60:.1f} briefs/min",
+                      file=sys.stderr)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - started
+    return {
+        "briefs": len(briefs),
+        "skipped": len(briefs) - len(pending),
+        "succeeded": succeeded,
+        "failed": failed,
+        "seconds": round(elapsed, 2),
+        "briefs_per_minute": round(succeeded / elapsed * 60, 2) if elapsed and succeeded else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa os pipelines estratégicos sobre um lote de briefs")
+    parser.add_argument("briefs", help="Arquivo JSONL ou CSV com os briefs")
+    parser.add_argument("--pipelines", default="tension,insights,swot",
+                        help=f"Pipelines em ordem, separados por vírgula ({', '.join(PIPELINES)})")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="Briefs processados em paralelo")
+    parser.add_argument("--output", default="resultados.jsonl", help="JSONL de saída (também serve de checkpoint)")
+    args = parser.parse_args()
+
+    pipelines = [name.strip() for name in args.pipelines.split(",") if name.strip()]
+    unknown = [name for name in pipelines if name not in PIPELINES]
+    if unknown:
+        parser.error(f"Pipelines desconhecidos: {', '.join(unknown)}")
+    # Cliques interativos de outros processos passam na frente quando os limites são compartilhados
+    set_default_priority(PRIORITY_BATCH)
+    try:
+        briefs = read_briefs(args.briefs)
+    except ValueError as e:
+        parser.error(str(e))
+    result = run_batch(briefs, pipelines, args.output, workers=args.workers)
+    print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
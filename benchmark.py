@@ -0,0 +1,541 @@
+"""Benchmark offline dos pipelines das páginas, com substitutos locais e determinísticos dos provedores.
+
+Uso: python benchmark.py --iterations 5 --output bench.json [--baseline bench_anterior.json]
+
+Substitutos:
+- Gemini: resposta determinística por prompt, com latência até o primeiro token
+  e taxa de tokens/s configuráveis (também em streaming);
+- embeddings da OpenAI: vetores determinísticos derivados do hash do texto;
+- Data API do Astra: servidor HTTP local que responde ao comando `find`
+  (busca vetorial por cosseno e leitura paginada) sobre um corpus fixo.
+
+Cada cenário corresponde a uma página e é executado com um brief diferente
+por iteração (caches frios, em diretório temporário) ou sempre o mesmo
+(--warm). As entradas de selectbox usam as opções reais das páginas, uma
+combinação por iteração; o cenário analises_selectbox_warm roda antes o
+warm_cache.py, como em produção, e mede as respostas servidas pelo
+artefato. O relatório traz percentis de latência, chamadas por provedor e
+tamanho dos prompts; com --baseline, compara com uma execução anterior e
+termina com código 1 se houver regressão.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from prompts import BUDGET_RANGES, CAMPAIGN_GOALS, KPI_GOALS, MARKET_POSITIONS, ORG_SIZES, PROJECT_SCOPES
+
+FOLLOWUP_QUESTIONS = [
+    "Quais tendências do setor afetam o desafio",
+    "Que dados de clientes existem",
+    "Quais concorrentes já resolveram isso",
+]
+
+
+@dataclass
+class FakeSettings:
+    """Latências dos substitutos; fixas para que execuções em commits diferentes sejam comparáveis"""
+    gemini_first_token_ms: float = 80.0
+    gemini_tokens_per_second: float = 800.0
+    gemini_output_tokens: int = 200
+    embedding_ms: float = 30.0
+    astra_ms: float = 15.0
+    corpus_size: int = 200
+
+
+class CallCounter:
+    """Contadores das chamadas recebidas pelos substitutos (acessados por várias threads)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self.prompt_tokens: List[int] = []
+
+    def add(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def add_prompt(self, tokens: int):
+        with self._lock:
+            self.prompt_tokens.append(tokens)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counts), len(self.prompt_tokens)
+
+
+def fake_vector(text: str, dimension: int) -> List[float]:
+    """Vetor unitário determinístico para o texto"""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dimension)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class _FakeChunk:
+    def __init__(self, text: str, usage=None):
+        self.text = text
+        self.usage_metadata = usage
+
+
+class _FakeResponse:
+    def __init__(self, chunks: List[str], usage, settings: FakeSettings, stream: bool):
+        self._chunks = chunks
+        self._settings = settings
+        self.usage_metadata = usage
+        self.text = "".join(chunks)
+        if not stream:
+            time.sleep(self._settings.gemini_output_tokens / self._settings.gemini_tokens_per_second)
+
+    def __iter__(self):
+        delay = 1 / self._settings.gemini_tokens_per_second
+        for position, chunk in enumerate(self._chunks):
+            time.sleep(len(chunk.split()) * delay)
+            last = position == len(self._chunks) - 1
+            yield _FakeChunk(chunk, self.usage_metadata if last else None)
+
+
+class _FakeAsyncResponse(_FakeResponse):
+    """Resposta de generate_content_async(stream=True): as esperas não bloqueiam o laço"""
+
+    def __init__(self, chunks: List[str], usage, settings: FakeSettings):
+        super().__init__(chunks, usage, settings, stream=True)
+
+    async def __aiter__(self):
+        delay = 1 / self._settings.gemini_tokens_per_second
+        for position, chunk in enumerate(self._chunks):
+            await asyncio.sleep(len(chunk.split()) * delay)
+            last = position == len(self._chunks) - 1
+            yield _FakeChunk(chunk, self.usage_metadata if last else None)
+
+
+class FakeGeminiModel:
+    """Mesma interface de generate_content do SDK do Gemini"""
+
+    def __init__(self, settings: FakeSettings, counter: CallCounter):
+        self._settings = settings
+        self._counter = counter
+
+    def _response(self, prompt: str):
+        from prompting import count_tokens
+        from prompts import FOLLOWUP_MARKER
+
+        prompt_tokens = count_tokens(prompt)
+        self._counter.add("gemini")
+        self._counter.add_prompt(prompt_tokens)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        words = [f"análise{digest[i % 64]}{i}" for i in range(self._settings.gemini_output_tokens)]
+        body = "## Resposta\n" + " ".join(words)
+        # Perguntas distintas por prompt, como as do modelo real (senão o cache de embeddings responderia)
+        questions = "\n".join(f"{i}. {question} ({digest[:6]})?" for i, question in enumerate(FOLLOWUP_QUESTIONS, 1))
+        text = f"{body}\n{FOLLOWUP_MARKER}\n{questions}"
+        chunks = [text[i:i + 120] for i in range(0, len(text), 120)]
+        usage = types.SimpleNamespace(prompt_token_count=prompt_tokens,
+                                      candidates_token_count=self._settings.gemini_output_tokens)
+        return chunks, usage
+
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs):
+        chunks, usage = self._response(prompt)
+        time.sleep(self._settings.gemini_first_token_ms / 1000)
+        return _FakeResponse(chunks, usage, self._settings, stream)
+
+    async def generate_content_async(self, prompt: str, stream: bool = False, **kwargs):
+        chunks, usage = self._response(prompt)
+        await asyncio.sleep(self._settings.gemini_first_token_ms / 1000)
+        return _FakeAsyncResponse(chunks, usage, self._settings)
+
+
+class _FakeEmbeddings:
+    def __init__(self, settings: FakeSettings, counter: CallCounter):
+        self._settings = settings
+        self._counter = counter
+
+    def create(self, input, model: str, **kwargs):
+        time.sleep(self._settings.embedding_ms / 1000)
+        return self._response(input, kwargs.get("dimensions"))
+
+    def _response(self, input, dimensions):
+        from config import EMBEDDING_DIMENSION
+
+        inputs = input if isinstance(input, list) else [input]
+        self._counter.add("embedding_requests")
+        self._counter.add("embedded_texts", len(inputs))
+        dimension = dimensions or EMBEDDING_DIMENSION
+        return types.SimpleNamespace(
+            data=[types.SimpleNamespace(index=i, embedding=fake_vector(text, dimension))
+                  for i, text in enumerate(inputs)],
+            usage=types.SimpleNamespace(prompt_tokens=sum(len(text.split()) for text in inputs)),
+        )
+
+
+class _FakeAsyncEmbeddings(_FakeEmbeddings):
+    async def create(self, input, model: str, **kwargs):
+        await asyncio.sleep(self._settings.embedding_ms / 1000)
+        return self._response(input, kwargs.get("dimensions"))
+
+
+class FakeOpenAI:
+    """Cliente com o endpoint de embeddings (o chat não é usado pelos pipelines)"""
+
+    def __init__(self, settings: FakeSettings, counter: CallCounter):
+        self.embeddings = _FakeEmbeddings(settings, counter)
+
+
+class FakeAsyncOpenAI:
+    """Mesmo endpoint de embeddings, com a interface do AsyncOpenAI"""
+
+    def __init__(self, settings: FakeSettings, counter: CallCounter):
+        self.embeddings = _FakeAsyncEmbeddings(settings, counter)
+
+
+def install_fake_sdks(settings: FakeSettings, counter: CallCounter):
+    """Registra módulos openai e google.generativeai falsos; os providers os importam no primeiro uso"""
+    openai_module = types.ModuleType("openai")
+    openai_module.OpenAI = lambda **kwargs: FakeOpenAI(settings, counter)
+    openai_module.AsyncOpenAI = lambda **kwargs: FakeAsyncOpenAI(settings, counter)
+    genai = types.ModuleType("google.generativeai")
+    genai.configure = lambda **kwargs: None
+    genai.GenerativeModel = lambda *args, **kwargs: FakeGeminiModel(settings, counter)
+    google = sys.modules.get("google") or types.ModuleType("google")
+    google.generativeai = genai
+    sys.modules.update({"openai": openai_module, "google": google, "google.generativeai": genai})
+
+
+def fake_corpus(size: int, dimension: int) -> List[Dict]:
+    return [
+        {
+            "_id": f"doc{i}",
+            "content": f"Estudo de caso {i}: marca do setor {i % 7} ampliou a participação com a campanha {i}. " * 4,
+            "metadata": {"title": f"Caso {i}", "source": f"relatorio{i % 5}.pdf"},
+            "$vector": fake_vector(f"doc{i}", dimension),
+        }
+        for i in range(size)
+    ]
+
+
+class FakeAstraServer:
+    """Servidor HTTP local com o comando `find` da Data API (busca vetorial e leitura paginada)"""
+
+    PAGE_SIZE = 20
+
+    def __init__(self, settings: FakeSettings, counter: CallCounter):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                from rag import apply_projection
+
+                documents, matrix = fake.documents, fake.matrix
+                counter.add("astra")
+                time.sleep(settings.astra_ms / 1000)
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                find = body.get("find", {})
+                projection = find.get("projection")
+                options = find.get("options", {})
+                if "sort" in find:
+                    scores = matrix @ np.asarray(find["sort"]["$vector"], dtype=np.float32)
+                    top = np.argsort(-scores)[:options.get("limit", 20)]
+                    found = [apply_projection({**documents[i], "$similarity": float(scores[i])}, projection)
+                             for i in top]
+                    # Como na Data API, o vetor só volta quando pedido na projeção
+                    if (projection or {}).get("$vector") or (projection or {}).get("*"):
+                        for doc, i in zip(found, top):
+                            doc["$vector"] = documents[i]["$vector"]
+                    data = {"documents": found, "nextPageState": None}
+                else:
+                    start = int(options.get("pageState") or 0)
+                    page = documents[start:start + FakeAstraServer.PAGE_SIZE]
+                    more = start + FakeAstraServer.PAGE_SIZE < len(documents)
+                    data = {
+                        "documents": [apply_projection(doc, projection) for doc in page],
+                        "nextPageState": str(start + FakeAstraServer.PAGE_SIZE) if more else None,
+                    }
+                payload = json.dumps({"data": data}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        # A porta é reservada já aqui: a URL precisa estar no ambiente antes de importar config
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self.documents: List[Dict] = []
+        self.matrix = None
+
+    def start(self, documents: List[Dict]):
+        self.documents = documents
+        self.matrix = np.array([doc["$vector"] for doc in documents], dtype=np.float32)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+
+
+def brief_fixture(iteration: int) -> Dict:
+    """Brief determinístico; o sufixo muda a cada iteração para que os caches não respondam.
+
+    Os campos de selectbox percorrem as opções das páginas; passando do número
+    de combinações, as iterações extras repetem entradas, como na interface.
+    """
+    suffix = f" (cenário {iteration})"
+    tension = ("A marca lidera em lojas físicas, mas perde relevância entre compradores digitais "
+               "que comparam preço e conveniência" + suffix)
+    return {
+        "id": str(iteration),
+        "business_context": "Rede de varejo de moda com 120 lojas e e-commerce recente" + suffix,
+        "business_challenge": "Dobrar a participação das vendas online em dois anos" + suffix,
+        "company_overview": "Varejista de moda brasileira, 30 anos de mercado, público classe B e C" + suffix,
+        "industry": "Varejo de moda" + suffix,
+        "strategic_tension": tension,
+        "secondary_research": "Pesquisa secundária: consumidores pesquisam online antes de comprar. " * 40 + suffix,
+        "strategic_insights": "Insight: conveniência pesa mais que preço na recompra. " * 60 + suffix,
+        "brand_name": "Moda Viva" + suffix,
+        "brand_category": "Moda",
+        "market_trends": "Social commerce e entregas no mesmo dia" + suffix,
+        "kpi_goal": KPI_GOALS[iteration % len(KPI_GOALS)],
+        "market_position": MARKET_POSITIONS[iteration % len(MARKET_POSITIONS)],
+        "campaign_goal": CAMPAIGN_GOALS[iteration % len(CAMPAIGN_GOALS)],
+        "budget_range": BUDGET_RANGES[iteration // len(CAMPAIGN_GOALS) % len(BUDGET_RANGES)],
+        "org_size": ORG_SIZES[iteration % len(ORG_SIZES)],
+        "project_scope": PROJECT_SCOPES[iteration // len(ORG_SIZES) % len(PROJECT_SCOPES)],
+    }
+
+
+def _followup(prompt: str) -> str:
+    from pipelines import generate_with_followup
+    return generate_with_followup(prompt)[0]
+
+
+def _scenarios() -> Dict[str, Callable[[Dict], None]]:
+    """Um cenário por página, com os mesmos prompts e pipelines usados pela interface e pelo lote"""
+    import prompts
+    from pipelines import insights_pipeline, pestle_pipeline, strategies_pipeline, swot_pipeline, tension_pipeline
+
+    def analise_dados(brief):
+        tension = brief["strategic_tension"]
+        _followup(prompts.secondary_research_prompt(tension, "Comportamento de compra online"))
+        _followup(prompts.quantitative_prompt(tension, "Qual canal cresce mais?"))
+        _followup(prompts.interview_prompt(tension, "Barreiras à compra online", "Clientes de loja física"))
+
+    def estrategias(brief):
+        strategies_pipeline(brief)
+        _followup(prompts.briefing_prompt("Creative Brief (Criatividade)", brief["strategic_tension"],
+                                          brief["strategic_insights"]))
+
+    def marca(brief):
+        for builder in (prompts.brand_audit_prompt, prompts.benefit_ladder_prompt, prompts.brand_prism_prompt):
+            _followup(builder(brief["brand_name"], brief["brand_category"]))
+
+    def metricas(brief):
+        _followup(prompts.kpi_prompt(brief["kpi_goal"]))
+        _followup(prompts.esov_prompt(brief["market_position"]))
+        _followup(prompts.entry_points_prompt(brief["industry"]))
+
+    def analises_estrategicas(brief):
+        swot_pipeline(brief)
+        pestle_pipeline(brief)
+        _followup(prompts.opportunities_prompt(brief["market_trends"]))
+
+    def analises_estrategicas_todas(brief):
+        # Mesmo caminho do botão "Gerar Todas as Análises": as três no laço assíncrono. As entradas
+        # diferem das do cenário anterior para que o cache não responda pelas gerações
+        from async_providers import generate_stream_async, get_async_runner
+        from semantic_cache import SemanticPrompt
+
+        overview = (brief.get("company_overview") or brief["business_context"]) + " · todas"
+        industry = brief["industry"] + " · todas"
+        trends = brief["market_trends"] + " · todas"
+        futures = [
+            get_async_runner().submit(generate_stream_async(
+                semantic.render() + prompts.followup_instruction(), None, semantic
+            ))
+            for semantic in (SemanticPrompt(prompts.swot_prompt, (overview,)),
+                             SemanticPrompt(prompts.pestle_prompt, (industry,)),
+                             SemanticPrompt(prompts.opportunities_prompt, (trends,)))
+        ]
+        for future in futures:
+            future.result()
+
+    def selectbox(brief):
+        _followup(prompts.kpi_prompt(brief["kpi_goal"]))
+        _followup(prompts.esov_prompt(brief["market_position"]))
+        _followup(prompts.team_structure_prompt(brief["org_size"], brief["project_scope"]))
+        _followup(prompts.communication_plan_prompt(brief["campaign_goal"], brief["budget_range"]))
+
+    return {
+        "definicao_problema": tension_pipeline,
+        "analise_dados": analise_dados,
+        "insights": insights_pipeline,
+        "estrategias": estrategias,
+        "conteudo": lambda brief: _followup(prompts.content_strategy_prompt(
+            "Engajar", brief["business_context"], ["Website/Blog", "Redes Sociais"], "Médio")),
+        "marca": marca,
+        "comunicacao": lambda brief: _followup(prompts.communication_plan_prompt(brief["campaign_goal"],
+                                                                                 brief["budget_range"])),
+        "metricas": metricas,
+        "estrutura_time": lambda brief: _followup(prompts.team_structure_prompt(brief["org_size"],
+                                                                                brief["project_scope"])),
+        "analises_estrategicas": analises_estrategicas,
+        "analises_estrategicas_todas": analises_estrategicas_todas,
+        "analises_selectbox_warm": selectbox,
+    }
+
+
+def _setups() -> Dict[str, Callable[[], None]]:
+    """Preparação fora da medição, por cenário"""
+    import warm_cache
+
+    return {
+        # Gera o artefato com as combinações de selectbox, como o job de deploy
+        "analises_selectbox_warm": warm_cache.warm,
+    }
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_scenario(fn: Callable[[Dict], None], counter: CallCounter, iterations: int, warm: bool) -> Dict:
+    """Executa o cenário e resume latência, chamadas por iteração e tamanho dos prompts"""
+    latencies = []
+    counts_before, prompts_before = counter.snapshot()
+    for iteration in range(iterations):
+        brief = brief_fixture(0 if warm else iteration)
+        started = time.perf_counter()
+        fn(brief)
+        latencies.append((time.perf_counter() - started) * 1000)
+    counts_after, prompts_after = counter.snapshot()
+    prompt_tokens = counter.prompt_tokens[prompts_before:prompts_after]
+    result = {
+        "p50_ms": round(_percentile(latencies, 0.5), 1),
+        "p95_ms": round(_percentile(latencies, 0.95), 1),
+        "max_ms": round(max(latencies), 1),
+        "mean_ms": round(statistics.mean(latencies), 1),
+        "prompt_tokens_mean": round(statistics.mean(prompt_tokens), 1) if prompt_tokens else 0.0,
+        "prompt_tokens_max": max(prompt_tokens, default=0),
+    }
+    for name in ("gemini", "embedding_requests", "embedded_texts", "astra"):
+        result[f"{name}_calls"] = round((counts_after.get(name, 0) - counts_before.get(name, 0)) / iterations, 2)
+    return result
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Regressões em relação à execução de referência: latência acima da tolerância ou mais chamadas/tokens"""
+    regressions = []
+    for name, result in current["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            if previous[metric] and result[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {previous[metric]:.0f} → {result[metric]:.0f}")
+        for metric in ("gemini_calls", "embedding_requests_calls", "astra_calls", "prompt_tokens_max"):
+            if result[metric] > previous[metric]:
+                regressions.append(f"{name}: {metric} {previous[metric]} → {result[metric]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline dos pipelines com provedores simulados")
+    parser.add_argument("--scenarios", default="", help="Cenários separados por vírgula (padrão: todos)")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--warm", action="store_true", help="Repete o mesmo brief (mede o caminho com cache)")
+    parser.add_argument("--output", default="", help="Grava o resultado em JSON")
+    parser.add_argument("--baseline", default="", help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Aumento de latência aceito (fração)")
+    for field, default in asdict(FakeSettings()).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(default), default=default)
+    args = parser.parse_args()
+    settings = FakeSettings(**{field: getattr(args, field) for field in asdict(FakeSettings())})
+
+    # O ambiente precisa estar pronto antes de importar config (lido uma vez por processo)
+    cache_dir = tempfile.mkdtemp(prefix="strategit_bench_")
+    os.environ.update({
+        "STRATEGIT_CACHE_DIR": cache_dir,
+        "VECTOR_BACKEND": "astra",
+        "ASTRA_DB_COLLECTION": "benchmark",
+        "ASTRA_DB_APPLICATION_TOKEN": "benchmark",
+        "OPENAI_API_KEY": "benchmark",
+        "GEM_API_KEY": "benchmark",
+        "METRICS_PORT": "0",
+        "RATE_LIMIT_DB": "",
+        "TELEMETRY_SPANS_LOG": "",
+    })
+    counter = CallCounter()
+    install_fake_sdks(settings, counter)
+    server = FakeAstraServer(settings, counter)
+    os.environ["ASTRA_DB_API_ENDPOINT"] = server.url
+    from config import EMBEDDING_DIMENSION
+    server.start(fake_corpus(settings.corpus_size, EMBEDDING_DIMENSION))
+
+    scenarios = _scenarios()
+    setups = _setups()
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()] or list(scenarios)
+    unknown = [name for name in names if name not in scenarios]
+    if unknown:
+        parser.error(f"Cenários desconhecidos: {', '.join(unknown)}")
+
+    report = {
+        "meta": {"commit": _git_commit(), "iterations": args.iterations, "warm": args.warm,
+                 "settings": asdict(settings)},
+        "scenarios": {},
+    }
+    try:
+        for name in names:
+            if name in setups:
+                setups[name]()
+            result = run_scenario(scenarios[name], counter, args.iterations, args.warm)
+            report["scenarios"][name] = result
+            print(f"{name:<24} p50 {result['p50_ms']:>7.0f} ms · p95 {result['p95_ms']:>7.0f} ms · "
+                  f"gemini {result['gemini_calls']:g} · embeddings {result['embedding_requests_calls']:g} · "
+                  f"astra {result['astra_calls']:g} · prompt máx {result['prompt_tokens_max']} tokens",
+                  file=sys.stderr)
+    finally:
+        server.close()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if {k: v for k, v in baseline["meta"].items() if k != "commit"} != \
+                {k: v for k, v in report["meta"].items() if k != "commit"}:
+            print("Aviso: a referência usou outras configurações; as latências não são comparáveis", file=sys.stderr)
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSÃO {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
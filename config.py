@@ -0,0 +1,144 @@
+"""Configurações da aplicação, lidas do ambiente (.env) uma única vez por processo"""
+import os
+from typing import Dict
+
+from dotenv import load_dotenv
+
+# Carrega variáveis de ambiente
+load_dotenv()
+
+# Modelos
+EMBEDDING_MODEL = "text-embedding-3-small"
+# Perfil de embedding: dimensão pedida ao modelo (parâmetro dimensions). A coleção do
+# Astra e o índice local precisam ter a mesma dimensão (ingest.py --create-collection)
+EMBEDDING_PROFILES = (256, 512, 1024, 1536)
+EMBEDDING_DIMENSION = int(os.getenv("EMBEDDING_DIMENSION", "1536"))
+EMBEDDING_BATCH_SIZE = 512  # Entradas por requisição à API de embeddings
+CHAT_MODEL = "gpt-4o"  # Atualize para o modelo correto que você deseja usar
+CHAT_TEMPERATURE = 0.7
+GEMINI_MODEL = "gemini-2.0-flash"
+GEMINI_GENERATION_CONFIG: Dict = {}
+
+# Credenciais
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+GEMINI_API_KEY = os.getenv("GEM_API_KEY")
+
+# Astra DB
+COLLECTION_NAME = os.getenv("ASTRA_DB_COLLECTION")
+NAMESPACE = os.getenv("ASTRA_DB_NAMESPACE", "default_keyspace")
+ASTRA_DB_API_BASE = os.getenv("ASTRA_DB_API_ENDPOINT")
+ASTRA_DB_TOKEN = os.getenv("ASTRA_DB_APPLICATION_TOKEN")
+ASTRA_POOL_SIZE = int(os.getenv("ASTRA_POOL_SIZE", "20"))
+ASTRA_MAX_RETRIES = int(os.getenv("ASTRA_MAX_RETRIES", "3"))
+ASTRA_CONNECT_TIMEOUT = float(os.getenv("ASTRA_CONNECT_TIMEOUT", "3"))
+ASTRA_READ_TIMEOUT = float(os.getenv("ASTRA_READ_TIMEOUT", "10"))
+
+# Caches locais
+CACHE_DIR = os.getenv("STRATEGIT_CACHE_DIR", ".strategit_cache")
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "64"))
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", str(24 * 7)))
+# float16 reduz o arquivo pela metade com perda desprezível para similaridade de cosseno
+EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float32")
+
+# Artefatos gerados por projeto (tensão, insights, briefs...), persistidos entre sessões
+ARTIFACT_DB = os.getenv("ARTIFACT_DB", os.path.join(CACHE_DIR, "artifacts.sqlite3"))
+ARTIFACT_MAX_VERSIONS = int(os.getenv("ARTIFACT_MAX_VERSIONS", "20"))
+
+# Busca vetorial: "astra" (Data API) ou "local" (índice mapeado em memória sincronizado do Astra)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "astra")
+LOCAL_INDEX_DIR = os.getenv("LOCAL_INDEX_DIR", os.path.join(CACHE_DIR, "vector_index"))
+# Quantização do índice local ("none", "int8" ou "binary"): a varredura usa os códigos
+# compactos e os limit * LOCAL_INDEX_RESCORE_FACTOR melhores são reavaliados com o vetor completo
+LOCAL_INDEX_QUANTIZATION = os.getenv("LOCAL_INDEX_QUANTIZATION", "none")
+LOCAL_INDEX_RESCORE_FACTOR = int(os.getenv("LOCAL_INDEX_RESCORE_FACTOR", "4"))
+
+# Contexto RAG: campos projetados dos documentos e tamanho máximo do bloco de contexto
+RAG_TEXT_FIELDS = tuple(os.getenv("RAG_TEXT_FIELDS", "content,text,page_content").split(","))
+RAG_METADATA_FIELDS = tuple(
+    os.getenv("RAG_METADATA_FIELDS", "title,source,metadata.title,metadata.source").split(",")
+)
+RAG_CONTEXT_MAX_CHARS = int(os.getenv("RAG_CONTEXT_MAX_CHARS", "4000"))
+
+# Orçamento de tokens das seções variáveis do prompt em cada etapa
+PROMPT_TOKEN_BUDGETS = {
+    "insights": int(os.getenv("PROMPT_BUDGET_INSIGHTS", "6000")),
+    "estrategias": int(os.getenv("PROMPT_BUDGET_ESTRATEGIAS", "3000")),
+    "briefing": int(os.getenv("PROMPT_BUDGET_BRIEFING", "4000")),
+    "framework": int(os.getenv("PROMPT_BUDGET_FRAMEWORK", "4000")),
+}
+
+# Recuperação multi-consulta: variações geradas, buscas simultâneas e resultados por consulta
+RETRIEVAL_FANOUT = int(os.getenv("RETRIEVAL_FANOUT", "3"))
+RETRIEVAL_CONCURRENCY = int(os.getenv("RETRIEVAL_CONCURRENCY", "4"))
+RETRIEVAL_LIMIT_PER_QUERY = int(os.getenv("RETRIEVAL_LIMIT_PER_QUERY", "3"))
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "5"))
+
+# Reordenação local: candidatos buscados por consulta, peso da relevância frente à
+# diversidade no MMR (1 = só relevância) e tokens máximos dos trechos escolhidos
+RETRIEVAL_OVERFETCH = int(os.getenv("RETRIEVAL_OVERFETCH", "50"))
+RETRIEVAL_MMR_LAMBDA = float(os.getenv("RETRIEVAL_MMR_LAMBDA", "0.7"))
+RETRIEVAL_TOKEN_BUDGET = int(os.getenv("RETRIEVAL_TOKEN_BUDGET", "1000"))
+
+# Cache semântico: similaridade mínima do texto livre, limite de entradas e fração de acertos amostrados
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "1") == "1"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "2000"))
+SEMANTIC_CACHE_SAMPLE_RATE = float(os.getenv("SEMANTIC_CACHE_SAMPLE_RATE", "0.1"))
+
+# Conjuntos de dados enviados: linhas por bloco na leitura de CSV sem pyarrow (e da amostra para quantis e correlações) e limites do perfil
+DATASET_CSV_CHUNK_ROWS = int(os.getenv("DATASET_CSV_CHUNK_ROWS", "200000"))
+DATASET_PROFILE_SAMPLE_ROWS = int(os.getenv("DATASET_PROFILE_SAMPLE_ROWS", "100000"))
+DATASET_MAX_COLUMNS = int(os.getenv("DATASET_MAX_COLUMNS", "50"))
+DATASET_TOP_CATEGORIES = int(os.getenv("DATASET_TOP_CATEGORIES", "5"))
+DATASET_PROFILE_MAX_CHARS = int(os.getenv("DATASET_PROFILE_MAX_CHARS", "3000"))
+
+# Modo em lote: briefs processados em paralelo
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
+
+# Limites por provedor: requisições/min, tokens/min (0 = sem limite) e chamadas simultâneas máximas
+RATE_LIMITS = {
+    "gemini": {
+        "rpm": float(os.getenv("GEMINI_RPM", "1000")),
+        "tpm": float(os.getenv("GEMINI_TPM", "1000000")),
+        "concurrency": int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")),
+    },
+    "openai": {
+        "rpm": float(os.getenv("OPENAI_RPM", "3000")),
+        "tpm": float(os.getenv("OPENAI_TPM", "1000000")),
+        "concurrency": int(os.getenv("OPENAI_MAX_CONCURRENCY", "16")),
+    },
+    "astra": {
+        "rpm": float(os.getenv("ASTRA_RPM", "6000")),
+        "tpm": 0.0,
+        "concurrency": ASTRA_POOL_SIZE,
+    },
+}
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "4"))
+# Arquivo SQLite para compartilhar os limites entre processos (vazio = limites por processo)
+RATE_LIMIT_DB = os.getenv("RATE_LIMIT_DB", "")
+
+# Telemetria: porta do endpoint Prometheus (0 desliga), log de spans em JSON OTLP (vazio desliga)
+# e quantidade de spans recentes mantidos em memória para o resumo de latência
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+TELEMETRY_SPANS_LOG = os.getenv("TELEMETRY_SPANS_LOG", "")
+TELEMETRY_RECENT_SPANS = int(os.getenv("TELEMETRY_RECENT_SPANS", "2000"))
+
+# Busca antecipada do conhecimento de apoio para as perguntas sugeridas (buscas simultâneas no processo e buscas pendentes máximas por sessão)
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "1") == "1"
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "2"))
+PREFETCH_MAX_PENDING = int(os.getenv("PREFETCH_MAX_PENDING", "8"))
+
+# Laço de eventos assíncrono dos provedores: corrotinas simultâneas (além dos limites de cada provedor)
+ASYNC_MAX_CONCURRENCY = int(os.getenv("ASYNC_MAX_CONCURRENCY", "8"))
+
+# Respostas pré-computadas das análises só com selectbox (gerado por `python warm_cache.py`)
+WARM_CACHE_PATH = os.getenv("WARM_CACHE_PATH", os.path.join(CACHE_DIR, "warm_cache.json"))
+WARM_CACHE_WORKERS = int(os.getenv("WARM_CACHE_WORKERS", "4"))
+
+# Ingestão da base de conhecimento: tamanho dos trechos, sobreposição, lotes do insertMany e concorrência
+INGEST_CHUNK_TOKENS = int(os.getenv("INGEST_CHUNK_TOKENS", "400"))
+INGEST_CHUNK_OVERLAP = int(os.getenv("INGEST_CHUNK_OVERLAP", "50"))
+INGEST_INSERT_BATCH = int(os.getenv("INGEST_INSERT_BATCH", "50"))
+INGEST_INSERT_MAX_BYTES = int(os.getenv("INGEST_INSERT_MAX_BYTES", str(4 * 1024 * 1024)))
+INGEST_WINDOW = int(os.getenv("INGEST_WINDOW", "2000"))
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "8"))
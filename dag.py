@@ -0,0 +1,62 @@
+"""Execução concorrente de pequenos grafos de dependência (pipelines de várias etapas)"""
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class Step:
+    """Etapa do pipeline; fn recebe os resultados das dependências como argumentos nomeados"""
+    name: str
+    fn: Callable[..., Any]
+    deps: Tuple[str, ...] = ()
+
+
+def run_dag(steps: List[Step], max_workers: int = 4,
+            initializer: Optional[Callable[[], None]] = None) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """Executa cada etapa assim que suas dependências terminam.
+
+    Retorna os resultados e a duração (em segundos) de cada etapa. Uma falha
+    cancela as etapas pendentes e é propagada na hora, sem esperar as que
+    já estão rodando.
+    """
+    by_name = {step.name: step for step in steps}
+    for step in steps:
+        missing = [dep for dep in step.deps if dep not in by_name]
+        if missing:
+            raise ValueError(f"Etapa {step.name} depende de etapas inexistentes: {missing}")
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+
+    def timed(step: Step, kwargs: Dict[str, Any]):
+        started = time.perf_counter()
+        try:
+            return step.fn(**kwargs)
+        finally:
+            timings[step.name] = time.perf_counter() - started
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, initializer=initializer)
+    try:
+        pending = {step.name for step in steps}
+        running = {}
+        while pending or running:
+            for name in [n for n in pending if all(dep in results for dep in by_name[n].deps)]:
+                step = by_name[name]
+                kwargs = {dep: results[dep] for dep in step.deps}
+                # Cada etapa roda numa cópia do contexto de quem chamou (marcas da telemetria)
+                running[executor.submit(contextvars.copy_context().run, timed, step, kwargs)] = name
+                pending.discard(name)
+            if not running:
+                raise ValueError(f"Dependências circulares entre as etapas: {sorted(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+    except BaseException:
+        # Falha rápida: não espera as etapas em andamento, que terminam sozinhas em segundo plano
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+    return results, timings
@@ -0,0 +1,245 @@
+"""Leitura de conjuntos de dados enviados (CSV/XLSX) e perfil estatístico compacto para o prompt.
+
+Os DataFrames lidos ficam em cache como Parquet, endereçados pelo hash do
+arquivo, para que reruns e novos envios do mesmo arquivo não precisem
+interpretá-lo de novo.
+"""
+import hashlib
+import io
+import os
+import uuid
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    CACHE_DIR,
+    DATASET_CSV_CHUNK_ROWS,
+    DATASET_MAX_COLUMNS,
+    DATASET_PROFILE_MAX_CHARS,
+    DATASET_PROFILE_SAMPLE_ROWS,
+    DATASET_TOP_CATEGORIES,
+)
+
+DATASET_CACHE_DIR = os.path.join(CACHE_DIR, "datasets")
+QUANTILES = [0.0, 0.25, 0.5, 0.75, 1.0]
+
+
+def file_hash(data: bytes) -> str:
+    """Hash do conteúdo do arquivo, usado como chave do cache"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _tmp_path(path: str) -> str:
+    return f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def parse_dataset(name: str, data: bytes) -> pd.DataFrame:
+    """Interpreta o arquivo enviado; levanta ValueError se o formato não for suportado"""
+    extension = os.path.splitext(name)[1].lower()
+    if extension == ".xlsx":
+        return pd.read_excel(io.BytesIO(data))
+    if extension != ".csv":
+        raise ValueError(f"Formato não suportado: {extension or name}")
+    if _has_pyarrow():
+        # Leitor multithread do pyarrow, com colunas Arrow (menos memória que objetos Python)
+        return pd.read_csv(io.BytesIO(data), engine="pyarrow", dtype_backend="pyarrow")
+    return pd.concat(read_csv_chunks(data), ignore_index=True)
+
+
+def read_csv_chunks(data: bytes) -> Iterator[pd.DataFrame]:
+    """Leitor do CSV em blocos de DATASET_CSV_CHUNK_ROWS linhas (caminho sem pyarrow)"""
+    return pd.read_csv(io.BytesIO(data), chunksize=DATASET_CSV_CHUNK_ROWS, low_memory=False)
+
+
+def load_dataset(name: str, data: bytes) -> pd.DataFrame:
+    """Lê o conjunto de dados, reaproveitando o Parquet em cache quando o mesmo arquivo já foi lido"""
+    path = os.path.join(DATASET_CACHE_DIR, f"{file_hash(data)}.parquet")
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+    frame = parse_dataset(name, data)
+    if _has_pyarrow():
+        import pyarrow as pa
+
+        os.makedirs(DATASET_CACHE_DIR, exist_ok=True)
+        # Nomes de coluna precisam ser texto no Parquet
+        frame.columns = [str(column) for column in frame.columns]
+        # Nome temporário único: dois reruns gravando o mesmo arquivo não se atropelam
+        tmp = _tmp_path(path)
+        try:
+            frame.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+        except (pa.ArrowException, OSError):
+            # Colunas que o Arrow não representa (ex.: objeto com int e texto de um XLSX) ficam sem cache
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    return frame
+
+
+def _base_profile(rows: int, dtypes: pd.Series, nulls: pd.Series) -> Dict:
+    return {
+        "rows": rows,
+        "columns": len(dtypes),
+        "dtypes": {column: str(dtype) for column, dtype in dtypes.items()},
+        "null_rate": (nulls / max(rows, 1)).round(3).to_dict(),
+        "numeric": {},
+        "correlations": [],
+        "top_categories": {},
+    }
+
+
+def _add_numeric(profile: Dict, values: pd.DataFrame, mean: pd.Series, std: pd.Series):
+    """Quantis e correlações mais fortes de values (float64), com a média e o desvio informados"""
+    if values.empty:
+        return
+    stats = values.quantile(QUANTILES).T
+    stats["mean"] = mean
+    stats["std"] = std
+    profile["numeric"] = stats.round(4).to_dict(orient="index")
+    if values.shape[1] > 1:
+        corr = values.corr().to_numpy()
+        rows, cols = np.triu_indices_from(corr, k=1)
+        strength = np.nan_to_num(np.abs(corr[rows, cols]))
+        for i in np.argsort(-strength)[:5]:
+            profile["correlations"].append(
+                (values.columns[rows[i]], values.columns[cols[i]], round(float(corr[rows[i], cols[i]]), 3))
+            )
+
+
+def _top_shares(counts: pd.Series) -> Dict[str, float]:
+    shares = (counts / counts.sum()).sort_values(ascending=False, kind="stable").head(DATASET_TOP_CATEGORIES)
+    return {str(k): round(float(v), 3) for k, v in shares.items()}
+
+
+def profile_dataset(frame: pd.DataFrame) -> Dict:
+    """Perfil vetorizado: tipos, nulos, quantis, correlações mais fortes e categorias mais frequentes"""
+    frame = frame.iloc[:, :DATASET_MAX_COLUMNS]
+    profile = _base_profile(len(frame), frame.dtypes, frame.isna().sum())
+    values = frame.select_dtypes("number").astype("float64")
+    _add_numeric(profile, values, values.mean(), values.std())
+    for column in frame.select_dtypes(exclude=["number", "datetime"]).columns:
+        profile["top_categories"][column] = _top_shares(frame[column].value_counts())
+    return profile
+
+
+def _merge_moments(total: Optional[Tuple[float, float, float]], n: float, mean: float,
+                   m2: float) -> Tuple[float, float, float]:
+    """Junta (contagem, média, soma dos quadrados dos desvios) de dois blocos (fórmula de Chan)"""
+    if not total or not total[0]:
+        return n, mean, m2
+    n_a, mean_a, m2_a = total
+    count = n_a + n
+    delta = mean - mean_a
+    return count, mean_a + delta * n / count, m2_a + m2 + delta * delta * n_a * n / count
+
+
+def profile_csv_chunks(chunks: Iterable[pd.DataFrame], sample_rows: int = DATASET_PROFILE_SAMPLE_ROWS,
+                       seed: int = 0) -> Dict:
+    """Perfil de um CSV lido em blocos, sem juntar o arquivo inteiro na memória
+
+    Linhas, nulos, mínimo, máximo, média, desvio e categorias são exatos. Os
+    quartis e as correlações vêm de uma amostra uniforme de até sample_rows
+    linhas, e os tipos seguem a junção dos tipos de cada bloco (como num pd.concat).
+    """
+    rng = np.random.default_rng(seed)
+    rows = 0
+    nulls: Optional[pd.Series] = None
+    moments: Dict[str, Tuple[float, float, float]] = {}
+    lowest: Optional[pd.Series] = None
+    highest: Optional[pd.Series] = None
+    counts: Dict[str, pd.Series] = {}
+    # Colunas numéricas em algum bloco: se no fim forem texto, as categorias saem da amostra
+    numeric_somewhere = set()
+    sample: Optional[pd.DataFrame] = None
+    keys = np.empty(0)
+    for chunk in chunks:
+        chunk = chunk.iloc[:, :DATASET_MAX_COLUMNS]
+        rows += len(chunk)
+        chunk_nulls = chunk.isna().sum()
+        nulls = chunk_nulls if nulls is None else nulls.add(chunk_nulls, fill_value=0)
+        numeric = chunk.select_dtypes("number").astype("float64")
+        numeric_somewhere.update(numeric.columns)
+        lowest = numeric.min() if lowest is None else pd.concat([lowest, numeric.min()], axis=1).min(axis=1)
+        highest = numeric.max() if highest is None else pd.concat([highest, numeric.max()], axis=1).max(axis=1)
+        n, mean, m2 = numeric.count(), numeric.mean(), numeric.var(ddof=0) * numeric.count()
+        for column in numeric.columns:
+            if n[column]:
+                moments[column] = _merge_moments(moments.get(column), n[column], mean[column], m2[column])
+        for column in chunk.columns.difference(numeric.columns, sort=False):
+            column_counts = chunk[column].value_counts()
+            counts[column] = column_counts if column not in counts else counts[column].add(column_counts, fill_value=0)
+        # Amostra uniforme: as sample_rows linhas com as menores chaves aleatórias
+        chunk_keys = rng.random(len(chunk))
+        if sample is None:
+            sample, keys = chunk, chunk_keys
+        else:
+            sample, keys = pd.concat([sample, chunk], ignore_index=True), np.concatenate([keys, chunk_keys])
+        if len(sample) > sample_rows:
+            keep = np.sort(np.argpartition(keys, sample_rows)[:sample_rows])
+            sample, keys = sample.iloc[keep].reset_index(drop=True), keys[keep]
+    if sample is None:
+        return profile_dataset(pd.DataFrame())
+
+    profile = _base_profile(rows, sample.dtypes, nulls)
+    values = sample.select_dtypes("number").astype("float64")
+    exact = pd.DataFrame([moments.get(column, (0.0, np.nan, np.nan)) for column in values.columns],
+                         index=values.columns, columns=["n", "mean", "m2"])
+    std = np.sqrt(exact["m2"] / (exact["n"] - 1).where(exact["n"] > 1))
+    _add_numeric(profile, values, exact["mean"], std)
+    for column, stats in profile["numeric"].items():
+        stats[0.0], stats[1.0] = round(float(lowest[column]), 4), round(float(highest[column]), 4)
+    for column in sample.select_dtypes(exclude=["number", "datetime"]).columns:
+        exact_counts = column in counts and column not in numeric_somewhere
+        column_counts = counts[column] if exact_counts else sample[column].value_counts()
+        profile["top_categories"][column] = _top_shares(column_counts)
+    return profile
+
+
+def format_profile(profile: Dict, max_chars: int = DATASET_PROFILE_MAX_CHARS) -> str:
+    """Resumo do perfil em markdown compacto, limitado a max_chars"""
+    lines: List[str] = [f"{profile['rows']} linhas × {profile['columns']} colunas"]
+    for column, dtype in profile["dtypes"].items():
+        line = f"- {column} ({dtype}, nulos {profile['null_rate'][column]:.0%})"
+        if column in profile["numeric"]:
+            stats = profile["numeric"][column]
+            line += (f": min {stats[0.0]:g}, q1 {stats[0.25]:g}, mediana {stats[0.5]:g}, "
+                     f"q3 {stats[0.75]:g}, max {stats[1.0]:g}, média {stats['mean']:g}")
+        elif profile["top_categories"].get(column):
+            top = ", ".join(f"{value} {share:.0%}" for value, share in profile["top_categories"][column].items())
+            line += f": {top}"
+        lines.append(line)
+    if profile["correlations"]:
+        lines.append("Correlações mais fortes: " + "; ".join(
+            f"{a} × {b} = {value:+.2f}" for a, b, value in profile["correlations"]
+        ))
+    text = "\n".join(lines)
+    return text if len(text) <= max_chars else text[:max_chars].rsplit("\n", 1)[0] + "\n- …"
+
+
+def dataset_profile(name: str, data: bytes) -> str:
+    """Perfil formatado do arquivo, guardado ao lado do Parquet para não ser recalculado"""
+    path = os.path.join(DATASET_CACHE_DIR, f"{file_hash(data)}.profile.md")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    if os.path.splitext(name)[1].lower() == ".csv" and not _has_pyarrow():
+        # Sem pyarrow não há cache Parquet: o perfil é feito bloco a bloco, sem o frame inteiro
+        profile = profile_csv_chunks(read_csv_chunks(data))
+    else:
+        profile = profile_dataset(load_dataset(name, data))
+    text = format_profile(profile)
+    os.makedirs(DATASET_CACHE_DIR, exist_ok=True)
+    tmp = _tmp_path(path)
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+    return text
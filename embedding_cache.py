@@ -0,0 +1,120 @@
+"""Cache persistente de embeddings: vetores em arquivo binário mapeado em memória + índice SQLite"""
+import hashlib
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from config import CACHE_DIR, EMBEDDING_CACHE_DTYPE
+
+
+def text_hash(text: str) -> str:
+    """Hash estável do texto usado como chave do embedding"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Armazena um vetor por (modelo, dimensão, hash do texto) em um arquivo append-only"""
+
+    def __init__(self, directory: str, model: str, dimension: int, dtype: str = "float32"):
+        os.makedirs(directory, exist_ok=True)
+        self.model = model
+        self.dimension = dimension
+        self.dtype = np.dtype(dtype)
+        self.row_bytes = self.dtype.itemsize * dimension
+        self.vectors_path = os.path.join(directory, f"{model}-{dimension}.{self.dtype.name}.bin")
+        self._lock = threading.Lock()
+        self._matrix = None
+        # O SQLite também serializa as escritas entre processos que compartilham o diretório
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "embeddings.sqlite3"), check_same_thread=False, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                dtype TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                row INTEGER NOT NULL,
+                PRIMARY KEY (model, dimension, dtype, text_hash)
+            )
+            """
+        )
+        self._conn.commit()
+        open(self.vectors_path, "ab").close()
+
+    def _rows(self, max_row: int) -> np.ndarray:
+        """Matriz mapeada em memória, remapeada quando o arquivo cresceu"""
+        if self._matrix is None or max_row >= self._matrix.shape[0]:
+            n_rows = os.path.getsize(self.vectors_path) // self.row_bytes
+            self._matrix = np.memmap(
+                self.vectors_path, dtype=self.dtype, mode="r", shape=(n_rows, self.dimension)
+            ) if n_rows else np.empty((0, self.dimension), dtype=self.dtype)
+        return self._matrix
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, List[float]]:
+        """Retorna os embeddings já conhecidos, indexados pelo texto"""
+        by_hash = {text_hash(text): text for text in texts}
+        if not by_hash:
+            return {}
+        found = {}
+        with self._lock:
+            hashes = list(by_hash)
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                rows = self._conn.execute(
+                    f"""
+                    SELECT text_hash, row FROM embeddings
+                    WHERE model = ? AND dimension = ? AND dtype = ?
+                      AND text_hash IN ({",".join("?" * len(chunk))})
+                    """,
+                    (self.model, self.dimension, self.dtype.name, *chunk),
+                ).fetchall()
+                if not rows:
+                    continue
+                matrix = self._rows(max(row for _, row in rows))
+                for digest, row in rows:
+                    found[by_hash[digest]] = matrix[row].astype(np.float32).tolist()
+        return found
+
+    def put_many(self, vectors: Dict[str, List[float]]):
+        """Anexa novos embeddings ao arquivo e registra suas linhas no índice"""
+        items = [(text, vec) for text, vec in vectors.items() if len(vec) == self.dimension]
+        if not items:
+            return
+        block = np.asarray([vec for _, vec in items], dtype=self.dtype)
+        with self._lock:
+            # BEGIN IMMEDIATE garante que apenas um processo anexa ao arquivo por vez
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                first_row = os.path.getsize(self.vectors_path) // self.row_bytes
+                with open(self.vectors_path, "r+b") as f:
+                    f.seek(first_row * self.row_bytes)
+                    f.write(block.tobytes())
+                self._conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO embeddings (model, dimension, dtype, text_hash, row)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (self.model, self.dimension, self.dtype.name, text_hash(text), first_row + i)
+                        for i, (text, _) in enumerate(items)
+                    ],
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+
+@lru_cache(maxsize=None)
+def get_embedding_cache(model: str, dimension: int) -> EmbeddingCache:
+    """Instância única do cache de embeddings por modelo e dimensão"""
+    return EmbeddingCache(
+        os.path.join(CACHE_DIR, "embeddings"), model, dimension, EMBEDDING_CACHE_DTYPE
+    )
@@ -0,0 +1,153 @@
+"""Avaliação de recall x tamanho dos perfis de embedding e da quantização do índice local.
+
+Uso: python embedding_eval.py docs/ --queries perguntas.txt --k 5 [--target 0.95]
+
+Os trechos da base (mesmo corte do ingest.py) e as consultas são embutidos uma
+vez no perfil completo; o top-k exato em float32 nessa dimensão é a referência.
+Cada perfil menor é obtido truncando e renormalizando o vetor completo, que é o
+que o parâmetro dimensions do text-embedding-3 faz (--reembed pede cada perfil
+à API, para conferir). Para cada perfil e quantização o relatório traz bytes por
+vetor no índice, bytes do vetor da consulta no JSON enviado ao Astra, recall@k
+com e sem reavaliação e a latência da busca, e indica o menor perfil que
+mantém o recall alvo.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import (
+    EMBEDDING_PROFILES,
+    INGEST_CHUNK_OVERLAP,
+    INGEST_CHUNK_TOKENS,
+    LOCAL_INDEX_RESCORE_FACTOR,
+    RAG_TEXT_FIELDS,
+)
+from ingest import chunk_documents, read_documents
+from vector_index import QUANTIZATIONS, quantize, search_rows
+
+# Bytes por vetor na varredura, por dimensão
+BYTES_PER_VECTOR = {
+    "none": lambda dimension: dimension * 4,
+    "int8": lambda dimension: dimension,
+    "binary": lambda dimension: (dimension + 7) // 8,
+}
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def sample_queries(texts: List[str], count: int) -> List[str]:
+    """Primeira frase de trechos espaçados da base, quando não há arquivo de consultas"""
+    step = max(1, len(texts) // max(1, count))
+    queries = []
+    for text in texts[::step][:count]:
+        sentence = re.split(r"(?<=[.!?])\s+", " ".join(text.split()), maxsplit=1)[0]
+        queries.append(sentence[:300])
+    return queries
+
+
+def recall_at_k(found: List[np.ndarray], truth: List[np.ndarray], k: int) -> float:
+    return float(np.mean([len(set(f[:k].tolist()) & set(t[:k].tolist())) / k for f, t in zip(found, truth)]))
+
+
+def evaluate(corpus: np.ndarray, queries: np.ndarray, k: int, profiles: List[int],
+             rescore_factor: int = LOCAL_INDEX_RESCORE_FACTOR,
+             profile_vectors: Optional[Dict[int, Tuple[np.ndarray, np.ndarray]]] = None) -> List[Dict]:
+    """Linhas do relatório; corpus e consultas no perfil completo (ou já embutidos por perfil)"""
+    full = corpus.shape[1]
+    reference = _normalize(corpus)
+    truth = [search_rows(reference, query, k)[0] for query in _normalize(queries)]
+    rows = []
+    for dimension in profiles:
+        if profile_vectors and dimension in profile_vectors:
+            docs, asked = (_normalize(m) for m in profile_vectors[dimension])
+        else:
+            docs, asked = _normalize(corpus[:, :dimension]), _normalize(queries[:, :dimension])
+        docs = docs.astype(np.float32)
+        asked = asked.astype(np.float32)
+        query_json = float(np.mean([len(json.dumps(query.tolist())) for query in asked]))
+        for mode in QUANTIZATIONS:
+            codes, scale = quantize(docs, mode) if mode != "none" else (None, None)
+            results = {}
+            for label, factor in (("rescored", rescore_factor), ("raw", 1)):
+                started = time.perf_counter()
+                found = [search_rows(docs, query, k, mode, codes, scale, factor)[0] for query in asked]
+                elapsed = (time.perf_counter() - started) / len(asked)
+                results[label] = (recall_at_k(found, truth, k), elapsed)
+                if mode == "none":
+                    break
+            rows.append({
+                "dimension": dimension,
+                "quantization": mode,
+                "bytes_per_vector": BYTES_PER_VECTOR[mode](dimension),
+                "index_mb": round(BYTES_PER_VECTOR[mode](dimension) * docs.shape[0] / 1e6, 3),
+                "size_vs_full": round(BYTES_PER_VECTOR[mode](dimension) / (full * 4), 4),
+                "query_json_bytes": round(query_json),
+                f"recall@{k}": round(results["rescored"][0], 4),
+                f"recall@{k}_sem_reavaliacao": round(results.get("raw", results["rescored"])[0], 4),
+                "search_ms": round(results["rescored"][1] * 1000, 3),
+            })
+    return rows
+
+
+def smallest_passing(rows: List[Dict], k: int, target: float) -> Dict:
+    """Menor configuração (em bytes por vetor) com recall@k >= target"""
+    passing = [row for row in rows if row[f"recall@{k}"] >= target]
+    return min(passing, key=lambda row: (row["bytes_per_vector"], -row[f"recall@{k}"])) if passing else {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall x tamanho dos perfis de embedding e da quantização")
+    parser.add_argument("paths", nargs="+", help="Arquivos ou diretórios da base (.md, .txt, .pdf, .csv, .jsonl)")
+    parser.add_argument("--queries", help="Arquivo com uma consulta por linha (padrão: frases da própria base)")
+    parser.add_argument("--sample", type=int, default=50, help="Consultas amostradas da base sem --queries")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--profiles", default=",".join(str(p) for p in EMBEDDING_PROFILES),
+                        help="Dimensões avaliadas, separadas por vírgula")
+    parser.add_argument("--rescore-factor", type=int, default=LOCAL_INDEX_RESCORE_FACTOR)
+    parser.add_argument("--target", type=float, default=0.95, help="Recall@k mínimo aceitável")
+    parser.add_argument("--reembed", action="store_true",
+                        help="Pede cada perfil à API em vez de truncar o vetor completo")
+    args = parser.parse_args()
+
+    from generation import embed_texts
+
+    profiles = sorted(int(p) for p in args.profiles.split(","))
+    chunks = list({chunk["_id"]: chunk for chunk in chunk_documents(
+        read_documents(args.paths), INGEST_CHUNK_TOKENS, INGEST_CHUNK_OVERLAP
+    )}.values())
+    texts = [chunk[RAG_TEXT_FIELDS[0]] for chunk in chunks]
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+    else:
+        queries = sample_queries(texts, args.sample)
+    if not texts or not queries:
+        sys.exit("Nenhum trecho ou consulta para avaliar")
+    k = min(args.k, len(texts))
+    print(f"{len(texts)} trechos · {len(queries)} consultas · k={k}", file=sys.stderr)
+
+    full = max(profiles)
+    corpus = np.asarray(embed_texts(texts, dimension=full), dtype=np.float32)
+    asked = np.asarray(embed_texts(queries, dimension=full), dtype=np.float32)
+    profile_vectors = None
+    if args.reembed:
+        profile_vectors = {
+            dimension: (np.asarray(embed_texts(texts, dimension=dimension), dtype=np.float32),
+                        np.asarray(embed_texts(queries, dimension=dimension), dtype=np.float32))
+            for dimension in profiles if dimension != full
+        }
+    rows = evaluate(corpus, asked, k, profiles, args.rescore_factor, profile_vectors)
+    print(json.dumps({"rows": rows, "recommended": smallest_passing(rows, k, args.target)},
+                     ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Geração de texto e embeddings com os caches persistentes, sem dependência do Streamlit.
+
+As páginas (via shared.py) e o modo em lote (batch.py) usam as mesmas funções,
+e portanto compartilham os caches de respostas e de embeddings.
+"""
+from typing import List
+
+from config import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_DIMENSION,
+    EMBEDDING_MODEL,
+    GEMINI_GENERATION_CONFIG,
+    GEMINI_MODEL,
+)
+from embedding_cache import get_embedding_cache
+from llm_cache import cache_key, get_completion_cache
+from prompting import count_tokens
+from providers import get_gemini_model, get_openai_client
+from rate_limit import get_scheduler
+from telemetry import record_usage, span
+from warm_cache import get_warm_cache
+
+
+def embed_texts(texts: List[str], dimension: int = EMBEDDING_DIMENSION) -> List[List[float]]:
+    """Embeddings em lote, pagando apenas pelos textos ainda não armazenados em cache.
+
+    dimension é o perfil pedido ao modelo; cada perfil tem seu próprio cache.
+    Erros da API são propagados; os vetores obtidos antes do erro já ficam no cache.
+    """
+    with span("openai.embed") as current:
+        cache = get_embedding_cache(EMBEDDING_MODEL, dimension)
+        unique = [text for text in dict.fromkeys(texts) if text]
+        found = cache.get_many(unique)
+        missing = [text for text in unique if text not in found]
+        current.set(texts=len(unique), cache_hits=len(found), cache="hit" if not missing else "miss")
+        for start in range(0, len(missing), EMBEDDING_BATCH_SIZE):
+            batch = missing[start:start + EMBEDDING_BATCH_SIZE]
+            response = get_scheduler("openai").call(
+                get_openai_client().embeddings.create,
+                input=batch,
+                model=EMBEDDING_MODEL,
+                dimensions=dimension,
+                tokens=sum(count_tokens(text) for text in batch)
+            )
+            record_usage(current, getattr(response, "usage", None), "\n".join(batch))
+            vectors = {batch[item.index]: item.embedding for item in response.data}
+            cache.put_many(vectors)
+            found.update(vectors)
+        return [found.get(text, []) for text in texts]
+
+
+def generate_cached(prompt: str, bypass_cache: bool = False) -> str:
+    """Gera conteúdo com o Gemini sem streaming, usando o cache de respostas"""
+    with span("gemini.generate") as current:
+        cache = get_completion_cache()
+        key = cache_key(GEMINI_MODEL, GEMINI_GENERATION_CONFIG, prompt)
+        if not bypass_cache:
+            warmed = get_warm_cache().get(key)
+            if warmed is not None:
+                current.set(cache="warm")
+                return warmed
+            cached = cache.get(key)
+            if cached is not None:
+                current.set(cache="hit")
+                return cached
+        current.set(cache="bypass" if bypass_cache else "miss")
+        response = get_scheduler("gemini").call(
+            get_gemini_model().generate_content, prompt, tokens=count_tokens(prompt)
+        )
+        text = response.text
+        record_usage(current, getattr(response, "usage_metadata", None), prompt, text)
+        cache.set(key, GEMINI_MODEL, text)
+        return text
@@ -0,0 +1,209 @@
+"""Ingestão em lote da base de conhecimento na coleção do Astra.
+
+Uso: python ingest.py docs/ artigos.jsonl --collection base --workers 8 [--create-collection]
+
+Lê .md/.txt, .pdf (texto extraído com pdfplumber), .csv e .jsonl em fluxo,
+divide em trechos por tokens e grava com insertMany em lotes concorrentes,
+limitados em quantidade e em bytes. O _id de cada trecho é o hash do conteúdo:
+trechos que já estão na coleção não são embutidos nem regravados, então rodar
+de novo só paga pelo que mudou.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Set
+
+from config import (
+    COLLECTION_NAME,
+    INGEST_CHUNK_OVERLAP,
+    INGEST_CHUNK_TOKENS,
+    INGEST_INSERT_BATCH,
+    INGEST_INSERT_MAX_BYTES,
+    INGEST_WINDOW,
+    INGEST_WORKERS,
+    RAG_TEXT_FIELDS,
+)
+from prompting import chunk_tokens
+from rag import get_field
+
+TEXT_SUFFIXES = (".md", ".markdown", ".txt")
+SUPPORTED_SUFFIXES = TEXT_SUFFIXES + (".pdf", ".csv", ".jsonl")
+# Limite de _ids por filtro $in ao consultar quais trechos já existem
+EXISTING_BATCH_SIZE = 100
+
+
+def _record_text(record: Dict) -> str:
+    for field in RAG_TEXT_FIELDS:
+        value = get_field(record, field)
+        if value:
+            return str(value)
+    return ""
+
+
+def _read_file(path: str) -> Iterator[Dict]:
+    """Documentos ({text, metadata}) de um arquivo; CSV e JSONL geram um por linha"""
+    suffix = os.path.splitext(path)[1].lower()
+    source = os.path.basename(path)
+    if suffix in TEXT_SUFFIXES:
+        with open(path, encoding="utf-8") as f:
+            yield {"text": f.read(), "metadata": {"source": source, "title": os.path.splitext(source)[0]}}
+    elif suffix == ".pdf":
+        import pdfplumber
+        with pdfplumber.open(path) as pdf:
+            text = "\n\n".join(page.extract_text() or "" for page in pdf.pages)
+        yield {"text": text, "metadata": {"source": source, "title": os.path.splitext(source)[0]}}
+    elif suffix == ".csv":
+        with open(path, encoding="utf-8", newline="") as f:
+            for row_number, row in enumerate(csv.DictReader(f)):
+                # Sem coluna de texto conhecida, a linha inteira vira "coluna: valor"
+                text = _record_text(row) or "\n".join(f"{key}: {value}" for key, value in row.items() if value)
+                yield {"text": text, "metadata": {"source": source, "row": row_number}}
+    elif suffix == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                metadata = {"source": source, "row": line_number, **record.get("metadata", {})}
+                for field in ("title", "source"):
+                    if record.get(field):
+                        metadata[field] = record[field]
+                yield {"text": _record_text(record), "metadata": metadata}
+
+
+def read_documents(paths: List[str]) -> Iterator[Dict]:
+    """Percorre arquivos e diretórios (recursivamente, em ordem) com extensões suportadas"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(SUPPORTED_SUFFIXES):
+                        yield from _read_file(os.path.join(root, name))
+        else:
+            yield from _read_file(path)
+
+
+def chunk_documents(documents: Iterable[Dict], max_tokens: int, overlap: int) -> Iterator[Dict]:
+    """Trechos prontos para a coleção, com _id derivado do conteúdo"""
+    for document in documents:
+        for position, chunk in enumerate(chunk_tokens(document["text"], max_tokens, overlap)):
+            yield {
+                "_id": hashlib.sha256(chunk.encode("utf-8")).hexdigest()[:32],
+                RAG_TEXT_FIELDS[0]: chunk,
+                "metadata": {**document["metadata"], "chunk": position},
+            }
+
+
+def _windows(chunks: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    window = []
+    for chunk in chunks:
+        window.append(chunk)
+        if len(window) >= size:
+            yield window
+            window = []
+    if window:
+        yield window
+
+
+def _existing_ids(client, collection: str, ids: List[str], executor: ThreadPoolExecutor) -> Set[str]:
+    def fetch(batch: List[str]) -> List[str]:
+        found, page_state = [], None
+        while True:
+            page, page_state = client.find(collection, filter={"_id": {"$in": batch}},
+                                           projection={"_id": 1}, page_state=page_state)
+            found.extend(doc["_id"] for doc in page)
+            if not page_state:
+                return found
+    batches = [ids[start:start + EXISTING_BATCH_SIZE] for start in range(0, len(ids), EXISTING_BATCH_SIZE)]
+    return {doc_id for found in executor.map(fetch, batches) for doc_id in found}
+
+
+def _insert_batches(documents: List[Dict], max_documents: int, max_bytes: int) -> Iterator[List[Dict]]:
+    """Lotes do insertMany limitados em número de documentos e em tamanho do JSON"""
+    batch, size = [], 0
+    for document in documents:
+        document_size = len(json.dumps(document, ensure_ascii=False).encode("utf-8"))
+        if batch and (len(batch) >= max_documents or size + document_size > max_bytes):
+            yield batch
+            batch, size = [], 0
+        batch.append(document)
+        size += document_size
+    if batch:
+        yield batch
+
+
+def ingest(paths: List[str], collection: str, client, max_tokens: int = INGEST_CHUNK_TOKENS,
+           overlap: int = INGEST_CHUNK_OVERLAP, workers: int = INGEST_WORKERS,
+           insert_batch: int = INGEST_INSERT_BATCH, max_bytes: int = INGEST_INSERT_MAX_BYTES,
+           window: int = INGEST_WINDOW) -> Dict:
+    """Lê, divide, filtra o que já existe, embute e grava; as gravações de uma janela
+    correm em paralelo com a leitura e os embeddings da seguinte"""
+    from generation import embed_texts
+
+    stats = {"chunks": 0, "existing": 0, "embedded": 0, "inserted": 0, "duplicates": 0}
+    started = time.perf_counter()
+
+    def collect(futures):
+        for future in futures:
+            inserted, duplicates = future.result()
+            stats["inserted"] += inserted
+            stats["duplicates"] += duplicates
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunks in _windows(chunk_documents(read_documents(paths), max_tokens, overlap), window):
+            unique = list({chunk["_id"]: chunk for chunk in chunks}.values())
+            existing = _existing_ids(client, collection, [chunk["_id"] for chunk in unique], executor)
+            new = [chunk for chunk in unique if chunk["_id"] not in existing]
+            vectors = embed_texts([chunk[RAG_TEXT_FIELDS[0]] for chunk in new])
+            documents = [{**chunk, "$vector": vector} for chunk, vector in zip(new, vectors) if vector]
+            for batch in _insert_batches(documents, insert_batch, max_bytes):
+                pending.add(executor.submit(client.insert_many, collection, batch))
+            # Limita os lotes em voo para não acumular a base inteira em memória
+            while len(pending) > workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            stats["chunks"] += len(chunks)
+            stats["existing"] += len(existing)
+            stats["embedded"] += len(documents)
+            elapsed = time.perf_counter() - started
+            print(f"{stats['chunks']} trechos · {stats['existing']} já existentes · {stats['embedded']} embutidos · "
+                  f"{stats['chunks'] / elapsed:.0f} trechos/s", file=sys.stderr)
+        done, _ = wait(pending)
+        collect(done)
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 2)
+    stats["chunks_per_second"] = round(stats["chunks"] / elapsed, 1) if elapsed else 0.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestão da base de conhecimento na coleção do Astra")
+    parser.add_argument("paths", nargs="+", help="Arquivos ou diretórios (.md, .txt, .pdf, .csv, .jsonl)")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--chunk-tokens", type=int, default=INGEST_CHUNK_TOKENS, help="Tokens por trecho")
+    parser.add_argument("--overlap", type=int, default=INGEST_CHUNK_OVERLAP,
+                        help="Tokens repetidos entre janelas de parágrafos longos")
+    parser.add_argument("--workers", type=int, default=INGEST_WORKERS, help="Requisições simultâneas ao Astra")
+    parser.add_argument("--batch-size", type=int, default=INGEST_INSERT_BATCH, help="Documentos por insertMany")
+    parser.add_argument("--create-collection", action="store_true",
+                        help="Cria a coleção com a dimensão de EMBEDDING_DIMENSION antes de gravar")
+    args = parser.parse_args()
+
+    from astra import get_astra_client
+    client = get_astra_client()
+    if args.create_collection:
+        client.create_collection(args.collection)
+    result = ingest(args.paths, args.collection, client, max_tokens=args.chunk_tokens,
+                    overlap=args.overlap, workers=args.workers, insert_batch=args.batch_size)
+    print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
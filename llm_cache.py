@@ -0,0 +1,135 @@
+"""Cache persistente de respostas de LLM, endereçado por conteúdo (SQLite, LRU + TTL)"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Optional
+
+from config import CACHE_DIR, LLM_CACHE_MAX_MB, LLM_CACHE_TTL_HOURS
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normaliza espaços e indentação para que prompts equivalentes gerem a mesma chave"""
+    return " ".join(prompt.split())
+
+
+def cache_key(model: str, config: Optional[Dict], prompt: str) -> str:
+    """Chave do cache: hash de modelo + configuração de geração + prompt normalizado"""
+    payload = json.dumps(
+        {"model": model, "config": config or {}, "prompt": normalize_prompt(prompt)},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """Armazena respostas completas em SQLite com limite de tamanho (LRU) e TTL por entrada"""
+
+    def __init__(self, path: str, max_bytes: int, ttl_seconds: float):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS completions (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_completions_lru ON completions(last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Retorna a resposta armazenada, ou None se ausente/expirada"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self.evictions += 1
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE completions SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, model: str, value: str, ttl_seconds: Optional[float] = None):
+        """Armazena uma resposta e aplica o despejo por TTL e por tamanho"""
+        if not value:
+            return
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO completions
+                    (key, model, value, size, created_at, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, value, len(value.encode("utf-8")), now, now + ttl, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """Remove entradas expiradas e, se preciso, as menos usadas recentemente"""
+        expired = self._conn.execute("DELETE FROM completions WHERE expires_at < ?", (now,)).rowcount
+        self.evictions += max(expired, 0)
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM completions ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Contadores de acertos/erros e ocupação do cache"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_mb": size / (1024 * 1024),
+        }
+
+
+@lru_cache(maxsize=None)
+def get_completion_cache() -> CompletionCache:
+    """Instância única do cache por processo (sobrevive aos reruns do Streamlit)"""
+    return CompletionCache(
+        os.path.join(CACHE_DIR, "completions.sqlite3"),
+        max_bytes=int(LLM_CACHE_MAX_MB * 1024 * 1024),
+        ttl_seconds=LLM_CACHE_TTL_HOURS * 3600,
+    )
@@ -0,0 +1,136 @@
+"""Pipelines das páginas como funções importáveis, sem Streamlit (usadas pelo modo em lote).
+
+Cada pipeline recebe os campos do brief somados aos resultados das etapas
+anteriores e devolve apenas os campos novos. Os prompts são os mesmos das
+páginas, de modo que o lote e a interface compartilham o cache de respostas.
+"""
+from typing import Callable, Dict, List, Tuple
+
+from config import (
+    COLLECTION_NAME,
+    PROMPT_TOKEN_BUDGETS,
+    RETRIEVAL_FANOUT,
+    RETRIEVAL_TOP_K,
+)
+from dag import Step, run_dag
+from generation import embed_texts, generate_cached
+from prompting import PromptSection, fit_sections, summary_prompt
+from prompts import (
+    followup_instruction,
+    insights_prompt,
+    pestle_prompt,
+    split_followup,
+    split_questions,
+    strategy_options_prompt,
+    swot_prompt,
+    tension_prompt,
+    tension_refinement_prompt,
+)
+from rag import build_context, multi_query_search, reciprocal_rank_fusion, reranked_search
+from telemetry import tagged
+from vector_index import get_vector_backend
+
+
+def _search(vector: List[float]) -> List[Dict]:
+    return reranked_search(get_vector_backend(), COLLECTION_NAME, vector)
+
+
+def _retrieve(query: str) -> List[Dict]:
+    vector = embed_texts([query])[0]
+    return _search(vector) if vector else []
+
+
+def _summarize(text: str, max_tokens: int) -> str:
+    return generate_cached(summary_prompt(text, max_tokens))
+
+
+def generate_with_followup(prompt: str, followup_hint: str = "") -> Tuple[str, str]:
+    """Mesmo envelope de stream_with_followup, sem streaming"""
+    return split_followup(generate_cached(prompt + followup_instruction(followup_hint)))
+
+
+def tension_pipeline(fields: Dict) -> Dict:
+    """Tensão estratégica: rascunho e buscas em paralelo, depois refinamento com o contexto RAG"""
+    prompt = tension_prompt(fields["business_context"], fields["business_challenge"])
+
+    def gerar_tensao_inicial():
+        return split_followup(generate_cached(prompt + followup_instruction(
+            "focadas nos aspectos-chave desta tensão estratégica", count=RETRIEVAL_FANOUT
+        )))
+
+    def buscar_pela_pergunta(tensao_inicial):
+        _, question_block = tensao_inicial
+        return multi_query_search(split_questions(question_block), embed_texts, _search)
+
+    results, _ = run_dag([
+        Step("tensao_inicial", gerar_tensao_inicial),
+        Step("busca_especulativa",
+             lambda: _retrieve(f"{fields['business_context']}\n{fields['business_challenge']}")),
+        Step("busca_pergunta", buscar_pela_pergunta, deps=("tensao_inicial",)),
+    ])
+    initial_text, search_question = results["tensao_inicial"]
+    rag_context = build_context(reciprocal_rank_fusion(
+        [results["busca_pergunta"], results["busca_especulativa"]], limit=RETRIEVAL_TOP_K
+    )) or "Não foi possível recuperar informações adicionais."
+    return {
+        "strategic_tension": generate_cached(tension_refinement_prompt(initial_text, rag_context)),
+        "rag_context": rag_context,
+        "search_questions": split_questions(search_question),
+    }
+
+
+def insights_pipeline(fields: Dict) -> Dict:
+    """Insights a partir da tensão (e da pesquisa secundária, se o brief trouxer)"""
+    sections = [PromptSection("Tensão", fields["strategic_tension"], priority=3)]
+    if fields.get("secondary_research"):
+        sections.append(PromptSection(
+            "Pesquisa Secundária", fields["secondary_research"], priority=2, summarizable=True
+        ))
+    fitted = fit_sections(sections, PROMPT_TOKEN_BUDGETS["insights"], summarizer=_summarize)
+    research_data = "".join(
+        f"\n\n{section.name}:\n{fitted.texts[section.name]}" for section in sections[1:]
+    )
+    insights, _ = generate_with_followup(insights_prompt(fitted.texts["Tensão"], research_data))
+    return {"strategic_insights": insights}
+
+
+def strategies_pipeline(fields: Dict) -> Dict:
+    """Opções estratégicas a partir dos insights"""
+    fitted = fit_sections(
+        [PromptSection("Insights", fields["strategic_insights"], summarizable=True)],
+        PROMPT_TOKEN_BUDGETS["estrategias"], summarizer=_summarize
+    )
+    options, _ = generate_with_followup(strategy_options_prompt(fitted.texts["Insights"]))
+    return {"strategy_options": options}
+
+
+def swot_pipeline(fields: Dict) -> Dict:
+    """SWOT da empresa; sem company_overview, usa o contexto do negócio"""
+    overview = fields.get("company_overview") or fields["business_context"]
+    swot, _ = generate_with_followup(swot_prompt(overview))
+    return {"swot": swot}
+
+
+def pestle_pipeline(fields: Dict) -> Dict:
+    """PESTLE do setor informado no brief"""
+    pestle, _ = generate_with_followup(pestle_prompt(fields["industry"]))
+    return {"pestle": pestle}
+
+
+# Pipelines disponíveis, na ordem em que podem ser encadeados
+PIPELINES: Dict[str, Callable[[Dict], Dict]] = {
+    "tension": tension_pipeline,
+    "insights": insights_pipeline,
+    "strategies": strategies_pipeline,
+    "swot": swot_pipeline,
+    "pestle": pestle_pipeline,
+}
+
+
+def run_pipelines(brief: Dict, names: List[str]) -> Dict:
+    """Executa os pipelines em sequência, cada um vendo os resultados dos anteriores"""
+    results: Dict = {}
+    for name in names:
+        with tagged(action=name):
+            results.update(PIPELINES[name]({**brief, **results}))
+    return results
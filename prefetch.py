@@ -0,0 +1,114 @@
+"""Busca antecipada do conhecimento de apoio para as perguntas sugeridas pelas análises
+
+Assim que uma análise termina, a pergunta para a base de dados é embutida e
+buscada em segundo plano no laço de eventos de async_providers.py (embedding
+com o AsyncOpenAI e busca vetorial com o cliente assíncrono do Astra), com no
+máximo PREFETCH_WORKERS buscas por vez e prioridade de lote no escalonador dos
+provedores, de modo que nunca atrasa uma resposta principal.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional
+
+from async_providers import embed_texts_async, get_async_runner
+from config import (
+    COLLECTION_NAME,
+    PREFETCH_MAX_PENDING,
+    PREFETCH_WORKERS,
+    RETRIEVAL_LIMIT_PER_QUERY,
+    RETRIEVAL_OVERFETCH,
+    RETRIEVAL_TOP_K,
+    VECTOR_BACKEND,
+)
+from prompts import split_questions
+from rag import RAG_PROJECTION, query_variants, reciprocal_rank_fusion, rerank_candidates, reranked_search
+from rate_limit import PRIORITY_BATCH, prioritized
+from telemetry import span
+from vector_index import get_vector_backend
+
+
+async def _search_async(vector: List[float]) -> List[Dict]:
+    """reranked_search no laço: Data API com httpx.AsyncClient; o índice local (em memória) vai para uma thread"""
+    if VECTOR_BACKEND == "local":
+        return await asyncio.to_thread(reranked_search, get_vector_backend(), COLLECTION_NAME, vector)
+    from astra import get_async_astra_client
+    candidates = await get_async_astra_client().vector_search(
+        COLLECTION_NAME, vector, limit=max(RETRIEVAL_OVERFETCH, RETRIEVAL_LIMIT_PER_QUERY),
+        projection=RAG_PROJECTION, include_vector=True
+    )
+    return rerank_candidates(vector, candidates)
+
+
+async def supporting_documents_async(question_block: str, cancelled: Optional[threading.Event] = None) -> List[Dict]:
+    """Documentos para as perguntas do envelope (uma ou várias, fundidas por RRF)
+
+    Com cancelled sinalizado, as etapas que ainda não começaram (embedding e
+    buscas vetoriais) são puladas.
+    """
+    def stopped() -> bool:
+        return cancelled is not None and cancelled.is_set()
+
+    with prioritized(PRIORITY_BATCH), span("prefetch.search"):
+        queries = query_variants(split_questions(question_block))
+        if not queries or stopped():
+            return []
+        vectors = [v for v in await embed_texts_async(queries) if v]
+        if not vectors or stopped():
+            return []
+        result_lists = await asyncio.gather(*(_search_async(vector) for vector in vectors))
+        return reciprocal_rank_fusion(result_lists, limit=RETRIEVAL_TOP_K)
+
+
+class PrefetchJob:
+    """Busca de uma pergunta; cancelar descarta o resultado e interrompe a busca entre uma etapa e outra"""
+
+    def __init__(self, question: str, future: Future, cancelled: threading.Event):
+        self.question = question
+        self.future = future
+        self._cancelled = cancelled
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        self.future.cancel()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self) -> List[Dict]:
+        return self.future.result()
+
+
+class Prefetcher:
+    """Até workers buscas por vez no processo; cada sessão tem no máximo max_pending buscas na fila, e as suas mais antigas são canceladas"""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.max_pending = max_pending
+        self._gate = asyncio.Semaphore(workers)
+        self._lock = threading.Lock()
+
+    def submit(self, question: str, pending: Deque[PrefetchJob]) -> PrefetchJob:
+        """Agenda a busca; pending é a fila da sessão, então uma sessão só cancela as próprias buscas"""
+        with self._lock:
+            while pending and (pending[0].done() or pending[0].cancelled):
+                pending.popleft()
+            if len(pending) >= self.max_pending:
+                pending.popleft().cancel()
+            cancelled = threading.Event()
+            # O runner copia o contexto, levando as marcas da telemetria (página e ação) para o laço
+            job = PrefetchJob(question, get_async_runner().submit(
+                supporting_documents_async(question, cancelled), gate=self._gate
+            ), cancelled)
+            pending.append(job)
+        return job
+
+
+@lru_cache(maxsize=None)
+def get_prefetcher() -> Prefetcher:
+    """Único por processo, compartilhado por todas as sessões"""
+    return Prefetcher(PREFETCH_WORKERS, PREFETCH_MAX_PENDING)
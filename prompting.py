@@ -0,0 +1,125 @@
+"""Montagem de prompts dentro de um orçamento de tokens por etapa"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+# Codificação usada para medir os prompts; é uma aproximação para o tokenizador do Gemini
+TOKEN_ENCODING = "o200k_base"
+TRUNCATION_MARK = " …[trecho omitido]"
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception:
+        # Sem tiktoken (ou sem acesso ao arquivo BPE) usamos a estimativa de ~4 caracteres/token
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Conta os tokens do texto"""
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Corta o texto para caber em max_tokens, marcando a omissão"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    # Reserva espaço para a marca de omissão dentro do próprio limite
+    keep = max_tokens - count_tokens(TRUNCATION_MARK)
+    if keep <= 0:
+        return ""
+    encoding = _encoding()
+    if encoding is None:
+        return text[:keep * 4] + TRUNCATION_MARK
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:keep]) + TRUNCATION_MARK
+
+
+def _token_windows(text: str, size: int, overlap: int) -> List[str]:
+    step = max(size - overlap, 1)
+    encoding = _encoding()
+    if encoding is None:
+        return [text[start * 4:(start + size) * 4] for start in range(0, (len(text) + 3) // 4, step)]
+    tokens = encoding.encode(text, disallowed_special=())
+    return [encoding.decode(tokens[start:start + size]) for start in range(0, len(tokens), step)]
+
+
+def chunk_tokens(text: str, max_tokens: int, overlap: int = 0) -> List[str]:
+    """Divide o texto em trechos de até max_tokens, agrupando parágrafos inteiros sempre que couberem.
+
+    Parágrafos maiores que o limite viram janelas de tokens com `overlap` tokens repetidos.
+    """
+    chunks, current, current_tokens = [], [], 0
+    for paragraph in (part.strip() for part in text.split("\n\n")):
+        if not paragraph:
+            continue
+        tokens = count_tokens(paragraph)
+        pieces = [paragraph] if tokens <= max_tokens else _token_windows(paragraph, max_tokens, overlap)
+        for piece in pieces:
+            piece_tokens = tokens if len(pieces) == 1 else count_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+@dataclass
+class PromptSection:
+    """Trecho variável do prompt; seções de menor prioridade são reduzidas primeiro"""
+    name: str
+    text: str
+    priority: int = 0
+    summarizable: bool = False
+
+
+@dataclass
+class FittedSections:
+    texts: Dict[str, str]
+    tokens: int
+    budget: int
+    reduced: List[str] = field(default_factory=list)
+
+
+def fit_sections(sections: List[PromptSection], budget: int,
+                 summarizer: Optional[Callable[[str, int], str]] = None) -> FittedSections:
+    """Ajusta as seções ao orçamento de tokens.
+
+    Enquanto o total passar do orçamento, a seção de menor prioridade ainda não
+    reduzida é resumida (se permitido e houver summarizer) ou cortada no que
+    falta para caber.
+    """
+    texts = {s.name: s.text for s in sections}
+    tokens = {s.name: count_tokens(s.text) for s in sections}
+    reduced = []
+    for section in sorted(sections, key=lambda s: s.priority):
+        overflow = sum(tokens.values()) - budget
+        if overflow <= 0:
+            break
+        target = max(tokens[section.name] - overflow, 0)
+        if section.summarizable and summarizer is not None and target > 0:
+            texts[section.name] = summarizer(section.text, target)
+            tokens[section.name] = count_tokens(texts[section.name])
+        if tokens[section.name] > target:
+            texts[section.name] = truncate_tokens(texts[section.name], target)
+            tokens[section.name] = count_tokens(texts[section.name])
+        reduced.append(section.name)
+    return FittedSections(texts=texts, tokens=sum(tokens.values()), budget=budget, reduced=reduced)
+
+
+def summary_prompt(text: str, max_tokens: int) -> str:
+    """Prompt para resumir uma seção preservando os fatos úteis à etapa seguinte"""
+    return f"""
+    Resuma o texto abaixo em no máximo {max(int(max_tokens * 0.7), 20)} palavras, preservando
+    dados, hipóteses e conclusões. Responda apenas com o resumo, em markdown.
+
+    {text}
+    """
@@ -0,0 +1,580 @@
+"""Construção dos prompts de cada página, sem dependência do Streamlit.
+
+Usado pelas páginas em views/ e pelo modo em lote (batch.py). O ajuste das
+seções ao orçamento de tokens fica em prompting.py; aqui os textos já chegam
+ajustados.
+"""
+from typing import List, Tuple
+
+# Envelope da resposta: análise em markdown, seguida do marcador e da pergunta de busca
+FOLLOWUP_MARKER = "<<<PERGUNTA_BASE>>>"
+
+
+def followup_instruction(hint: str = "", count: int = 1) -> str:
+    """Instrução anexada ao prompt para que a(s) pergunta(s) de busca venham na mesma resposta"""
+    hint = hint + " " if hint else ""
+    if count > 1:
+        questions = (f"{count} perguntas concisas, uma por linha e com formulações diferentes, "
+                     f"{hint}")
+    else:
+        questions = f"uma única pergunta concisa {hint}"
+    return f"""
+
+    Ao final, depois da análise completa, escreva uma linha contendo apenas {FOLLOWUP_MARKER}
+    e, na linha seguinte, {questions}para consultar uma base de dados de marketing digital
+    e recuperar mais informações relevantes.
+    Não escreva nada depois das perguntas.
+    """
+
+
+def split_followup(text: str) -> Tuple[str, str]:
+    """Separa a análise da pergunta de busca gerada no envelope"""
+    analysis, _, question = text.partition(FOLLOWUP_MARKER)
+    return analysis.strip(), question.strip()
+
+
+def split_questions(question_block: str) -> List[str]:
+    """Lista as perguntas do envelope, sem numeração ou marcadores"""
+    return [
+        line.strip().lstrip("-*•0123456789.) ").strip()
+        for line in question_block.splitlines()
+        if line.strip()
+    ]
+
+
+# 1. Definição do Problema
+def tension_prompt(business_context: str, business_challenge: str) -> str:
+    return f"""
+    Com base nestas informações:
+
+    **Contexto:** {business_context}
+    **Desafio:** {business_challenge}
+
+    Crie uma formulação clara do problema como uma tensão estratégica (paradoxo aparente) usando o formato:
+    "[Grupo] quer [objetivo], mas [barreira]"
+
+    Inclua:
+    1. A tensão principal (1-2 frases)
+    2. Explicação breve do conflito (50 palavras)
+    3. 3 perguntas-chave que precisam ser respondidas
+
+    Saída em markdown com formatação clara.
+    """
+
+
+def tension_refinement_prompt(initial_text: str, rag_context: str) -> str:
+    return f'''
+    Aqui está a análise inicial da tensão estratégica:
+    {initial_text}
+
+    E aqui estão informações relevantes recuperadas da base de conhecimento:
+    {rag_context}
+
+    Com base nisso, aprimore a análise inicial:
+    1. Mantenha a estrutura original (tensão, explicação, perguntas)
+    2. Incorpore insights relevantes das informações recuperadas
+    3. Melhore a clareza e precisão onde aplicável
+    4. Adicione 1-2 exemplos concretos se relevantes
+    5. Mantenha a formatação em markdown
+
+    Se as informações recuperadas não forem relevantes, mantenha a análise original.
+    '''
+
+
+# 2. Análise de Dados
+def secondary_research_prompt(tension: str, research_topics: str) -> str:
+    return f"""
+    Com base na tensão estratégica:
+    {tension}
+
+    Realize uma análise de pesquisa secundária sobre:
+    {research_topics}
+
+    Inclua:
+    1. 3-5 fontes confiáveis relevantes
+    2. Principais achados (bullet points)
+    3. Como esses dados se relacionam com o problema
+    4. 2-3 hipóteses preliminares
+
+    Formato: markdown com seções claras.
+    """
+
+
+def quantitative_prompt(tension: str, data_questions: str, dataset_summary: str = "") -> str:
+    return f"""
+    Com base na tensão estratégica:
+    {tension}
+
+    Sugira uma abordagem para analisar dados quantitativos que responda a:
+    {data_questions}
+
+    **Perfil do conjunto de dados:**
+    {dataset_summary or "Nenhum conjunto de dados enviado"}
+
+    Inclua:
+    1. Métodos estatísticos recomendados
+    2. Visualizações sugeridas
+    3. Possíveis armadilhas
+    4. Como interpretar os resultados
+
+    Formato: markdown com exemplos.
+    """
+
+
+def interview_prompt(tension: str, interview_goals: str, participant_profile: str) -> str:
+    return f"""
+    Com base na tensão estratégica:
+    {tension}
+
+    Crie um roteiro de entrevista qualitativa para:
+    **Objetivo:** {interview_goals}
+    **Participantes:** {participant_profile}
+
+    Inclua:
+    1. 5-7 perguntas principais (abertas)
+    2. Técnicas de sondagem (ex: "Pode me contar mais sobre...")
+    3. Exercícios projetivos (ex: "Se fosse um carro, qual seria?")
+    4. Como analisar as respostas
+
+    Formato: markdown com seções lógicas.
+    """
+
+
+# 3. Geração de Insights
+def insights_prompt(tension: str, research_data: str) -> str:
+    return f"""
+    Com base nestas informações:
+    **Tensão Estratégica:** {tension}
+    **Dados de Pesquisa:** {research_data if research_data else "Nenhum dado adicional fornecido"}
+
+    Gere 3-5 insights estratégicos profundos que:
+    1. Revelam padrões comportamentais ou culturais
+    2. Explicam a raiz do problema
+    3. São surpreendentes ou contra-intuitivos
+    4. Levam a oportunidades estratégicas
+
+    Formato para cada insight:
+    ### [Título do Insight]
+    <span class='insight-badge'>INSIGHT</span>
+    **O que é:** [Descrição clara]
+    **Por que importa:** [Impacto no negócio]
+    **Como usar:** [Aplicação prática]
+
+    Use markdown com formatação rica.
+    """
+
+
+# 4. Estratégias e Briefings
+def strategy_options_prompt(insights: str) -> str:
+    return f"""
+    Com base nestes insights:
+    {insights}
+
+    Desenvolva 3 opções estratégicas distintas, cada uma com:
+    ### [Nome da Estratégia]
+    **Ideia Central:** [1-2 frases]
+    **Prós:** [3-5 pontos fortes]
+    **Contras:** [2-3 limitações]
+    **Melhor Para:** [Quando usar esta abordagem]
+    **Exemplo de Implementação:** [Caso concreto]
+
+    As estratégias devem representar abordagens fundamentalmente diferentes.
+    """
+
+
+def briefing_prompt(briefing_type: str, tension: str, insights: str) -> str:
+    return f"""
+    Crie um {briefing_type} profissional com base em:
+    **Tensão Estratégica:** {tension}
+    **Insights:** {insights}
+
+    Use a estrutura:
+    ### Contexto
+    - Background
+    - Objetivo
+    - Público-alvo
+
+    ### Desafio
+    - Problema central
+    - Barreiras
+    - Oportunidades
+
+    ### Direção
+    - Tom
+    - Mensagem-chave
+    - Chamada para ação
+
+    ### {briefing_type.split(' ')[0]} Específicos
+    {"[Dados de negócio e métricas]" if "Client" in briefing_type else
+     "[Inspiração criativa e referências]" if "Creative" in briefing_type else
+     "[Canais, cronograma e recursos]"}
+
+    Formato: markdown profissional.
+    """
+
+
+def framework_prompt(framework: str, tension: str, insights: str) -> str:
+    return f"""
+    Aplique o framework {framework} a este cenário:
+    **Tensão:** {tension}
+    **Insights:** {insights}
+
+    {"Para GET/TO/BY, preencha:" if framework == "GET/TO/BY" else
+     "Para SMP, defina:" if framework == "Single Minded Proposition" else
+     "Desenvolva a narrativa:"}
+
+    {f"""
+    ### GET/TO/BY
+    **GET** [Audiência]:
+    **TO** [Mudança desejada]:
+    **BY** [Meio/Mecanismo]:
+    """ if framework == "GET/TO/BY" else
+    f"""
+    ### Single Minded Proposition
+    **Proposição Única:** [1 frase impactante]
+    **Razão para Acreditar:** [3 pontos]
+    """ if framework == "Single Minded Proposition" else
+    f"""
+    ### Tensão → Insight → Ideia
+    **Tensão:** [Recapitulação]
+    **Insight Chave:** [Do research]
+    **Ideia Central:** [Solução criativa]
+    """}
+
+    Formato: markdown com exemplos concretos.
+    """
+
+
+# 5. Estratégia de Conteúdo
+def content_strategy_prompt(content_goal: str, content_audience: str, content_channels: List[str],
+                            content_budget: str) -> str:
+    return f"""
+    Crie uma estratégia de conteúdo completa para:
+    **Objetivo:** {content_goal}
+    **Público:** {content_audience}
+    **Canais:** {', '.join(content_channels)}
+    **Orçamento:** {content_budget}
+
+    A estratégia deve incluir:
+
+    ### 1. Pilares de Conteúdo (3-5 temas centrais)
+    Para cada pilar:
+    - Justificativa estratégica
+    - Ângulos de abordagem
+    - Exemplos concretos
+
+    ### 2. Tipos de Conteúdo por Canal
+    - Formatos recomendados
+    - Frequência ideal
+    - Recursos necessários
+
+    ### 3. Calendário Editorial
+    - Estrutura de temas mensais
+    - Datas relevantes
+    - Balanceamento de formatos
+
+    ### 4. Fluxo de Conversão
+    - Como o conteúdo leva ao objetivo
+    - Chamadas para ação
+    - Integração entre canais
+
+    Formato: markdown com formatação rica e exemplos.
+    """
+
+
+# 6. Estratégia de Marca
+def brand_audit_prompt(brand_name: str, brand_category: str) -> str:
+    return f"""
+    Realize um Brand Audit completo para {brand_name} ({brand_category}) com 14 perguntas críticas:
+
+    1. **Propósito**: Por que a marca existe além de lucrar?
+    2. **Posicionamento**: Como é única na mente dos consumidores?
+    3. **Arquitetura**: Masterbrand, House of Brands ou Híbrida?
+    4. **Valores**: Quais 3-5 valores fundamentais?
+    5. **Personalidade**: Se fosse uma pessoa, como seria?
+    6. **Visual Identity**: Elementos distintivos?
+    7. **Voz e Tom**: Como comunica?
+    8. **Experiência**: Promessa consistente em todos os pontos?
+    9. **Cultura**: Como é internalizada na organização?
+    10. **Diferenciação**: Vantagens competitivas reais?
+    11. **Consistência**: Coerência ao longo do tempo?
+    12. **Relevância**: Importância para o público-alvo?
+    13. **Flexibilidade**: Capacidade de evoluir?
+    14. **Resiliência**: Como lida com crises?
+
+    Formato: lista com respostas concisas para cada.
+    """
+
+
+def benefit_ladder_prompt(brand_name: str, brand_category: str) -> str:
+    return f"""
+    Construa uma Benefit Ladder para {brand_name} ({brand_category}) com 4 níveis:
+
+    1. **Atributos**: Características físicas/funcionais
+    2. **Benefícios Funcionais**: O que faz pelo consumidor
+    3. **Benefícios Emocionais**: Como faz se sentir
+    4. **Propósito**: Impacto maior no mundo
+
+    Exemplo:
+    | Nível | Conteúdo |
+    |-------|---------|
+    | Atributo | Bebida gaseificada com extrato de cola |
+    | Funcional | Refresca e revigora |
+    | Emocional | Promove momentos de felicidade |
+    | Propósito | Inspira otimismo e conexão humana |
+    """
+
+
+def brand_prism_prompt(brand_name: str, brand_category: str) -> str:
+    return f"""
+    Defina o Brand Identity Prism para {brand_name} ({brand_category}) com 6 dimensões:
+
+    1. **Físico**: Características tangíveis
+    2. **Personalidade**: Caráter humano
+    3. **Cultura**: Valores e origens
+    4. **Relacionamento**: Conexão com consumidores
+    5. **Autoimagem**: Como os usuários se veem usando
+    6. **Reflexo**: Como reflete seus consumidores
+
+    Formato: tabela markdown com exemplos.
+    """
+
+
+# 7. Comunicação e Canais
+# Opções dos selectbox; as análises só com estas entradas são pré-computadas (warm_cache.py)
+CAMPAIGN_GOALS = ["Awareness", "Consideração", "Conversão", "Engajamento", "Fidelização"]
+BUDGET_RANGES = ["Baixo (até 50k)", "Médio (50-500k)", "Alto (500k+)"]
+
+
+def communication_plan_prompt(campaign_goal: str, budget_range: str) -> str:
+    return f"""
+    Crie um plano de comunicação completo para:
+    **Objetivo:** {campaign_goal}
+    **Orçamento:** {budget_range}
+
+    Inclua:
+
+    ### 1. Estratégia de Conteúdo
+    - Tema central
+    - Formatos prioritários
+    - Tom de voz
+
+    ### 2. Canais Recomendados
+    - Distribuição por fase (Awareness → Consideração → Conversão)
+    - Mix ideal para o orçamento
+    - Canais emergentes a considerar
+
+    ### 3. Calendário
+    - Fases da campanha (teaser → lançamento → sustentação)
+    - Frequência de publicação
+    - Momentos-chave
+
+    ### 4. Métricas por Canal
+    - KPIs primários
+    - Benchmarks esperados
+    - Ferramentas de medição
+
+    Formato: markdown com tabelas quando aplicável.
+    """
+
+
+# 8. Métricas e KPIs
+KPI_GOALS = ["Awareness", "Consideração", "Conversão", "Retenção", "Upsell"]
+MARKET_POSITIONS = ["Líder", "Desafiante", "Seguidor", "Nicho"]
+
+
+def kpi_prompt(business_goal: str) -> str:
+    return f"""
+    Para o objetivo de {business_goal}, recomende:
+
+    ### Métricas Primárias
+    - 3-5 KPIs principais
+    - Benchmarks do setor
+    - Como medir (ferramentas)
+
+    ### Métricas Secundárias
+    - Indicadores complementares
+    - Sinais precoces
+    - Métricas de qualidade
+
+    ### Armadilhas Comuns
+    - Vanity metrics a evitar
+    - Problemas de atribuição
+    - Viéses comuns
+
+    Formato: markdown com tabelas comparativas.
+    """
+
+
+def esov_prompt(market_position: str) -> str:
+    return f"""
+    Para uma marca na posição de {market_position}, analise:
+
+    ### Situação Ideal ESOV
+    - % de Share of Voice recomendado
+    - Como alocar por canal
+    - Estratégias para aumentar SOV
+
+    ### Diagnóstico Atual
+    - Como calcular SOV atual
+    - Fontes de dados
+    - Benchmarks do setor
+
+    ### Estratégias
+    - Táticas para líderes
+    - Táticas para desafiantes
+    - Táticas para nicho
+
+    Formato: markdown com exemplos.
+    """
+
+
+def entry_points_prompt(product_category: str) -> str:
+    return f"""
+    Para a categoria {product_category}, identifique:
+
+    ### 5-7 Principais Entry Points
+    - Situações
+    - Necessidades
+    - Gatilhos mentais
+
+    ### Estratégias por Ponto
+    - Como estar presente
+    - Mensagens-chave
+    - Canais prioritários
+
+    ### Exemplo de Mapeamento
+    | Entry Point | Estratégia | Exemplo |
+    |------------|------------|---------|
+    | [Momento]  | [Tática]   | [Caso]  |
+
+    Formato: markdown completo.
+    """
+
+
+# 9. Estrutura de Time
+ORG_SIZES = ["Startup (<10)", "Pequena (10-50)", "Média (50-200)", "Grande (200+)"]
+PROJECT_SCOPES = ["Campanha", "Lançamento", "Transformação", "Operação Contínua"]
+
+
+def team_structure_prompt(org_size: str, project_scope: str) -> str:
+    return f"""
+    Para uma organização {org_size} trabalhando em {project_scope}, recomende:
+
+    ### Equipe Essencial
+    - Funções críticas
+    - Alocação (% tempo)
+    - Habilidades-chave
+
+    ### Modelo de Operação
+    - Estrutura (centralizada x descentralizada)
+    - Processos de aprovação
+    - Ferramentas colaborativas
+
+    ### Carga de Trabalho
+    - FTE necessário
+    - Picos esperados
+    - Necessidade de parceiros
+
+    ### Cultura Recomendada
+    - Valores de equipe
+    - Ritmos (sprints, revisões)
+    - Métricas internas
+
+    Formato: markdown com organograma sugerido.
+    """
+
+
+# 10. Análises Estratégicas
+def swot_prompt(company_overview: str) -> str:
+    return f"""
+    Crie uma análise SWOT detalhada para:
+    {company_overview}
+
+    **Forças:**
+    - 3-5 vantagens internas
+    - Como sustentar
+
+    **Fraquezas:**
+    - 3-5 limitações internas
+    - Como mitigar
+
+    **Oportunidades:**
+    - 3-5 fatores externos positivos
+    - Como capitalizar
+
+    **Ameaças:**
+    - 3-5 riscos externos
+    - Como preparar
+
+    **Matriz de Priorização:**
+    | Critério | Impacto | Probabilidade | Prioridade |
+    |----------|---------|---------------|------------|
+    | [Item]   | [Alto/Médio/Baixo] | [Alta/Média/Baixa] | [1-5] |
+
+    Formato: markdown completo.
+    """
+
+
+def pestle_prompt(industry: str) -> str:
+    return f"""
+    Realize análise PESTLE para o setor {industry}:
+
+    **Políticos:**
+    - 3-5 fatores
+    - Impacto potencial
+
+    **Econômicos:**
+    - 3-5 fatores
+    - Impacto potencial
+
+    **Sociais:**
+    - 3-5 fatores
+    - Impacto potencial
+
+    **Tecnológicos:**
+    - 3-5 fatores
+    - Impacto potencial
+
+    **Legais:**
+    - 3-5 fatores
+    - Impacto potencial
+
+    **Ambientais:**
+    - 3-5 fatores
+    - Impacto potencial
+
+    **Recomendações:**
+    - Como se preparar
+    - Sinais de mudança
+
+    Formato: markdown com tabela resumo.
+    """
+
+
+def opportunities_prompt(market_trends: str) -> str:
+    return f"""
+    Com base nestas tendências:
+    {market_trends}
+
+    Identifique:
+
+    ### 3-5 Oportunidades Estratégicas
+    - Descrição
+    - Janela de tempo
+    - Recursos necessários
+    - Casos análogos
+
+    ### 3-5 Ameaças Potenciais
+    - Natureza do risco
+    - Probabilidade
+    - Sinais de alerta
+    - Planos de contingência
+
+    **Matriz de Priorização:**
+    | Item | Impacto | Preparação | Ação Recomendada |
+    |------|---------|------------|------------------|
+    | [O/A] | [1-5] | [1-5] | [Diretriz] |
+
+    Formato: markdown completo.
+    """
@@ -0,0 +1,31 @@
+"""Clientes dos provedores de modelos, criados uma única vez por processo.
+
+Os SDKs (openai, google.generativeai) são importados apenas no primeiro uso,
+de modo que sessões que nunca chamam um provedor não pagam a importação e os
+reruns do Streamlit reaproveitam os mesmos clientes.
+"""
+from functools import lru_cache
+
+from config import GEMINI_API_KEY, GEMINI_GENERATION_CONFIG, GEMINI_MODEL, OPENAI_API_KEY
+
+
+@lru_cache(maxsize=None)
+def get_openai_client():
+    """Cliente OpenAI único por processo (mantém o pool de conexões HTTP)"""
+    from openai import OpenAI
+    return OpenAI(api_key=OPENAI_API_KEY)
+
+
+@lru_cache(maxsize=None)
+def get_async_openai_client():
+    """Cliente AsyncOpenAI único, usado só no laço de eventos de async_providers.py"""
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+
+@lru_cache(maxsize=None)
+def get_gemini_model():
+    """Modelo Gemini configurado uma única vez por processo"""
+    import google.generativeai as genai
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai.GenerativeModel(GEMINI_MODEL, generation_config=GEMINI_GENERATION_CONFIG)
@@ -0,0 +1,206 @@
+"""Montagem do contexto de RAG a partir dos documentos recuperados"""
+import contextvars
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from config import (
+    RAG_CONTEXT_MAX_CHARS,
+    RAG_METADATA_FIELDS,
+    RAG_TEXT_FIELDS,
+    RETRIEVAL_CONCURRENCY,
+    RETRIEVAL_FANOUT,
+    RETRIEVAL_LIMIT_PER_QUERY,
+    RETRIEVAL_MMR_LAMBDA,
+    RETRIEVAL_OVERFETCH,
+    RETRIEVAL_TOKEN_BUDGET,
+    RETRIEVAL_TOP_K,
+)
+from prompting import count_tokens
+from telemetry import span
+
+# Projeção enviada ao vector_search: só texto e metadados úteis, nunca o $vector
+RAG_PROJECTION = {field: 1 for field in RAG_TEXT_FIELDS + RAG_METADATA_FIELDS}
+
+
+def clean_projection(projection: Optional[Dict]) -> Dict:
+    """Remove pedidos do vetor (ou de todos os campos) de uma projeção"""
+    projection = {k: v for k, v in (projection or {}).items() if k not in ("$vector", "*")}
+    return projection or {"$vector": 0}
+
+
+def get_field(doc: Dict, path: str):
+    """Lê um campo do documento, aceitando caminhos com ponto (ex.: metadata.source)"""
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def apply_projection(doc: Dict, projection: Optional[Dict]) -> Dict:
+    """Aplica localmente uma projeção de inclusão/exclusão no estilo da Data API"""
+    projection = clean_projection(projection)
+    if all(not v for v in projection.values()):
+        return {k: v for k, v in doc.items() if k not in projection}
+    projected = {"_id": doc.get("_id")}
+    for path, include in projection.items():
+        value = get_field(doc, path)
+        if include and value is not None:
+            target = projected
+            parts = path.split(".")
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+    if "$similarity" in doc:
+        projected["$similarity"] = doc["$similarity"]
+    return projected
+
+
+def document_text(doc: Dict) -> str:
+    """Primeiro campo de texto não vazio do documento"""
+    for field in RAG_TEXT_FIELDS:
+        value = get_field(doc, field)
+        if isinstance(value, str) and value.strip():
+            return value
+    return ""
+
+
+def build_context(docs: List[Dict], max_chars: int = RAG_CONTEXT_MAX_CHARS) -> str:
+    """Renderiza os documentos em um bloco de texto compacto, sem duplicatas e com tamanho limitado"""
+    seen = set()
+    blocks = []
+    remaining = max_chars
+    for doc in docs:
+        text = " ".join(document_text(doc).split())
+        if not text:
+            continue
+        fingerprint = hashlib.sha1(text.lower().encode("utf-8")).hexdigest()
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        sources = dict.fromkeys(
+            str(value) for value in (get_field(doc, f) for f in RAG_METADATA_FIELDS) if value
+        )
+        header = f"[{len(blocks) + 1}]" + (f" ({' · '.join(sources)})" if sources else "")
+        block = f"{header} {text}"
+        if len(block) > remaining:
+            if remaining > len(header) + 20:
+                blocks.append(block[:remaining - 1].rstrip() + "…")
+            break
+        blocks.append(block)
+        remaining -= len(block) + 1
+    return "\n".join(blocks)
+
+
+def document_key(doc: Dict) -> str:
+    """Identidade do documento para deduplicação: _id, ou o hash do texto quando não houver"""
+    if doc.get("_id") is not None:
+        return str(doc["_id"])
+    return hashlib.sha1(" ".join(document_text(doc).split()).lower().encode("utf-8")).hexdigest()
+
+
+def reciprocal_rank_fusion(result_lists: List[List[Dict]], k: int = 60,
+                           limit: Optional[int] = None) -> List[Dict]:
+    """Combina rankings somando 1/(k + posição) de cada documento em cada lista"""
+    scores: Dict[str, float] = {}
+    docs: Dict[str, Dict] = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results):
+            key = document_key(doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank + 1)
+            docs.setdefault(key, doc)
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [docs[key] for key in ranked[:limit]]
+
+
+def mmr_rerank(query_vector: List[float], docs: List[Dict], top_k: int = RETRIEVAL_LIMIT_PER_QUERY,
+               relevance_weight: float = RETRIEVAL_MMR_LAMBDA,
+               token_budget: int = RETRIEVAL_TOKEN_BUDGET) -> List[Dict]:
+    """Escolhe até top_k candidatos por máxima relevância marginal, dentro do orçamento de tokens.
+
+    Os cossenos com a consulta e entre candidatos saem de uma única multiplicação
+    de matrizes; candidatos sem $vector ficam de fora. O $vector não é devolvido.
+    """
+    candidates = [doc for doc in docs if doc.get("$vector") is not None]
+    if not candidates or not query_vector:
+        return [{k: v for k, v in doc.items() if k != "$vector"} for doc in docs[:top_k]]
+    matrix = np.asarray([doc["$vector"] for doc in candidates], dtype=np.float32)
+    query = np.asarray(query_vector, dtype=np.float32)
+    if matrix.shape[1] != query.shape[0]:
+        return [{k: v for k, v in doc.items() if k != "$vector"} for doc in docs[:top_k]]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1.0, norms)
+    query /= np.linalg.norm(query) or 1.0
+    # Linha 0: relevância de cada candidato; linhas seguintes: similaridade entre candidatos
+    similarities = np.vstack([query, matrix]) @ matrix.T
+    relevance, pairwise = similarities[0], similarities[1:]
+    tokens = np.asarray([count_tokens(document_text(doc)) for doc in candidates])
+
+    selected: List[int] = []
+    available = np.ones(len(candidates), dtype=bool)
+    # Maior similaridade de cada candidato com os já escolhidos
+    redundancy = np.zeros(len(candidates), dtype=np.float32)
+    used = 0
+    while len(selected) < top_k:
+        # O primeiro trecho entra mesmo acima do orçamento; os demais só se couberem
+        fits = available & ((tokens <= token_budget - used) | (not selected))
+        if not fits.any():
+            break
+        scores = relevance_weight * relevance - (1 - relevance_weight) * redundancy
+        scores[~fits] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, pairwise[best])
+        used += int(tokens[best])
+    return [{k: v for k, v in candidates[i].items() if k != "$vector"} for i in selected]
+
+
+def reranked_search(backend, collection: str, vector: List[float], top_k: int = RETRIEVAL_LIMIT_PER_QUERY,
+                    fetch_k: int = RETRIEVAL_OVERFETCH, projection: Optional[Dict] = None) -> List[Dict]:
+    """Busca fetch_k candidatos com seus vetores e devolve os top_k reordenados por MMR"""
+    candidates = backend.vector_search(collection, vector, limit=max(fetch_k, top_k),
+                                       projection=RAG_PROJECTION if projection is None else projection,
+                                       include_vector=True)
+    return rerank_candidates(vector, candidates, top_k)
+
+
+def rerank_candidates(vector: List[float], candidates: List[Dict], top_k: int = RETRIEVAL_LIMIT_PER_QUERY) -> List[Dict]:
+    """Reordena por MMR candidatos já buscados com $vector (parte local de reranked_search)"""
+    with span("rag.rerank") as current:
+        docs = mmr_rerank(vector, candidates, top_k=top_k)
+        current.set(candidates=len(candidates), documents=len(docs))
+    return docs
+
+
+def query_variants(queries: List[str], fanout: int = RETRIEVAL_FANOUT) -> List[str]:
+    """Formulações não vazias e sem repetição, no máximo fanout"""
+    return list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))[:fanout]
+
+
+def multi_query_search(queries: List[str], embed_many: Callable[[List[str]], List[List[float]]],
+                       search: Callable[[List[float]], List[Dict]],
+                       fanout: int = RETRIEVAL_FANOUT, max_concurrency: int = RETRIEVAL_CONCURRENCY,
+                       limit: int = RETRIEVAL_TOP_K,
+                       initializer: Optional[Callable[[], None]] = None) -> List[Dict]:
+    """Busca várias formulações da mesma consulta e funde os resultados.
+
+    Os embeddings saem de uma única chamada em lote e as buscas vetoriais rodam
+    em paralelo, limitadas por max_concurrency.
+    """
+    queries = query_variants(queries, fanout)
+    if not queries:
+        return []
+    vectors = [v for v in embed_many(queries) if v]
+    if not vectors:
+        return []
+    workers = max(1, min(max_concurrency, len(vectors)))
+    with ThreadPoolExecutor(max_workers=workers, initializer=initializer) as executor:
+        # Cada busca roda numa cópia do contexto de quem chamou (marcas da telemetria)
+        contexts = [contextvars.copy_context() for _ in vectors]
+        result_lists = list(executor.map(lambda context, vector: context.run(search, vector), contexts, vectors))
+    return reciprocal_rank_fusion(result_lists, limit=limit)
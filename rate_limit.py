@@ -0,0 +1,284 @@
+"""Escalonador de chamadas aos provedores: limites por minuto, prioridade e concorrência adaptativa.
+
+Cada provedor (gemini, openai, astra) tem:
+- baldes de fichas para requisições/min e tokens/min; com RATE_LIMIT_DB o
+  estado dos baldes fica em SQLite e é compartilhado entre processos;
+- fila de prioridade: cliques interativos passam na frente de jobs em lote;
+- limite de chamadas simultâneas que cai pela metade a cada 429 e volta a
+  crescer aos poucos com as respostas bem-sucedidas (AIMD).
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional
+
+from config import RATE_LIMIT_DB, RATE_LIMIT_MAX_RETRIES, RATE_LIMITS
+from telemetry import note
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+_default_priority = PRIORITY_INTERACTIVE
+_context_priority: contextvars.ContextVar = contextvars.ContextVar("scheduler_priority", default=None)
+
+
+def set_default_priority(priority: int):
+    """Prioridade das chamadas deste processo (o modo em lote usa PRIORITY_BATCH)"""
+    global _default_priority
+    _default_priority = priority
+
+
+@contextmanager
+def prioritized(priority: int):
+    """Prioridade das chamadas feitas dentro do bloco (ex.: buscas antecipadas em segundo plano)"""
+    token = _context_priority.set(priority)
+    try:
+        yield
+    finally:
+        _context_priority.reset(token)
+
+
+def current_priority() -> int:
+    priority = _context_priority.get()
+    return _default_priority if priority is None else priority
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Reconhece 429/quota esgotada nos SDKs da OpenAI, do Gemini e nas respostas HTTP"""
+    for attr in ("status_code", "code", "status"):
+        if getattr(error, attr, None) == 429:
+            return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return type(error).__name__ in ("RateLimitError", "ResourceExhausted", "TooManyRequests")
+
+
+class RateLimitStore:
+    """Estado dos baldes em SQLite, compartilhado por todos os processos que usam o mesmo arquivo"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, level REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def reserve(self, name: str, amount: float, rate: float, capacity: float) -> float:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT level, updated_at FROM buckets WHERE name = ?", (name,)
+                ).fetchone()
+                now = time.time()
+                level, delay = _reserve(row[0] if row else capacity, row[1] if row else now,
+                                        now, amount, rate, capacity)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (name, level, updated_at) VALUES (?, ?, ?)",
+                    (name, level, now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return delay
+
+
+def _reserve(level: float, updated_at: float, now: float, amount: float, rate: float,
+             capacity: float):
+    """Reabastece o balde e reserva `amount`; saldo negativo vira tempo de espera"""
+    level = min(capacity, level + (now - updated_at) * rate) - min(amount, capacity)
+    return level, max(-level / rate, 0.0)
+
+
+class TokenBucket:
+    """Balde de fichas com reserva: quem reserva primeiro espera menos, preservando a ordem da fila"""
+
+    def __init__(self, name: str, per_minute: float, store: Optional[RateLimitStore] = None):
+        self.name = name
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self._store = store
+        self._level = self.capacity
+        self._updated_at = time.time()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Reserva `amount` e retorna quantos segundos esperar antes de usar"""
+        if amount <= 0 or self.rate <= 0:
+            return 0.0
+        if self._store is not None:
+            return self._store.reserve(self.name, amount, self.rate, self.capacity)
+        with self._lock:
+            now = time.time()
+            self._level, delay = _reserve(self._level, self._updated_at, now, amount, self.rate, self.capacity)
+            self._updated_at = now
+        return delay
+
+
+class ProviderScheduler:
+    """Fila de prioridade + limites por minuto + concorrência adaptativa para um provedor"""
+
+    def __init__(self, name: str, rpm: float, tpm: float, max_concurrency: int,
+                 store: Optional[RateLimitStore] = None):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.limit = float(max_concurrency)
+        self.active = 0
+        self.requests = TokenBucket(f"{name}:rpm", rpm, store)
+        self.tokens = TokenBucket(f"{name}:tpm", tpm, store)
+        self.calls = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self._cond = threading.Condition()
+        self._queue = []
+        self._reserving = False
+        self._sequence = itertools.count()
+
+    def _acquire(self, tokens: int, priority: int):
+        ticket = (priority, next(self._sequence))
+        started = time.perf_counter()
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            while self._queue[0] != ticket or self._reserving or self.active >= max(int(self.limit), 1):
+                self._cond.wait()
+            # Só um chamador reserva por vez, então as reservas seguem a ordem da fila
+            self._reserving = True
+        reserved = False
+        try:
+            # Fora do lock: com RATE_LIMIT_DB é uma transação SQLite, que pode demorar ou falhar (banco travado)
+            delay = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+            reserved = True
+        finally:
+            with self._cond:
+                self._reserving = False
+                # Outra ficha de prioridade maior pode ter entrado na frente durante a reserva
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                # A vaga só é ocupada com a reserva feita; se ela falhou, nada vaza
+                if reserved:
+                    self.active += 1
+                self._cond.notify_all()
+        if delay:
+            time.sleep(delay)
+        with self._cond:
+            self.wait_seconds += time.perf_counter() - started
+
+    def _release(self, rate_limited: bool):
+        with self._cond:
+            self.active -= 1
+            self.calls += 1
+            if rate_limited:
+                self.throttled += 1
+                self.limit = max(self.limit / 2, 1.0)
+            else:
+                self.limit = min(self.limit + 1 / self.limit, float(self.max_concurrency))
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, tokens: int = 0, priority: Optional[int] = None):
+        """Ocupa uma vaga do provedor durante o bloco (ex.: todo o streaming de uma resposta)"""
+        self._acquire(tokens, current_priority() if priority is None else priority)
+        rate_limited = False
+        try:
+            yield
+        except Exception as e:
+            rate_limited = is_rate_limit_error(e)
+            raise
+        finally:
+            self._release(rate_limited)
+
+    @asynccontextmanager
+    async def async_slot(self, tokens: int = 0, priority: Optional[int] = None):
+        """slot() para corrotinas: a espera pela vaga acontece numa thread, sem travar o laço de eventos"""
+        acquire = asyncio.ensure_future(
+            asyncio.to_thread(self._acquire, tokens, current_priority() if priority is None else priority)
+        )
+
+        def release_acquired(done: asyncio.Future):
+            if not done.cancelled() and done.exception() is None:
+                self._release(False)
+
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # A thread continua esperando a vaga mesmo com a corrotina cancelada;
+            # quando ela conseguir, a vaga é devolvida para não vazar
+            if acquire.done():
+                release_acquired(acquire)
+            else:
+                acquire.add_done_callback(release_acquired)
+            raise
+        rate_limited = False
+        try:
+            yield
+        except Exception as e:
+            rate_limited = is_rate_limit_error(e)
+            raise
+        finally:
+            self._release(rate_limited)
+
+    def report_rate_limited(self):
+        """Registra um 429 tratado pelo próprio chamador (ex.: retentativas HTTP do Astra)"""
+        with self._cond:
+            self.throttled += 1
+            self.limit = max(self.limit / 2, 1.0)
+
+    def call(self, fn: Callable, *args, tokens: int = 0, priority: Optional[int] = None, **kwargs):
+        """Executa fn dentro de uma vaga, repetindo com espera exponencial quando o provedor responde 429"""
+        for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+            try:
+                with self.slot(tokens, priority):
+                    return fn(*args, **kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == RATE_LIMIT_MAX_RETRIES:
+                    raise
+                note("retries")
+                time.sleep(random.uniform(0, min(30.0, 0.5 * 2 ** attempt)))
+
+    async def call_async(self, fn: Callable[..., Awaitable], *args, tokens: int = 0,
+                         priority: Optional[int] = None, **kwargs):
+        """call() para corrotinas (ex.: métodos do AsyncOpenAI)"""
+        for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+            try:
+                async with self.async_slot(tokens, priority):
+                    return await fn(*args, **kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == RATE_LIMIT_MAX_RETRIES:
+                    raise
+                note("retries")
+                await asyncio.sleep(random.uniform(0, min(30.0, 0.5 * 2 ** attempt)))
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "active": self.active,
+                "queued": len(self._queue),
+                "concurrency_limit": round(self.limit, 2),
+                "wait_seconds": round(self.wait_seconds, 2),
+            }
+
+
+@lru_cache(maxsize=None)
+def _shared_store() -> Optional[RateLimitStore]:
+    return RateLimitStore(RATE_LIMIT_DB) if RATE_LIMIT_DB else None
+
+
+@lru_cache(maxsize=None)
+def get_scheduler(provider: str) -> ProviderScheduler:
+    """Escalonador único por provedor e processo"""
+    limits = RATE_LIMITS[provider]
+    return ProviderScheduler(provider, limits["rpm"], limits["tpm"], limits["concurrency"], _shared_store())
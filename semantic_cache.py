@@ -0,0 +1,255 @@
+"""Cache semântico de respostas: reaproveita respostas de prompts quase iguais.
+
+O prompt é dividido em duas partes. O texto livre digitado pelo usuário é
+comparado por similaridade de cosseno entre embeddings. O restante (modelo,
+construtor do prompt renderizado com marcadores no lugar do texto livre e
+opções escolhidas) forma o escopo, que precisa coincidir exatamente. Assim, "Nike" e "nike" reaproveitam a mesma análise, mas uma SWOT
+nunca responde a um pedido de PESTLE.
+"""
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import (
+    CACHE_DIR,
+    LLM_CACHE_TTL_HOURS,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_SAMPLE_RATE,
+    SEMANTIC_CACHE_THRESHOLD,
+)
+from llm_cache import normalize_prompt
+
+
+def semantic_text(inputs: List[str]) -> str:
+    """Texto livre que será comparado por embedding (sem diferenças de caixa ou espaços)"""
+    return normalize_prompt("\n".join(inputs)).casefold()
+
+
+@dataclass(frozen=True)
+class SemanticPrompt:
+    """Chamada a um construtor de prompts.py; free são as posições dos argumentos de texto livre (padrão: todos)"""
+    builder: Callable[..., str]
+    args: Tuple[Any, ...]
+    free: Optional[Tuple[int, ...]] = None
+
+    def _free_positions(self) -> Tuple[int, ...]:
+        return tuple(range(len(self.args))) if self.free is None else self.free
+
+    def inputs(self) -> List[str]:
+        """Textos livres, comparados por embedding"""
+        return [self.args[i] for i in self._free_positions()]
+
+    def render(self) -> str:
+        return self.builder(*self.args)
+
+    def skeleton(self) -> str:
+        """Template renderizado com marcadores no lugar do texto livre (as opções escolhidas ficam no texto)"""
+        free = set(self._free_positions())
+        return self.builder(*(f"\x00{i}\x00" if i in free else arg for i, arg in enumerate(self.args)))
+
+
+def semantic_scope(model: str, config: Optional[Dict], prompt: str, semantic: SemanticPrompt) -> Optional[str]:
+    """Escopo exato: modelo, configuração, template com as opções escolhidas e o envelope após o template.
+
+    None quando o prompt enviado não começa pelo template renderizado; sem
+    garantia de escopo, o cache semântico não é usado.
+    """
+    base = semantic.render()
+    if not prompt.startswith(base):
+        return None
+    payload = json.dumps(
+        {
+            "model": model,
+            "config": config or {},
+            "builder": f"{semantic.builder.__module__}.{semantic.builder.__qualname__}",
+            "template": semantic.skeleton(),
+            "suffix": prompt[len(base):],
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SemanticCache:
+    """Respostas indexadas por escopo + vetor normalizado, com LRU, TTL e amostragem de acertos"""
+
+    def __init__(self, path: str, threshold: float, max_entries: int, ttl_seconds: float,
+                 sample_rate: float = 0.0):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sample_rate = sample_rate
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # Matrizes por escopo e dimensão mantidas em memória; descartadas quando o banco muda
+        self._matrices: Dict[Tuple[str, int], Tuple[List[int], Optional[np.ndarray]]] = {}
+        self._data_version = None
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS semantic_entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scope TEXT NOT NULL,
+                query TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_semantic_scope ON semantic_entries(scope);
+            CREATE INDEX IF NOT EXISTS idx_semantic_lru ON semantic_entries(last_access);
+            CREATE TABLE IF NOT EXISTS semantic_samples (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                query TEXT NOT NULL,
+                matched_query TEXT NOT NULL,
+                similarity REAL NOT NULL,
+                sampled_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def _matrix(self, scope: str, dimension: int):
+        """Ids e vetores (normalizados) do escopo na dimensão pedida, recarregados se outro processo gravou"""
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._matrices.clear()
+            self._data_version = version
+        if (scope, dimension) not in self._matrices:
+            # Entradas gravadas com outro perfil de embedding ficam de fora
+            rows = self._conn.execute(
+                "SELECT id, vector FROM semantic_entries WHERE scope = ? AND expires_at >= ? AND length(vector) = ?",
+                (scope, time.time(), dimension * 4),
+            ).fetchall()
+            ids = [row[0] for row in rows]
+            matrix = np.vstack([np.frombuffer(row[1], dtype=np.float32) for row in rows]) if rows else None
+            self._matrices[(scope, dimension)] = (ids, matrix)
+        return self._matrices[(scope, dimension)]
+
+    def get(self, scope: str, query: str, vector: List[float]) -> Optional[Dict]:
+        """Retorna a resposta mais parecida acima do limiar, com a similaridade e a consulta original"""
+        now = time.time()
+        with self._lock:
+            ids, matrix = self._matrix(scope, len(vector))
+            if matrix is None:
+                self.misses += 1
+                return None
+            query_vector = np.asarray(vector, dtype=np.float32)
+            query_vector /= np.linalg.norm(query_vector) or 1.0
+            scores = matrix @ query_vector
+            best = int(np.argmax(scores))
+            similarity = float(scores[best])
+            row = None
+            if similarity >= self.threshold:
+                row = self._conn.execute(
+                    "SELECT query, value, expires_at FROM semantic_entries WHERE id = ?", (ids[best],)
+                ).fetchone()
+            if row is None or row[2] < now:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE semantic_entries SET last_access = ?, hits = hits + 1 WHERE id = ?", (now, ids[best])
+            )
+            # Amostra de acertos para revisão manual de falsos positivos
+            if query != row[0] and random.random() < self.sample_rate:
+                self._conn.execute(
+                    "INSERT INTO semantic_samples (query, matched_query, similarity, sampled_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (query, row[0], similarity, now),
+                )
+            self._conn.commit()
+            self.hits += 1
+            return {"value": row[1], "similarity": similarity, "matched_query": row[0]}
+
+    def set(self, scope: str, query: str, vector: List[float], value: str):
+        """Armazena uma resposta e aplica o despejo por TTL e por número de entradas"""
+        if not value or not vector:
+            return
+        now = time.time()
+        normalized = np.asarray(vector, dtype=np.float32)
+        normalized /= np.linalg.norm(normalized) or 1.0
+        with self._lock:
+            # Uma nova geração para o mesmo texto (ex.: regenerar) substitui a anterior
+            self._conn.execute("DELETE FROM semantic_entries WHERE scope = ? AND query = ?", (scope, query))
+            self._conn.execute(
+                """
+                INSERT INTO semantic_entries (scope, query, vector, value, created_at, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (scope, query, normalized.tobytes(), value, now, now + self.ttl_seconds, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+            self._matrices.clear()
+
+    def _evict(self, now: float):
+        """Remove entradas expiradas e, acima do limite, as menos usadas recentemente"""
+        expired = self._conn.execute("DELETE FROM semantic_entries WHERE expires_at < ?", (now,)).rowcount
+        self.evictions += max(expired, 0)
+        total = self._conn.execute("SELECT COUNT(*) FROM semantic_entries").fetchone()[0]
+        if total > self.max_entries:
+            removed = self._conn.execute(
+                """
+                DELETE FROM semantic_entries WHERE id IN (
+                    SELECT id FROM semantic_entries ORDER BY last_access ASC LIMIT ?
+                )
+                """,
+                (total - self.max_entries,),
+            ).rowcount
+            self.evictions += max(removed, 0)
+
+    def samples(self, limit: int = 20) -> List[Dict]:
+        """Acertos amostrados mais recentes (consulta nova x consulta reaproveitada)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query, matched_query, similarity, sampled_at FROM semantic_samples "
+                "ORDER BY id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [
+            {"query": query, "matched_query": matched, "similarity": similarity, "sampled_at": sampled_at}
+            for query, matched, similarity, sampled_at in rows
+        ]
+
+    def stats(self) -> Dict[str, float]:
+        """Contadores de acertos/erros, ocupação e amostras coletadas"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM semantic_entries").fetchone()[0]
+            sampled = self._conn.execute("SELECT COUNT(*) FROM semantic_samples").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "samples": sampled,
+        }
+
+
+@lru_cache(maxsize=None)
+def get_semantic_cache() -> SemanticCache:
+    """Instância única do cache semântico por processo"""
+    return SemanticCache(
+        os.path.join(CACHE_DIR, "semantic.sqlite3"),
+        threshold=SEMANTIC_CACHE_THRESHOLD,
+        max_entries=SEMANTIC_CACHE_MAX_ENTRIES,
+        ttl_seconds=LLM_CACHE_TTL_HOURS * 3600,
+        sample_rate=SEMANTIC_CACHE_SAMPLE_RATE,
+    )
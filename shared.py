@@ -0,0 +1,397 @@
+"""Clientes e funções compartilhadas entre as páginas da aplicação"""
+import streamlit as st
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from typing import List, Dict, Optional, Tuple
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from config import (
+    CHAT_MODEL,
+    CHAT_TEMPERATURE,
+    COLLECTION_NAME,
+    EMBEDDING_DIMENSION,
+    EMBEDDING_MODEL,
+    GEMINI_GENERATION_CONFIG,
+    GEMINI_MODEL,
+    PREFETCH_ENABLED,
+    PROMPT_TOKEN_BUDGETS,
+    RETRIEVAL_LIMIT_PER_QUERY,
+    SEMANTIC_CACHE_ENABLED,
+)
+from artifact_store import get_artifact_store
+from async_providers import generate_stream_async, get_async_runner
+from providers import get_gemini_model, get_openai_client
+from generation import embed_texts, generate_cached
+from rate_limit import get_scheduler
+from telemetry import current_tags, record_usage, span, tagged
+from prefetch import get_prefetcher
+from warm_cache import get_warm_cache
+from llm_cache import cache_key, get_completion_cache
+from semantic_cache import SemanticPrompt, get_semantic_cache, semantic_scope, semantic_text
+from embedding_cache import get_embedding_cache
+from vector_index import get_vector_backend
+from rag import build_context, reranked_search
+from prompts import FOLLOWUP_MARKER, followup_instruction, split_followup
+from prompting import FittedSections, PromptSection, count_tokens, fit_sections, summary_prompt
+
+
+def cache_bypassed() -> bool:
+    """Indica se o usuário pediu para regenerar respostas ignorando o cache"""
+    return st.session_state.get("cache_bypass", False)
+
+def current_project() -> str:
+    """Id do projeto da sessão, mantido na URL (?projeto=) para sobreviver a refresh e reconexões"""
+    project = st.query_params.get("projeto")
+    if not project:
+        project = uuid.uuid4().hex[:12]
+        st.query_params["projeto"] = project
+    return project
+
+def save_artifact(name: str, value):
+    """Guarda o artefato na sessão e grava uma nova versão no armazenamento do projeto"""
+    st.session_state[name] = value
+    if value:
+        get_artifact_store().save(current_project(), name, value)
+
+def restore_artifacts():
+    """Ao abrir uma sessão (ou trocar de projeto), registra os artefatos salvos; o conteúdo só é lido por get_artifact"""
+    project = current_project()
+    previous = st.session_state.get("artifacts_project")
+    if previous == project:
+        return
+    store = get_artifact_store()
+    if previous is not None:
+        for name in store.latest_versions(previous):
+            st.session_state.pop(name, None)
+    st.session_state["artifacts_available"] = store.latest_versions(project)
+    st.session_state["artifacts_project"] = project
+
+def get_artifact(name: str):
+    """Artefato da sessão; no primeiro acesso após restore_artifacts, descomprime a última versão salva"""
+    if name not in st.session_state and name in st.session_state.get("artifacts_available", {}):
+        value = get_artifact_store().load(st.session_state["artifacts_project"], name)
+        if value is not None:
+            st.session_state[name] = value
+    return st.session_state.get(name)
+
+def get_embeddings(texts: List[str]) -> List[List[float]]:
+    """Obtém embeddings em lote, pagando apenas pelos textos ainda não armazenados em cache"""
+    try:
+        return embed_texts(texts)
+    except Exception as e:
+        st.error(f"Erro ao obter embedding: {str(e)}")
+        # Vetores obtidos antes do erro já estão no cache
+        cache = get_embedding_cache(EMBEDDING_MODEL, EMBEDDING_DIMENSION)
+        found = cache.get_many([text for text in texts if text])
+        return [found.get(text, []) for text in texts]
+
+def get_embedding(text: str) -> List[float]:
+    """Obtém embedding do texto usando OpenAI"""
+    return get_embeddings([text])[0]
+
+def generate_response(query: str, context: str) -> str:
+    """Gera resposta usando o modelo de chat da OpenAI"""
+    if not context:
+        return "Não encontrei informações relevantes para responder sua pergunta."
+    
+    prompt = f"""Responda baseado no contexto abaixo:
+    
+    Contexto:
+    {context}
+    
+    Pergunta: {query}
+    Resposta:"""
+    messages = [
+        {"role": "system", "content": '''
+        Você é um especialista em marketing digital. Com base na sua base de conhecimentos, 
+        ajude o usuário a encontrar a melhor estratégia para proceder.
+        '''},
+        {"role": "user", "content": prompt}
+    ]
+    
+    with span("openai.chat") as current:
+        cache = get_completion_cache()
+        key = cache_key(CHAT_MODEL, {"temperature": CHAT_TEMPERATURE}, json.dumps(messages, ensure_ascii=False))
+        if not cache_bypassed():
+            cached = cache.get(key)
+            if cached is not None:
+                current.set(cache="hit")
+                return cached
+        current.set(cache="bypass" if cache_bypassed() else "miss")
+        
+        try:
+            response = get_scheduler("openai").call(
+                get_openai_client().chat.completions.create,
+                model=CHAT_MODEL,
+                messages=messages,
+                temperature=CHAT_TEMPERATURE,
+                tokens=count_tokens(prompt)
+            )
+            content = response.choices[0].message.content
+            record_usage(current, getattr(response, "usage", None), prompt, content)
+            cache.set(key, CHAT_MODEL, content)
+            return content
+        except Exception as e:
+            current.error = type(e).__name__
+            return f"Erro ao gerar resposta: {str(e)}"
+
+
+def _visible_text(text: str) -> str:
+    """Parte da resposta parcial que pode ser exibida (oculta o marcador e a pergunta)"""
+    analysis = text.split(FOLLOWUP_MARKER, 1)[0]
+    # Evita exibir um marcador ainda incompleto no fim do buffer
+    for size in range(len(FOLLOWUP_MARKER) - 1, 0, -1):
+        if analysis.endswith(FOLLOWUP_MARKER[:size]):
+            return analysis[:-size]
+    return analysis
+
+
+def generate_text(prompt: str) -> str:
+    """Gera conteúdo com o Gemini sem streaming, usando o cache de respostas"""
+    return generate_cached(prompt, bypass_cache=cache_bypassed())
+
+
+def _semantic_lookup(prompt: str, semantic: Optional[SemanticPrompt]):
+    """Consulta o cache semântico pelo texto livre do prompt; retorna a entrada para gravação e o acerto"""
+    if not SEMANTIC_CACHE_ENABLED or semantic is None or not any(semantic.inputs()):
+        return None, None
+    scope = semantic_scope(GEMINI_MODEL, GEMINI_GENERATION_CONFIG, prompt, semantic)
+    if scope is None:
+        return None, None
+    query = semantic_text(semantic.inputs())
+    vector = get_embedding(query)
+    if not vector:
+        return None, None
+    entry = (scope, query, vector)
+    if cache_bypassed():
+        return entry, None
+    return entry, get_semantic_cache().get(*entry)
+
+
+def _semantic_caption(similarity: float):
+    st.caption(
+        f"⚡ Resposta reaproveitada do cache semântico (similaridade {similarity:.0%}). "
+        "Ative \"Regenerar respostas\" na barra lateral para gerar novamente."
+    )
+
+
+def render_stream(prompt: str, unsafe_allow_html: bool, placeholder=None,
+                  semantic: Optional[SemanticPrompt] = None) -> str:
+    """Renderiza a geração do Gemini em streaming e retorna o texto completo"""
+    placeholder = placeholder or st.empty()
+    with span("gemini.stream") as current:
+        cache = get_completion_cache()
+        key = cache_key(GEMINI_MODEL, GEMINI_GENERATION_CONFIG, prompt)
+        if not cache_bypassed():
+            # Análises pré-computadas (só selectbox) saem do artefato do warm_cache.py
+            warmed = get_warm_cache().get(key)
+            if warmed is not None:
+                current.set(cache="warm")
+                placeholder.markdown(_visible_text(warmed), unsafe_allow_html=unsafe_allow_html)
+                return warmed
+            cached = cache.get(key)
+            if cached is not None:
+                current.set(cache="hit")
+                placeholder.markdown(_visible_text(cached), unsafe_allow_html=unsafe_allow_html)
+                return cached
+        
+        # Texto livre quase igual a um pedido anterior com o mesmo template: reaproveita a resposta
+        semantic_entry, hit = _semantic_lookup(prompt, semantic)
+        if hit is not None:
+            current.set(cache="semantic", similarity=hit["similarity"])
+            with placeholder.container():
+                st.markdown(_visible_text(hit["value"]), unsafe_allow_html=unsafe_allow_html)
+                _semantic_caption(hit["similarity"])
+            return hit["value"]
+        current.set(cache="bypass" if cache_bypassed() else "miss")
+        
+        text = ""
+        usage = None
+        started = time.perf_counter()
+        # A vaga do provedor fica ocupada durante todo o streaming
+        with get_scheduler("gemini").slot(tokens=count_tokens(prompt)):
+            for chunk in get_gemini_model().generate_content(prompt, stream=True):
+                # O último chunk traz o usage_metadata com o total da resposta
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                try:
+                    text += chunk.text
+                except ValueError:
+                    # Chunks sem partes de texto (ex.: metadados finais ou bloqueio de segurança)
+                    continue
+                if "first_token_ms" not in current.attributes:
+                    current.set(first_token_ms=(time.perf_counter() - started) * 1000)
+                placeholder.markdown(_visible_text(text) + "▌", unsafe_allow_html=unsafe_allow_html)
+        record_usage(current, usage, prompt, text)
+        placeholder.markdown(_visible_text(text), unsafe_allow_html=unsafe_allow_html)
+        cache.set(key, GEMINI_MODEL, text)
+        if semantic_entry is not None:
+            get_semantic_cache().set(*semantic_entry, text)
+        return text
+
+
+def stream_markdown(prompt: str, unsafe_allow_html: bool = False,
+                    semantic: Optional[SemanticPrompt] = None) -> str:
+    """Gera conteúdo com o Gemini em streaming, renderizando o markdown à medida que chega"""
+    return render_stream(prompt, unsafe_allow_html, semantic=semantic)
+
+
+def stream_with_followup(prompt: str, unsafe_allow_html: bool = False, followup_hint: str = "",
+                         semantic: Optional[SemanticPrompt] = None) -> Tuple[str, str]:
+    """Gera a análise e a pergunta de busca em uma única chamada em streaming.
+
+    semantic é o construtor que montou o prompt e os seus argumentos; se
+    informado, a resposta pode vir do cache semântico quando o texto livre
+    for quase igual.
+    """
+    text = render_stream(prompt + followup_instruction(followup_hint), unsafe_allow_html,
+                          semantic=semantic)
+    return split_followup(text)
+
+
+def stream_concurrently(jobs: List[Tuple[str, str, Optional[SemanticPrompt]]],
+                        unsafe_allow_html: bool = False) -> Dict[str, Tuple[str, str]]:
+    """Gera várias análises ao mesmo tempo no laço assíncrono, cada uma em streaming na sua seção.
+
+    jobs são (título, prompt, semantic); o prompt recebe o envelope da
+    pergunta de busca, como em stream_with_followup. Cada seção é finalizada,
+    com a sua pergunta, assim que a análise termina; o tempo total é o da mais
+    lenta. Retorna, por título, a análise e a pergunta.
+    """
+    runner = get_async_runner()
+    bypass = cache_bypassed()
+    pending = {}
+    for title, prompt, semantic in jobs:
+        section = st.container()
+        section.subheader(title)
+        # O laço grava o texto parcial aqui; esta thread o exibe (só ela pode chamar st.*)
+        partial = {"text": ""}
+        future = runner.submit(generate_stream_async(
+            prompt + followup_instruction(), lambda text, partial=partial: partial.update(text=text),
+            semantic, bypass
+        ))
+        pending[title] = (section, section.empty(), partial, future)
+
+    results = {}
+    shown = {title: "" for title in pending}
+    while pending:
+        for title, (section, placeholder, partial, future) in list(pending.items()):
+            if not future.done():
+                if partial["text"] != shown[title]:
+                    shown[title] = partial["text"]
+                    placeholder.markdown(_visible_text(shown[title]) + "▌", unsafe_allow_html=unsafe_allow_html)
+                continue
+            del pending[title]
+            try:
+                generated = future.result()
+            except Exception as e:
+                placeholder.error(f"Erro ao gerar {title}: {str(e)}")
+                continue
+            with placeholder.container():
+                st.markdown(_visible_text(generated.text), unsafe_allow_html=unsafe_allow_html)
+                if generated.cache == "semantic":
+                    _semantic_caption(generated.similarity)
+            results[title] = split_followup(generated.text)
+            with section, tagged(action=title):
+                show_followup(results[title][1])
+        if pending:
+            time.sleep(0.1)
+    return results
+
+
+def summarize_section(text: str, max_tokens: int) -> str:
+    """Resume uma seção longa do prompt (o resumo fica no cache de respostas)"""
+    return generate_text(summary_prompt(text, max_tokens))
+
+
+def fit_prompt_sections(sections: List[PromptSection], stage: str) -> FittedSections:
+    """Ajusta as seções variáveis ao orçamento de tokens da etapa"""
+    return fit_sections(sections, PROMPT_TOKEN_BUDGETS[stage], summarizer=summarize_section)
+
+
+def tension_insight_sections() -> List[PromptSection]:
+    """Tensão e insights da sessão; os insights têm prioridade no orçamento"""
+    return [
+        PromptSection("Tensão", get_artifact('strategic_tension') or "", priority=1),
+        PromptSection("Insights", get_artifact('strategic_insights'), priority=2, summarizable=True),
+    ]
+
+
+def show_prompt_size(prompt: str, fitted: FittedSections):
+    """Exibe o tamanho final do prompt e quais seções precisaram ser reduzidas"""
+    caption = f"Prompt: {count_tokens(prompt)} tokens (seções: {fitted.tokens}/{fitted.budget})"
+    if fitted.reduced:
+        caption += f" · reduzidas: {', '.join(fitted.reduced)}"
+    st.caption(caption)
+
+
+def retrieve_documents(query: str, limit: int = RETRIEVAL_LIMIT_PER_QUERY) -> List[Dict]:
+    """Embedding da consulta, busca vetorial ampliada e reordenação por relevância e diversidade (MMR)"""
+    embedding = get_embedding(query)
+    if not embedding:
+        return []
+    return reranked_search(get_vector_backend(), COLLECTION_NAME, embedding, top_k=limit)
+
+
+def streamlit_thread_initializer():
+    """Inicializador de threads que herdam o contexto do script (permite st.* nas etapas)"""
+    ctx = get_script_run_ctx()
+    return lambda: add_script_run_ctx(threading.current_thread(), ctx)
+
+
+def show_followup(question: str):
+    """Exibe a pergunta sugerida e, em segundo plano, busca o conhecimento de apoio para ela"""
+    if question:
+        st.markdown("**Pergunta para Base de Dados:**")
+        st.markdown(question)
+        if not PREFETCH_ENABLED:
+            return
+        # Uma busca por página e botão; a anterior do mesmo botão é cancelada
+        tags = current_tags()
+        key = f"{tags.get('page', '')}/{tags.get('action', '')}"
+        jobs = st.session_state.setdefault('supporting_knowledge', {})
+        job = jobs.get(key)
+        if job is None or job.question != question or job.cancelled:
+            if job is not None:
+                job.cancel()
+            jobs[key] = get_prefetcher().submit(question, st.session_state.setdefault('prefetch_pending', deque()))
+        with st.expander("📚 Conhecimento de apoio"):
+            _supporting_panel(key)
+
+
+def _supporting_panel(key: str):
+    """Busca já resolvida é desenhada direto; só a pendente entra no fragmento que consulta a cada segundo"""
+    job = st.session_state.get('supporting_knowledge', {}).get(key)
+    if job is None:
+        return
+    if job.cancelled or job.done():
+        _render_supporting(job, key)
+    else:
+        _pending_supporting_panel(key)
+
+
+@st.fragment(run_every=1)
+def _pending_supporting_panel(key: str):
+    """Mostra os documentos assim que a busca termina, sem rerun da página inteira"""
+    job = st.session_state.get('supporting_knowledge', {}).get(key)
+    if job is not None:
+        _render_supporting(job, key)
+
+
+def _render_supporting(job, key: str):
+    if job.cancelled:
+        st.caption("Busca cancelada.")
+        return
+    if not job.done():
+        st.caption("Buscando na base de conhecimento em segundo plano...")
+        if st.button("Cancelar busca", key=f"cancelar_busca_{key}"):
+            job.cancel()
+            st.rerun(scope="fragment")
+        return
+    try:
+        documents = job.result()
+    except Exception as e:
+        st.caption(f"Não foi possível buscar o conhecimento de apoio: {str(e)}")
+        return
+    st.write(build_context(documents) or "Nenhum documento relevante encontrado.")
@@ -0,0 +1,234 @@
+"""Telemetria das chamadas aos provedores: duração, tokens, cache, retentativas e erros por etapa
+
+Cada chamada vira um span marcado com a página e a ação (botão) correntes,
+definidas com tagged(). Os spans são exportados:
+- como métricas Prometheus (prometheus_client) na porta METRICS_PORT, se > 0;
+- como JSON compatível com OTLP, um objeto resourceSpans por linha, em
+  TELEMETRY_SPANS_LOG, se definido;
+- em memória (últimos TELEMETRY_RECENT_SPANS) para o resumo p50/p95 da barra lateral.
+"""
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from config import METRICS_PORT, TELEMETRY_RECENT_SPANS, TELEMETRY_SPANS_LOG
+from prompting import count_tokens
+
+SERVICE_NAME = "strategic-ai-agent"
+
+_tags: contextvars.ContextVar = contextvars.ContextVar("telemetry_tags", default={})
+_current: contextvars.ContextVar = contextvars.ContextVar("telemetry_span", default=None)
+
+
+@contextmanager
+def tagged(**tags):
+    """Marca os spans criados dentro do bloco (ex.: page="Insights", action="Gerar Insights")"""
+    token = _tags.set({**_tags.get(), **tags})
+    try:
+        yield
+    finally:
+        _tags.reset(token)
+
+
+def current_tags() -> Dict[str, str]:
+    """Marcas ativas (página e ação) no contexto atual"""
+    return dict(_tags.get())
+
+
+class Span:
+    """Uma etapa medida; atributos usuais: prompt_tokens, output_tokens, cache, retries"""
+
+    def __init__(self, name: str, parent: Optional["Span"]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else ""
+        self.tags = dict(_tags.get())
+        self.attributes: Dict = {}
+        self.start = time.time()
+        self.duration = 0.0
+        self.error = ""
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def add(self, name: str, amount: int = 1):
+        self.attributes[name] = self.attributes.get(name, 0) + amount
+
+
+@contextmanager
+def span(name: str):
+    """Mede o bloco como um span filho do span ativo (se houver)"""
+    current = Span(name, _current.get())
+    token = _current.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except Exception as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        _current.reset(token)
+        get_telemetry().record(current)
+
+
+def note(name: str, amount: int = 1):
+    """Soma um contador no span ativo (ex.: retentativas feitas dentro de uma chamada)"""
+    current = _current.get()
+    if current is not None:
+        current.add(name, amount)
+
+
+def _usage_count(usage, *names) -> Optional[int]:
+    for name in names:
+        value = getattr(usage, name, None)
+        if isinstance(value, (int, float)):
+            return int(value)
+    return None
+
+
+def record_usage(current: Span, usage, prompt: str, output: str = ""):
+    """Soma os tokens do usage_metadata (Gemini) ou usage (OpenAI); sem eles, estima pelo tokenizador local"""
+    prompt_tokens = _usage_count(usage, "prompt_token_count", "prompt_tokens")
+    output_tokens = _usage_count(usage, "candidates_token_count", "completion_tokens")
+    current.add("prompt_tokens", prompt_tokens if prompt_tokens is not None else count_tokens(prompt))
+    if output:
+        current.add("output_tokens", output_tokens if output_tokens is not None else count_tokens(output))
+
+
+def _otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_json(item: Span) -> Dict:
+    """Span no formato JSON do OTLP (ExportTraceServiceRequest com um único span)"""
+    attributes = {**item.tags, **item.attributes}
+    if item.error:
+        attributes["error.type"] = item.error
+    end = item.start + item.duration
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{
+            "scope": {"name": "telemetry"},
+            "spans": [{
+                "traceId": item.trace_id,
+                "spanId": item.span_id,
+                "parentSpanId": item.parent_id,
+                "name": item.name,
+                "kind": 3,  # SPAN_KIND_CLIENT
+                "startTimeUnixNano": str(int(item.start * 1e9)),
+                "endTimeUnixNano": str(int(end * 1e9)),
+                "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()],
+                "status": {"code": 2 if item.error else 1},
+            }],
+        }],
+    }]}
+
+
+class Telemetry:
+    """Agrega os spans do processo e os exporta para Prometheus, log OTLP e resumo em memória"""
+
+    def __init__(self, metrics_port: int = 0, spans_log: str = "", recent: int = 2000):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=recent)
+        self._log = None
+        if spans_log:
+            os.makedirs(os.path.dirname(spans_log) or ".", exist_ok=True)
+            self._log = open(spans_log, "a", encoding="utf-8")
+        self.registry = None
+        try:
+            import prometheus_client as prom
+        except ImportError:
+            return
+        self.registry = prom.CollectorRegistry()
+        labels = ("stage", "page", "action")
+        self._duration = prom.Histogram(
+            "strategit_stage_duration_seconds", "Duração das chamadas por etapa",
+            labels + ("status",), registry=self.registry,
+            buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60),
+        )
+        self._tokens = prom.Counter(
+            "strategit_tokens", "Tokens de prompt e de saída", labels + ("kind",), registry=self.registry
+        )
+        self._cache = prom.Counter(
+            "strategit_cache_lookups", "Consultas ao cache por resultado", labels + ("result",),
+            registry=self.registry,
+        )
+        self._retries = prom.Counter("strategit_retries", "Retentativas", labels, registry=self.registry)
+        self._errors = prom.Counter(
+            "strategit_errors", "Chamadas com erro", labels + ("error",), registry=self.registry
+        )
+        if metrics_port:
+            try:
+                prom.start_http_server(metrics_port, registry=self.registry)
+            except OSError:
+                # Porta já aberta por outro processo (ex.: outro worker do Streamlit)
+                pass
+
+    def record(self, item: Span):
+        with self._lock:
+            self._recent.append(item)
+            if self._log is not None:
+                self._log.write(json.dumps(otlp_json(item), ensure_ascii=False) + "\n")
+                self._log.flush()
+        if self.registry is None:
+            return
+        labels = (item.name, item.tags.get("page", ""), item.tags.get("action", ""))
+        self._duration.labels(*labels, "error" if item.error else "ok").observe(item.duration)
+        for kind in ("prompt", "output"):
+            if item.attributes.get(f"{kind}_tokens"):
+                self._tokens.labels(*labels, kind).inc(item.attributes[f"{kind}_tokens"])
+        if "cache" in item.attributes:
+            self._cache.labels(*labels, item.attributes["cache"]).inc()
+        if item.attributes.get("retries"):
+            self._retries.labels(*labels).inc(item.attributes["retries"])
+        if item.error:
+            self._errors.labels(*labels, item.error).inc()
+
+    def prometheus_text(self) -> str:
+        """Métricas no formato de exposição do Prometheus"""
+        if self.registry is None:
+            return ""
+        from prometheus_client import generate_latest
+        return generate_latest(self.registry).decode("utf-8")
+
+    def summary(self) -> List[Dict]:
+        """p50/p95, erros e tokens por etapa nos spans recentes"""
+        with self._lock:
+            recent = list(self._recent)
+        by_stage: Dict[str, List[Span]] = {}
+        for item in recent:
+            by_stage.setdefault(item.name, []).append(item)
+        rows = []
+        for stage, items in sorted(by_stage.items()):
+            durations = sorted(item.duration for item in items)
+            rows.append({
+                "stage": stage,
+                "count": len(items),
+                "p50_ms": durations[len(durations) // 2] * 1000,
+                "p95_ms": durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1000,
+                "errors": sum(1 for item in items if item.error),
+                "tokens": sum(item.attributes.get("prompt_tokens", 0) + item.attributes.get("output_tokens", 0)
+                              for item in items),
+            })
+        return rows
+
+
+@lru_cache(maxsize=None)
+def get_telemetry() -> Telemetry:
+    """Instância única por processo (o servidor de métricas sobe uma só vez)"""
+    return Telemetry(METRICS_PORT, TELEMETRY_SPANS_LOG, TELEMETRY_RECENT_SPANS)
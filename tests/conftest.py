@@ -0,0 +1,11 @@
+"""Configuração dos testes: módulos do projeto no path e caches num diretório temporário"""
+import os
+import sys
+import tempfile
+
+# config lê o ambiente uma única vez, na primeira importação
+os.environ.setdefault("STRATEGIT_CACHE_DIR", tempfile.mkdtemp(prefix="strategit_tests_"))
+os.environ.setdefault("METRICS_PORT", "0")
+os.environ.setdefault("RATE_LIMIT_DB", "")
+os.environ.setdefault("TELEMETRY_SPANS_LOG", "")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,113 @@
+"""Ingestão em lote: _id por conteúdo, deduplicação e insertMany idempotente"""
+import json
+
+import pytest
+
+import generation
+from astra import AstraDBClient
+from config import RAG_TEXT_FIELDS
+from ingest import _insert_batches, chunk_documents, ingest
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+        self.text = json.dumps(data)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class FakeCollection:
+    """find por _id e insert_many de um cliente da Data API, em memória"""
+
+    def __init__(self, existing=()):
+        self.ids = set(existing)
+        self.inserted = []
+
+    def find(self, collection, filter=None, projection=None, page_state=None):
+        wanted = filter["_id"]["$in"]
+        return [{"_id": doc_id} for doc_id in wanted if doc_id in self.ids], None
+
+    def insert_many(self, collection, documents):
+        new = [doc for doc in documents if doc["_id"] not in self.ids]
+        self.ids.update(doc["_id"] for doc in new)
+        self.inserted.extend(new)
+        return len(new), len(documents) - len(new)
+
+
+def _document(text, source="a.txt"):
+    return {"text": text, "metadata": {"source": source}}
+
+
+def test_chunk_id_is_the_content_hash():
+    first = list(chunk_documents([_document("mesmo texto", "a.txt")], 50, 0))
+    second = list(chunk_documents([_document("mesmo texto", "b.txt")], 50, 0))
+    other = list(chunk_documents([_document("outro texto")], 50, 0))
+    assert first[0]["_id"] == second[0]["_id"]
+    assert first[0]["_id"] != other[0]["_id"]
+    assert first[0][RAG_TEXT_FIELDS[0]] == "mesmo texto"
+
+
+def test_ingest_embeds_only_new_unique_chunks(tmp_path, monkeypatch):
+    (tmp_path / "a.txt").write_text("Trecho repetido.", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("Trecho repetido.", encoding="utf-8")
+    (tmp_path / "c.txt").write_text("Trecho já gravado.", encoding="utf-8")
+    (tmp_path / "d.txt").write_text("Trecho novo.", encoding="utf-8")
+    stored = next(chunk_documents([_document("Trecho já gravado.")], 50, 0))["_id"]
+    embedded = []
+
+    def fake_embed(texts):
+        embedded.extend(texts)
+        return [[1.0, 0.0] for _ in texts]
+
+    monkeypatch.setattr(generation, "embed_texts", fake_embed)
+    client = FakeCollection(existing=[stored])
+    stats = ingest([str(tmp_path)], "base", client, max_tokens=50, overlap=0, workers=2, window=10)
+
+    assert sorted(embedded) == ["Trecho novo.", "Trecho repetido."]
+    assert stats["existing"] == 1
+    assert stats["inserted"] == 2
+    assert sorted(doc[RAG_TEXT_FIELDS[0]] for doc in client.inserted) == ["Trecho novo.", "Trecho repetido."]
+
+    # Rodar de novo não embute nem grava nada
+    embedded.clear()
+    stats = ingest([str(tmp_path)], "base", client, max_tokens=50, overlap=0, workers=2, window=10)
+    assert embedded == []
+    assert stats["inserted"] == 0
+
+
+def test_insert_batches_respect_count_and_byte_limits():
+    documents = [{"_id": str(i), "content": "x" * 100} for i in range(10)]
+    batches = list(_insert_batches(documents, max_documents=4, max_bytes=300))
+    assert [doc for batch in batches for doc in batch] == documents
+    sizes = [sum(len(json.dumps(doc).encode("utf-8")) for doc in batch) for batch in batches]
+    assert all(len(batch) <= 4 for batch in batches)
+    assert all(size <= 300 for size in sizes)
+    assert len(batches) == 5
+
+
+def _client_answering(data):
+    client = AstraDBClient(api_base="http://astra.invalid", token="t")
+    client._post = lambda url, payload: FakeResponse(data)
+    return client
+
+
+def test_insert_many_counts_existing_documents_as_duplicates():
+    client = _client_answering({
+        "status": {"insertedIds": ["b"]},
+        "errors": [{"errorCode": "DOCUMENT_ALREADY_EXISTS", "message": "a"}],
+    })
+    assert client.insert_many("base", [{"_id": "a"}, {"_id": "b"}]) == (1, 1)
+
+
+def test_insert_many_raises_other_errors():
+    client = _client_answering({
+        "status": {"insertedIds": []},
+        "errors": [{"errorCode": "DOCUMENT_ALREADY_EXISTS"}, {"errorCode": "SHRED_DOC_LIMIT_VIOLATION"}],
+    })
+    with pytest.raises(RuntimeError, match="SHRED_DOC_LIMIT_VIOLATION"):
+        client.insert_many("base", [{"_id": "a"}, {"_id": "b"}])
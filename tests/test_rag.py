@@ -0,0 +1,73 @@
+"""Reordenação dos candidatos: MMR dentro do orçamento de tokens e fusão por RRF"""
+from rag import mmr_rerank, reciprocal_rank_fusion, reranked_search
+
+QUERY = [1.0, 0.0, 0.0]
+
+
+def _doc(doc_id, vector, text="trecho curto"):
+    return {"_id": doc_id, "content": text, "$vector": vector}
+
+
+def _candidates():
+    # "a" e "a2" são quase idênticos; "b" é menos relevante, mas traz outra direção
+    return [
+        _doc("a", [0.9, 0.436, 0.0]),
+        _doc("a2", [0.89, 0.456, 0.0]),
+        _doc("b", [0.85, -0.527, 0.0]),
+    ]
+
+
+def _ids(docs):
+    return [doc["_id"] for doc in docs]
+
+
+def test_mmr_with_full_relevance_weight_keeps_similarity_order():
+    docs = mmr_rerank(QUERY, _candidates(), top_k=3, relevance_weight=1.0, token_budget=1000)
+    assert _ids(docs) == ["a", "a2", "b"]
+
+
+def test_mmr_skips_near_duplicates():
+    docs = mmr_rerank(QUERY, _candidates(), top_k=2, relevance_weight=0.5, token_budget=1000)
+    assert _ids(docs) == ["a", "b"]
+    assert all("$vector" not in doc for doc in docs)
+
+
+def test_mmr_token_budget_always_keeps_the_first_pick():
+    long_text = "palavra " * 200
+    docs = [_doc("longo", [1.0, 0.0, 0.0], long_text), _doc("curto", [0.0, 1.0, 0.0])]
+    assert _ids(mmr_rerank(QUERY, docs, top_k=2, relevance_weight=1.0, token_budget=10)) == ["longo"]
+    docs = [_doc("curto", [1.0, 0.0, 0.0]), _doc("longo", [0.9, 0.1, 0.0], long_text), _doc("outro", [0.0, 1.0, 0.0])]
+    assert _ids(mmr_rerank(QUERY, docs, top_k=3, relevance_weight=1.0, token_budget=10)) == ["curto", "outro"]
+
+
+def test_mmr_without_vectors_falls_back_to_backend_order():
+    docs = [{"_id": "x", "content": "x"}, {"_id": "y", "content": "y"}, {"_id": "z", "content": "z"}]
+    assert _ids(mmr_rerank(QUERY, docs, top_k=2)) == ["x", "y"]
+    # Dimensão diferente da consulta: também mantém a ordem e remove os vetores
+    docs = [_doc("p", [1.0, 0.0]), _doc("q", [0.0, 1.0])]
+    assert mmr_rerank(QUERY, docs, top_k=1) == [{"_id": "p", "content": "trecho curto"}]
+
+
+def test_reranked_search_overfetches_with_vectors():
+    calls = []
+
+    class Backend:
+        def vector_search(self, collection, vector, limit=3, projection=None, include_vector=False):
+            calls.append((limit, include_vector))
+            return _candidates()
+
+    docs = reranked_search(Backend(), "base", QUERY, top_k=2, fetch_k=20)
+    assert calls == [(20, True)]
+    assert len(docs) == 2
+
+
+def test_reciprocal_rank_fusion_sums_reciprocal_ranks():
+    a, b, c = {"_id": "a"}, {"_id": "b"}, {"_id": "c"}
+    fused = reciprocal_rank_fusion([[a, b, c], [b, c, a]])
+    assert _ids(fused) == ["b", "a", "c"]
+    assert _ids(reciprocal_rank_fusion([[a, b, c], [b, c, a]], limit=1)) == ["b"]
+
+
+def test_reciprocal_rank_fusion_dedups_documents_without_id_by_text():
+    fused = reciprocal_rank_fusion([[{"content": "Mesmo  Texto"}], [{"content": "mesmo texto"}, {"content": "outro"}]])
+    assert [doc["content"] for doc in fused] == ["Mesmo  Texto", "outro"]
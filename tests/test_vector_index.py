@@ -0,0 +1,116 @@
+"""Índice local: quantização int8/binária, varredura com reavaliação e snapshots gravados em disco"""
+import numpy as np
+import pytest
+
+from embedding_eval import recall_at_k
+from vector_index import LocalVectorIndex, quantize, search_rows
+
+
+def _normalize(matrix):
+    return (matrix / np.linalg.norm(matrix, axis=1, keepdims=True)).astype(np.float32)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(7)
+
+
+@pytest.fixture
+def clustered(rng):
+    """Vetores agrupados em torno de centros, como embeddings de uma base temática, e consultas próximas"""
+    centers = _normalize(rng.normal(size=(40, 128)))
+    docs = _normalize(centers[rng.integers(0, 40, 2000)] + 0.5 * _normalize(rng.normal(size=(2000, 128))))
+    queries = _normalize(centers[rng.integers(0, 40, 50)] + 0.5 * _normalize(rng.normal(size=(50, 128))))
+    return docs, queries
+
+
+def _recall(docs, queries, k, mode, factor):
+    codes, scale = quantize(docs, mode)
+    truth = [search_rows(docs, query, k)[0] for query in queries]
+    found = [search_rows(docs, query, k, mode, codes, scale, factor)[0] for query in queries]
+    return recall_at_k(found, truth, k)
+
+
+def test_int8_codes_reconstruct_the_vectors(rng):
+    vectors = _normalize(rng.normal(size=(100, 64)))
+    codes, scale = quantize(vectors, "int8")
+    assert codes.dtype == np.int8 and scale.shape == (64,)
+    assert np.all(np.abs(codes * scale - vectors) <= scale / 2 + 1e-6)
+
+
+def test_binary_codes_pack_the_signs(rng):
+    vectors = _normalize(rng.normal(size=(10, 20)))
+    codes, _ = quantize(vectors, "binary")
+    assert codes.shape == (10, 3)
+    assert np.array_equal(np.unpackbits(codes, axis=1)[:, :20], (vectors > 0).astype(np.uint8))
+
+
+def test_unknown_quantization_is_rejected(rng):
+    with pytest.raises(ValueError):
+        quantize(_normalize(rng.normal(size=(4, 8))), "int4")
+
+
+def test_exact_search_returns_the_best_cosines_in_order(rng):
+    docs = _normalize(rng.normal(size=(500, 32)))
+    query = docs[10]
+    rows, scores = search_rows(docs, query, 5)
+    assert rows[0] == 10
+    assert np.array_equal(rows, np.argsort(-(docs @ query))[:5])
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_quantized_search_returns_exact_cosines(clustered):
+    docs, queries = clustered
+    for mode in ("int8", "binary"):
+        codes, scale = quantize(docs, mode)
+        rows, scores = search_rows(docs, queries[0], 5, mode, codes, scale, 4)
+        np.testing.assert_allclose(scores, docs[rows] @ queries[0], rtol=1e-5)
+
+
+def test_int8_recall_matches_float32(rng, clustered):
+    docs = _normalize(rng.normal(size=(2000, 128)))
+    queries = _normalize(rng.normal(size=(50, 128)))
+    assert _recall(docs, queries, 10, "int8", 4) == 1.0
+    assert _recall(*clustered, 5, "int8", 4) == 1.0
+
+
+def test_binary_recall_needs_rescoring(clustered):
+    raw = _recall(*clustered, 5, "binary", 1)
+    rescored = _recall(*clustered, 5, "binary", 10)
+    assert rescored >= 0.95
+    assert rescored > raw
+
+
+@pytest.mark.parametrize("quantization", ["none", "int8", "binary"])
+def test_local_index_round_trip(tmp_path, clustered, quantization):
+    docs, queries = clustered
+    documents = [{"_id": f"d{i}", "content": f"trecho {i}", "$vector": vector.tolist()}
+                 for i, vector in enumerate(docs[:300])]
+    index = LocalVectorIndex(str(tmp_path))
+    index.write("base", documents, quantization)
+
+    results = index.vector_search("base", queries[0].tolist(), limit=3, include_vector=True)
+    expected = np.argsort(-(docs[:300] @ queries[0]))[:3]
+    assert [doc["_id"] for doc in results] == [f"d{i}" for i in expected]
+    assert results[0]["content"] == f"trecho {expected[0]}"
+    assert 0.0 <= results[0]["$similarity"] <= 1.0
+    np.testing.assert_allclose(results[0]["$vector"], docs[expected[0]], rtol=1e-5)
+
+    assert index.ids("base") == [f"d{i}" for i in range(300)]
+    stored = index.documents("base")
+    assert [doc["_id"] for doc in stored] == index.ids("base")
+    np.testing.assert_allclose(stored[5]["$vector"], docs[5], rtol=1e-5)
+
+
+def test_rewrite_switches_quantization_and_drops_removed_documents(tmp_path, clustered):
+    docs, queries = clustered
+    documents = [{"_id": f"d{i}", "content": str(i), "$vector": vector.tolist()} for i, vector in enumerate(docs[:50])]
+    index = LocalVectorIndex(str(tmp_path))
+    index.write("base", documents, "binary")
+    reader = LocalVectorIndex(str(tmp_path))
+    assert reader.vector_search("base", docs[7].tolist(), limit=1)[0]["_id"] == "d7"
+
+    index.write("base", documents[10:], "int8")
+    assert reader.ids("base") == [f"d{i}" for i in range(10, 50)]
+    assert reader.vector_search("base", docs[7].tolist(), limit=1)[0]["_id"] != "d7"
+    assert reader.vector_search("base", docs[20].tolist(), limit=1)[0]["_id"] == "d20"
@@ -0,0 +1,328 @@
+"""Índice vetorial local que espelha a coleção do Astra DB.
+
+Os vetores ficam normalizados em uma matriz float32 salva em .npy e aberta com
+mmap, de modo que vários processos compartilham as mesmas páginas do sistema
+operacional sem carregar cópias próprias. Os documentos ficam em um JSONL ao
+lado, com um vetor de offsets para ler só os resultados do top-k.
+
+Cada sincronização grava um snapshot completo num diretório versionado
+(<coleção>.versions/<versão>/) e depois troca só o ponteiro <coleção>.meta.json
+com os.replace, então um leitor nunca mistura arquivos de snapshots diferentes.
+O snapshot carregado mantém o JSONL aberto, e as versões antigas são apagadas
+sem afetar quem ainda as lê.
+
+Com LOCAL_INDEX_QUANTIZATION = "int8" (4x menor) ou "binary" (32x menor), a
+varredura usa uma matriz de códigos compactos e só os melhores candidatos são
+reavaliados com o vetor float32, lido do mmap apenas nessas linhas.
+
+Sincronização: python vector_index.py sync [--full] [--collection NOME] [--quantization int8]
+"""
+import argparse
+import fcntl
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import (
+    COLLECTION_NAME,
+    LOCAL_INDEX_DIR,
+    LOCAL_INDEX_QUANTIZATION,
+    LOCAL_INDEX_RESCORE_FACTOR,
+    VECTOR_BACKEND,
+)
+from rag import apply_projection
+
+# Documentos por requisição ao buscar vetores novos com filtro $in
+SYNC_BATCH_SIZE = 100
+QUANTIZATIONS = ("none", "int8", "binary")
+# Linhas por bloco na varredura dos códigos int8: limita a cópia temporária em float32
+SCAN_BLOCK_ROWS = 65536
+# Versões anteriores mantidas no disco além da atual (processos que ainda não reabriram o índice)
+KEEP_PREVIOUS_VERSIONS = 1
+
+
+def quantize(vectors: np.ndarray, mode: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Códigos compactos de vetores normalizados e a escala por dimensão (só no int8)"""
+    if mode == "int8":
+        scale = np.abs(vectors).max(axis=0) / 127 if len(vectors) else np.ones(vectors.shape[1])
+        scale = np.where(scale == 0, 1.0, scale).astype(np.float32)
+        return np.round(vectors / scale).astype(np.int8), scale
+    if mode == "binary":
+        return np.packbits(vectors > 0, axis=1), np.ones(0, dtype=np.float32)
+    raise ValueError(f"Quantização desconhecida: {mode} (use {', '.join(QUANTIZATIONS)})")
+
+
+def quantized_scores(codes: np.ndarray, scale: np.ndarray, query: np.ndarray, mode: str) -> np.ndarray:
+    """Pontuação aproximada de cada código para a consulta (maior = mais parecido)"""
+    scores = np.empty(codes.shape[0], dtype=np.float32)
+    if mode == "binary":
+        # Menos bits diferentes (distância de Hamming) = mais parecido
+        bits = np.packbits(query > 0)
+        scores[:] = -np.bitwise_count(codes ^ bits).sum(axis=1, dtype=np.int32)
+        return scores
+    weighted = query * scale
+    for start in range(0, codes.shape[0], SCAN_BLOCK_ROWS):
+        block = codes[start:start + SCAN_BLOCK_ROWS]
+        scores[start:start + block.shape[0]] = block.astype(np.float32) @ weighted
+    return scores
+
+
+def _top(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, scores.shape[0])
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def search_rows(vectors: np.ndarray, query: np.ndarray, limit: int, quantization: str = "none",
+                codes: Optional[np.ndarray] = None, scale: Optional[np.ndarray] = None,
+                rescore_factor: int = LOCAL_INDEX_RESCORE_FACTOR) -> Tuple[np.ndarray, np.ndarray]:
+    """Linhas do top-k e seus cossenos exatos; quantizado, varre os códigos e reavalia
+    limit * rescore_factor candidatos com o vetor completo"""
+    if quantization == "none" or codes is None:
+        scores = vectors @ query
+        top = _top(scores, limit)
+        return top, scores[top]
+    candidates = np.sort(_top(quantized_scores(codes, scale, query, quantization), limit * max(1, rescore_factor)))
+    exact = np.asarray(vectors[candidates], dtype=np.float32) @ query
+    order = _top(exact, limit)
+    return candidates[order], exact[order]
+
+
+class LocalVectorIndex:
+    """Busca top-k por produto escalar em vetores normalizados (cosseno), com a mesma interface do AstraDBClient"""
+
+    def __init__(self, directory: str = LOCAL_INDEX_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._loaded: Dict[str, Dict] = {}
+
+    def _path(self, collection: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{collection}.{suffix}")
+
+    def _version_path(self, collection: str, version: str, name: str = "") -> str:
+        return os.path.join(self._path(collection, "versions"), version, name)
+
+    def _open(self, collection: str) -> Optional[Dict]:
+        """Abre (ou reabre, após uma sincronização) o snapshot apontado pelo meta.json"""
+        meta_path = self._path(collection, "meta.json")
+        try:
+            stat = os.stat(meta_path)
+        except FileNotFoundError:
+            return None
+        # os.replace troca o inode do ponteiro a cada sincronização
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        with self._lock:
+            current = self._loaded.get(collection)
+            if current is None or current["signature"] != signature:
+                with open(meta_path, encoding="utf-8") as f:
+                    meta = json.load(f)
+                version = meta["version"]
+                docs = open(self._version_path(collection, version, "docs.jsonl"), "rb")
+                current = {
+                    "signature": signature,
+                    "meta": meta,
+                    "vectors": np.load(self._version_path(collection, version, "vectors.npy"), mmap_mode="r"),
+                    "offsets": np.load(self._version_path(collection, version, "offsets.npy"), mmap_mode="r"),
+                    # O arquivo aberto continua legível mesmo depois que a versão é apagada
+                    "docs": docs,
+                    "docs_size": os.fstat(docs.fileno()).st_size,
+                    "quantization": meta.get("quantization", "none"),
+                    "codes": None,
+                    "scale": np.asarray(meta.get("scale", []), dtype=np.float32),
+                }
+                if current["quantization"] != "none":
+                    current["codes"] = np.load(self._version_path(collection, version, "codes.npy"), mmap_mode="r")
+                self._loaded[collection] = current
+        return current
+
+    @staticmethod
+    def _read_docs(index: Dict, rows: List[int]) -> List[Dict]:
+        """Lê as linhas pedidas com pread, sem seek compartilhado entre threads"""
+        offsets = index["offsets"]
+        docs = []
+        for row in rows:
+            start = int(offsets[row])
+            end = int(offsets[row + 1]) if row + 1 < len(offsets) else index["docs_size"]
+            docs.append(json.loads(os.pread(index["docs"].fileno(), end - start, start)))
+        return docs
+
+    def vector_search(self, collection: str, vector: List[float], limit: int = 3,
+                      projection: Optional[Dict] = None, include_vector: bool = False) -> List[Dict]:
+        """Realiza busca por similaridade vetorial no índice local (include_vector devolve o $vector normalizado)"""
+        index = self._open(collection)
+        if index is None or not vector:
+            return []
+        matrix = index["vectors"]
+        if matrix.shape[0] == 0 or matrix.shape[1] != len(vector):
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        top, scores = search_rows(matrix, query, limit, index["quantization"], index["codes"], index["scale"])
+        docs = self._read_docs(index, top.tolist())
+        for doc, score in zip(docs, scores):
+            # Mesma escala do $similarity do Astra para a métrica de cosseno
+            doc["$similarity"] = float((1 + score) / 2)
+        results = [apply_projection(doc, projection) for doc in docs]
+        if include_vector:
+            for doc, row in zip(results, top):
+                doc["$vector"] = matrix[row]
+        return results
+
+    def ids(self, collection: str) -> List[str]:
+        index = self._open(collection)
+        return list(index["meta"]["ids"]) if index else []
+
+    def write(self, collection: str, documents: List[Dict], quantization: str = LOCAL_INDEX_QUANTIZATION):
+        """Grava um novo snapshot da coleção e troca o ponteiro de forma atômica"""
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Quantização desconhecida: {quantization} (use {', '.join(QUANTIZATIONS)})")
+        docs = [doc for doc in documents if doc.get("$vector")]
+        if docs:
+            vectors = np.asarray([doc["$vector"] for doc in docs], dtype=np.float32)
+        else:
+            vectors = np.zeros((0, 0), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1.0, norms)
+
+        os.makedirs(self.directory, exist_ok=True)
+        # Escritores de processos diferentes são serializados; leitores nunca esperam
+        with open(self._path(collection, "lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            version = self._write_version(collection, docs, vectors, quantization)
+            self._remove_old_versions(collection, version)
+
+    def _write_version(self, collection: str, docs: List[Dict], vectors: np.ndarray, quantization: str) -> str:
+        """Grava os arquivos numa versão nova (ordenável pela criação) e aponta o meta.json para ela"""
+        version = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+        os.makedirs(self._version_path(collection, version))
+        offsets = np.zeros(len(docs), dtype=np.int64)
+        with open(self._version_path(collection, version, "docs.jsonl"), "wb") as f:
+            for i, doc in enumerate(docs):
+                offsets[i] = f.tell()
+                payload = {key: value for key, value in doc.items() if key != "$vector"}
+                f.write(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+
+        arrays = [("vectors.npy", vectors), ("offsets.npy", offsets)]
+        if not docs:
+            quantization = "none"
+        if quantization != "none":
+            codes, scale = quantize(vectors, quantization)
+            arrays.append(("codes.npy", codes))
+        for name, array in arrays:
+            with open(self._version_path(collection, version, name), "wb") as f:
+                np.save(f, array)
+        meta = {
+            "collection": collection,
+            "version": version,
+            "ids": [doc["_id"] for doc in docs],
+            "dimension": int(vectors.shape[1]) if len(docs) else 0,
+            "quantization": quantization,
+            "scale": scale.tolist() if quantization == "int8" else [],
+            "synced_at": time.time(),
+        }
+        # Só agora o snapshot fica visível: um único os.replace do ponteiro
+        tmp_meta = self._path(collection, f"meta.json.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, self._path(collection, "meta.json"))
+        return version
+
+    def _remove_old_versions(self, collection: str, current: str):
+        """Apaga as versões anteriores à atual, exceto as KEEP_PREVIOUS_VERSIONS mais recentes"""
+        older = sorted(v for v in os.listdir(self._path(collection, "versions")) if v != current)
+        for version in older[:max(0, len(older) - KEEP_PREVIOUS_VERSIONS)]:
+            shutil.rmtree(self._version_path(collection, version), ignore_errors=True)
+
+    def documents(self, collection: str) -> List[Dict]:
+        """Documentos atuais do índice, com os vetores, para reescrita incremental"""
+        index = self._open(collection)
+        if index is None:
+            return []
+        rows = list(range(len(index["meta"]["ids"])))
+        docs = self._read_docs(index, rows)
+        for doc, row in zip(docs, rows):
+            doc["$vector"] = index["vectors"][row].tolist()
+        return docs
+
+
+def _fetch_all(astra_client, collection: str, filter: Optional[Dict] = None,
+               projection: Optional[Dict] = None) -> List[Dict]:
+    """Percorre todas as páginas de um find na Data API"""
+    documents, page_state = [], None
+    while True:
+        page, page_state = astra_client.find(collection, filter=filter, projection=projection,
+                                             page_state=page_state)
+        documents.extend(page)
+        if not page_state:
+            return documents
+
+
+def sync_collection(astra_client, index: LocalVectorIndex, collection: str, full: bool = False,
+                    quantization: str = LOCAL_INDEX_QUANTIZATION) -> Dict:
+    """Atualiza o índice local a partir do Astra.
+
+    No modo incremental, lista apenas os _ids remotos e baixa vetores só dos
+    documentos novos; documentos removidos no Astra saem do índice.
+    """
+    started = time.time()
+    if full or not index.ids(collection):
+        documents = _fetch_all(astra_client, collection, projection={"*": 1})
+        added, removed = len(documents), 0
+    else:
+        remote_ids = {doc["_id"] for doc in _fetch_all(astra_client, collection, projection={"_id": 1})}
+        documents = [doc for doc in index.documents(collection) if doc["_id"] in remote_ids]
+        removed = len(index.ids(collection)) - len(documents)
+        new_ids = sorted(remote_ids - {doc["_id"] for doc in documents})
+        for start in range(0, len(new_ids), SYNC_BATCH_SIZE):
+            batch = new_ids[start:start + SYNC_BATCH_SIZE]
+            documents.extend(_fetch_all(astra_client, collection, filter={"_id": {"$in": batch}},
+                                        projection={"*": 1}))
+        added = len(new_ids)
+    index.write(collection, documents, quantization)
+    return {
+        "documents": len(index.ids(collection)),
+        "added": added,
+        "removed": removed,
+        "seconds": round(time.time() - started, 2),
+    }
+
+
+@lru_cache(maxsize=None)
+def get_local_index() -> LocalVectorIndex:
+    """Índice local único por processo"""
+    return LocalVectorIndex()
+
+
+def get_vector_backend():
+    """Backend de busca vetorial configurado em VECTOR_BACKEND (mesma interface vector_search)"""
+    if VECTOR_BACKEND == "local":
+        return get_local_index()
+    from astra import get_astra_client
+    return get_astra_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Índice vetorial local espelhando o Astra DB")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    sync = subparsers.add_parser("sync", help="Sincroniza o índice local com a coleção do Astra")
+    sync.add_argument("--collection", default=COLLECTION_NAME)
+    sync.add_argument("--full", action="store_true", help="Baixa a coleção inteira novamente")
+    sync.add_argument("--quantization", choices=QUANTIZATIONS, default=LOCAL_INDEX_QUANTIZATION,
+                      help="Códigos compactos usados na varredura")
+    args = parser.parse_args()
+
+    from astra import get_astra_client
+    result = sync_collection(get_astra_client(), get_local_index(), args.collection, full=args.full,
+                             quantization=args.quantization)
+    print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Página: Análise de Dados"""
+import streamlit as st
+from dataset_profiling import dataset_profile
+from prompts import interview_prompt, quantitative_prompt, secondary_research_prompt
+from semantic_cache import SemanticPrompt
+from shared import get_artifact, save_artifact, show_followup, stream_with_followup
+from telemetry import tagged
+
+st.header("📊 Análise Combinada de Dados")
+
+tension = get_artifact('strategic_tension')
+if tension is None:
+    st.info("ℹ️ Defina primeiro o problema na página 'Definição do Problema'")
+else:
+    st.markdown("**Tensão Estratégica Atual:**")
+    st.markdown(tension)
+    
+    analysis_type = st.radio(
+        "Tipo de Análise:",
+        ["📚 Pesquisa Secundária", "📊 Dados Quantitativos", "🗣️ Entrevista Qualitativa"],
+        horizontal=True
+    )
+    
+    if analysis_type == "📚 Pesquisa Secundária":
+        research_topics = st.text_area(
+            "Tópicos para Pesquisa Secundária*",
+            placeholder="Ex: tendências de mercado, benchmarks do setor, relatórios relevantes...",
+            height=100
+        )
+        
+        if st.button("🔎 Realizar Pesquisa Secundária"):
+            with st.spinner('Analisando dados e contextos externos...'), tagged(action="Realizar Pesquisa Secundária"):
+                prompt = secondary_research_prompt(tension, research_topics)
+                response_text, question = stream_with_followup(
+                    prompt, semantic=SemanticPrompt(secondary_research_prompt, (tension, research_topics), free=(1,))
+                )
+                save_artifact('secondary_research', response_text)
+                show_followup(question)
+    
+    elif analysis_type == "📊 Dados Quantitativos":
+        uploaded = st.file_uploader("Carregar Conjunto de Dados (CSV/Excel)", type=["csv", "xlsx"])
+        dataset_summary = ""
+        if uploaded is not None:
+            # O perfil é calculado uma vez por envio; o Parquet em cache evita reler o mesmo arquivo
+            profiles = st.session_state.setdefault('dataset_profiles', {})
+            if uploaded.file_id not in profiles:
+                try:
+                    with st.spinner('Lendo e perfilando o conjunto de dados...'):
+                        profiles[uploaded.file_id] = dataset_profile(uploaded.name, uploaded.getvalue())
+                except Exception as e:
+                    st.error(f"Erro ao ler o conjunto de dados: {str(e)}")
+            dataset_summary = profiles.get(uploaded.file_id, "")
+            if dataset_summary:
+                with st.expander("Perfil do conjunto de dados"):
+                    st.text(dataset_summary)
+        data_questions = st.text_area(
+            "Perguntas para Análise Quantitativa*",
+            placeholder="Que hipóteses você quer testar? Que relações investigar?",
+            height=100
+        )
+        
+        if st.button("📈 Analisar Dados Quantitativos"):
+            with st.spinner('Processando dados e identificando padrões...'), tagged(action="Analisar Dados Quantitativos"):
+                prompt = quantitative_prompt(tension, data_questions, dataset_summary)
+                response_text, question = stream_with_followup(prompt, semantic=SemanticPrompt(
+                    quantitative_prompt, (tension, data_questions, dataset_summary), free=(1,)
+                ))
+                save_artifact('quantitative_analysis', response_text)
+                show_followup(question)
+    
+    else:  # Entrevista Qualitativa
+        interview_goals = st.text_area(
+            "Objetivos da Pesquisa Qualitativa*",
+            placeholder="O que você quer entender sobre comportamentos, motivações, barreiras?",
+            height=100
+        )
+        participant_profile = st.text_input(
+            "Perfil dos Participantes*",
+            placeholder="Ex: consumidores entre 25-40 anos, usuários frequentes do produto..."
+        )
+        
+        if st.button("🗣️ Gerar Roteiro de Entrevista"):
+            with st.spinner('Criando guia de pesquisa qualitativa...'), tagged(action="Gerar Roteiro de Entrevista"):
+                prompt = interview_prompt(tension, interview_goals, participant_profile)
+                response_text, question = stream_with_followup(prompt, semantic=SemanticPrompt(
+                    interview_prompt, (tension, interview_goals, participant_profile), free=(1, 2)
+                ))
+                save_artifact('qualitative_guide', response_text)
+                show_followup(question)
@@ -0,0 +1,56 @@
+"""Página: Análises Estratégicas"""
+import streamlit as st
+from prompts import opportunities_prompt, pestle_prompt, swot_prompt
+from semantic_cache import SemanticPrompt
+from shared import show_followup, stream_concurrently, stream_with_followup
+from telemetry import tagged
+
+st.header("📊 Análises Estratégicas")
+
+analysis_type = st.radio(
+    "Tipo de Análise",
+    ["SWOT", "PESTLE", "Oportunidades/Ameaças", "Todas"],
+    horizontal=True
+)
+
+if analysis_type == "SWOT":
+    company_overview = st.text_area("Visão Geral da Empresa", height=100)
+    
+    if st.button("📋 Gerar Análise SWOT"):
+        with st.spinner('Desenvolvendo matriz SWOT...'), tagged(action="Gerar Análise SWOT"):
+            prompt = swot_prompt(company_overview)
+            response_text, question = stream_with_followup(prompt, semantic=SemanticPrompt(swot_prompt, (company_overview,)))
+            show_followup(question)
+
+elif analysis_type == "PESTLE":
+    industry = st.text_input("Setor/Indústria")
+    
+    if st.button("🌍 Gerar Análise PESTLE"):
+        with st.spinner('Analisando fatores macro...'), tagged(action="Gerar Análise PESTLE"):
+            prompt = pestle_prompt(industry)
+            response_text, question = stream_with_followup(prompt, semantic=SemanticPrompt(pestle_prompt, (industry,)))
+            show_followup(question)
+
+elif analysis_type == "Oportunidades/Ameaças":
+    market_trends = st.text_area("Tendências de Mercado", height=100)
+    
+    if st.button("🔮 Identificar Oportunidades/Ameaças"):
+        with st.spinner('Analisando cenário futuro...'), tagged(action="Identificar Oportunidades/Ameaças"):
+            prompt = opportunities_prompt(market_trends)
+            response_text, question = stream_with_followup(prompt, semantic=SemanticPrompt(opportunities_prompt, (market_trends,)))
+            show_followup(question)
+
+else:
+    company_overview = st.text_area("Visão Geral da Empresa", height=100)
+    industry = st.text_input("Setor/Indústria")
+    market_trends = st.text_area("Tendências de Mercado", height=100)
+    
+    if st.button("⚡ Gerar Todas as Análises"):
+        # As três gerações correm juntas no laço assíncrono; cada seção aparece ao terminar
+        with st.spinner('Gerando as três análises em paralelo...'), tagged(action="Gerar Todas as Análises"):
+            stream_concurrently([
+                ("Análise SWOT", swot_prompt(company_overview), SemanticPrompt(swot_prompt, (company_overview,))),
+                ("Análise PESTLE", pestle_prompt(industry), SemanticPrompt(pestle_prompt, (industry,))),
+                ("Oportunidades/Ameaças", opportunities_prompt(market_trends),
+                 SemanticPrompt(opportunities_prompt, (market_trends,))),
+            ])
@@ -0,0 +1,16 @@
+"""Página: Comunicação e Canais"""
+import streamlit as st
+from prompts import BUDGET_RANGES, CAMPAIGN_GOALS, communication_plan_prompt
+from shared import show_followup, stream_with_followup
+from telemetry import tagged
+
+st.header("📡 Planejamento de Comunicação")
+
+campaign_goal = st.selectbox("Objetivo Principal", CAMPAIGN_GOALS)
+budget_range = st.selectbox("Faixa de Orçamento", BUDGET_RANGES)
+
+if st.button("📅 Gerar Plano de Comunicação"):
+    with st.spinner('Criando estratégia multicanal...'), tagged(action="Gerar Plano de Comunicação"):
+        prompt = communication_plan_prompt(campaign_goal, budget_range)
+        response_text, question = stream_with_followup(prompt)
+        show_followup(question)
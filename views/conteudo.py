@@ -0,0 +1,64 @@
+"""Página: Estratégia de Conteúdo"""
+import streamlit as st
+from prompts import content_strategy_prompt
+from semantic_cache import SemanticPrompt
+from shared import save_artifact, show_followup, stream_with_followup
+from telemetry import tagged
+
+st.header("📝 Estratégia de Conteúdo")
+
+st.markdown("""
+<style>
+    .content-pillar {
+        background-color: #f0f8ff;
+        border-radius: 8px;
+        padding: 1rem;
+        margin-bottom: 1rem;
+        border-left: 4px solid #4682b4;
+    }
+    .content-type-badge {
+        background-color: #e6e6fa;
+        color: #333;
+        padding: 4px 8px;
+        border-radius: 12px;
+        font-size: 0.8em;
+        margin-right: 8px;
+        display: inline-block;
+        margin-bottom: 4px;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+col1, col2 = st.columns(2)
+with col1:
+    content_goal = st.selectbox(
+        "Objetivo Principal do Conteúdo*",
+        ["Educar", "Engajar", "Converter", "Fidelizar", "Humanizar a marca"]
+    )
+    content_audience = st.text_input(
+        "Público-Alvo Principal*",
+        placeholder="Ex: Mulheres 25-35, classe AB, interessadas em sustentabilidade..."
+    )
+with col2:
+    content_channels = st.multiselect(
+        "Canais Prioritários*",
+        ["Website/Blog", "Redes Sociais", "E-mail", "Vídeo", "Podcast", "Eventos", "Publicações"],
+        default=["Website/Blog", "Redes Sociais"]
+    )
+    content_budget = st.select_slider(
+        "Orçamento para Conteúdo",
+        options=["Baixo", "Médio", "Alto"]
+    )
+
+if st.button("📊 Gerar Estratégia de Conteúdo"):
+    with st.spinner('Criando plano de conteúdo personalizado...'), tagged(action="Gerar Estratégia de Conteúdo"):
+        prompt = content_strategy_prompt(content_goal, content_audience, content_channels, content_budget)
+        # Exibir resultados em streaming e armazenar
+        st.success("Estratégia de Conteúdo Gerada:")
+        response_text, question = stream_with_followup(
+            prompt, unsafe_allow_html=True, followup_hint="sobre estratégias de conteúdo",
+            semantic=SemanticPrompt(content_strategy_prompt,
+                                    (content_goal, content_audience, content_channels, content_budget), free=(1,))
+        )
+        save_artifact('content_strategy', response_text)
+        show_followup(question)
@@ -0,0 +1,107 @@
+"""Página: Definição do Problema"""
+import time
+import streamlit as st
+from config import COLLECTION_NAME, RETRIEVAL_FANOUT, RETRIEVAL_TOP_K
+from dag import Step, run_dag
+from rag import build_context, multi_query_search, reciprocal_rank_fusion, reranked_search
+from vector_index import get_vector_backend
+from prompts import (
+    followup_instruction,
+    split_followup,
+    split_questions,
+    tension_prompt,
+    tension_refinement_prompt,
+)
+from semantic_cache import SemanticPrompt
+from shared import (
+    get_embeddings,
+    render_stream,
+    retrieve_documents,
+    save_artifact,
+    stream_markdown,
+    streamlit_thread_initializer,
+)
+from telemetry import tagged
+
+st.header("🔍 Definição do Problema Estratégico")
+
+col1, col2 = st.columns(2)
+with col1:
+    business_context = st.text_area(
+        "Contexto do Negócio*",
+        placeholder="Descreva sua organização, mercado e situação atual...",
+        height=150
+    )
+with col2:
+    business_challenge = st.text_area(
+        "Desafio Estratégico*",
+        placeholder="Qual problema ou oportunidade você está enfrentando?",
+        height=150
+    )
+
+if st.button("🔍 Formular Tensão Estratégica", key="btn_tensao"):
+    if not business_context or not business_challenge:
+        st.warning("Preencha todos os campos obrigatórios")
+    else:
+        with st.spinner('Identificando o cerne do problema...'), tagged(action="Formular Tensão Estratégica"):
+            # Passo 1: Gerar a formulação inicial da tensão estratégica
+            prompt = tension_prompt(business_context, business_challenge)
+            # Passos 1 a 3 como grafo de dependências: a busca especulativa sobre o
+            # contexto bruto roda em paralelo à geração da tensão inicial (que já traz
+            # a pergunta de busca no envelope); a busca pela pergunta depende dela.
+            # O rascunho inicial é exibido em streaming enquanto a busca acontece.
+            draft = st.empty()
+            
+            def gerar_tensao_inicial():
+                return split_followup(render_stream(prompt + followup_instruction(
+                    "focadas nos aspectos-chave desta tensão estratégica", count=RETRIEVAL_FANOUT
+                ), False, placeholder=draft,
+                   semantic=SemanticPrompt(tension_prompt, (business_context, business_challenge))))
+            
+            def buscar_pela_pergunta(tensao_inicial):
+                # Variações da pergunta: um embedding em lote e buscas simultâneas, fundidas por RRF
+                _, question_block = tensao_inicial
+                return multi_query_search(
+                    split_questions(question_block),
+                    get_embeddings,
+                    lambda vector: reranked_search(get_vector_backend(), COLLECTION_NAME, vector),
+                    initializer=streamlit_thread_initializer()
+                )
+            
+            results, timings = run_dag([
+                Step("tensao_inicial", gerar_tensao_inicial),
+                Step("busca_especulativa",
+                     lambda: retrieve_documents(f"{business_context}\n{business_challenge}")),
+                Step("busca_pergunta", buscar_pela_pergunta, deps=("tensao_inicial",)),
+            ], initializer=streamlit_thread_initializer())
+            initial_text, search_question = results["tensao_inicial"]
+            rag_context = build_context(reciprocal_rank_fusion(
+                [results["busca_pergunta"], results["busca_especulativa"]], limit=RETRIEVAL_TOP_K
+            ))
+            if not rag_context:
+                rag_context = "Não foi possível recuperar informações adicionais."
+            
+            # Passo 4: Aprimorar a resposta inicial com o contexto RAG
+            refinement_prompt = tension_refinement_prompt(initial_text, rag_context)
+            # Exibir a resposta refinada em streaming e armazenar resultados
+            draft.empty()
+            st.success("Tensão Estratégica Identificada:")
+            started = time.perf_counter()
+            refined_text = stream_markdown(refinement_prompt)
+            timings["refinamento"] = time.perf_counter() - started
+            
+            save_artifact('strategic_tension', refined_text)
+            save_artifact('rag_context', rag_context)
+            
+            # Opcional: mostrar informações recuperadas (pode ser colapsado)
+            with st.expander("Ver informações de apoio utilizadas"):
+                st.markdown("**Perguntas de busca:**")
+                for search_variant in split_questions(search_question):
+                    st.markdown(f"- {search_variant}")
+                st.markdown("**Informações recuperadas:**")
+                st.write(rag_context)
+            
+            st.session_state['tension_timings'] = timings
+            with st.expander("Tempos por etapa"):
+                for step_name, seconds in timings.items():
+                    st.caption(f"{step_name}: {seconds:.2f} s")
@@ -0,0 +1,71 @@
+"""Página: Estratégias e Briefings"""
+import streamlit as st
+from prompting import PromptSection
+from prompts import briefing_prompt, framework_prompt, strategy_options_prompt
+from shared import (
+    fit_prompt_sections,
+    get_artifact,
+    save_artifact,
+    show_followup,
+    show_prompt_size,
+    stream_with_followup,
+    tension_insight_sections,
+)
+from telemetry import tagged
+
+st.header("🛠️ Desenvolvimento de Estratégias")
+
+insights = get_artifact('strategic_insights')
+if insights is None:
+    st.info("ℹ️ Gere insights primeiro na página anterior")
+else:
+    st.markdown("**Insights Atuais:**")
+    st.markdown(insights, unsafe_allow_html=True)
+    
+    strategy_tab1, strategy_tab2, strategy_tab3 = st.tabs([
+        "📋 Opções Estratégicas",
+        "✍️ Briefs Estratégicos",
+        "🎯 Frameworks"
+    ])
+    
+    with strategy_tab1:
+        if st.button("🔄 Gerar Opções Estratégicas"):
+            with st.spinner('Criando alternativas estratégicas...'), tagged(action="Gerar Opções Estratégicas"):
+                fitted = fit_prompt_sections(
+                    [PromptSection("Insights", insights, summarizable=True)],
+                    "estrategias"
+                )
+                prompt = strategy_options_prompt(fitted.texts['Insights'])
+                show_prompt_size(prompt, fitted)
+                response_text, question = stream_with_followup(prompt)
+                save_artifact('strategy_options', response_text)
+                show_followup(question)
+    
+    with strategy_tab2:
+        briefing_type = st.selectbox(
+            "Tipo de Briefing",
+            ["Client Brief (Negócio)", "Creative Brief (Criatividade)", "Tactical Brief (Execução)"]
+        )
+        
+        if st.button(f"📝 Gerar {briefing_type}"):
+            with st.spinner(f'Criando {briefing_type}...'), tagged(action=f"Gerar {briefing_type}"):
+                fitted = fit_prompt_sections(tension_insight_sections(), "briefing")
+                prompt = briefing_prompt(briefing_type, fitted.texts['Tensão'], fitted.texts['Insights'])
+                show_prompt_size(prompt, fitted)
+                response_text, question = stream_with_followup(prompt)
+                save_artifact(f'{briefing_type.lower().split()[0]}_brief', response_text)
+                show_followup(question)
+    
+    with strategy_tab3:
+        framework = st.selectbox(
+            "Framework Estratégico",
+            ["GET/TO/BY", "Single Minded Proposition", "Tensão-Insight-Ideia"]
+        )
+        
+        if st.button(f"🖇️ Aplicar {framework}"):
+            with st.spinner(f'Adaptando {framework}...'), tagged(action=f"Aplicar {framework}"):
+                fitted = fit_prompt_sections(tension_insight_sections(), "framework")
+                prompt = framework_prompt(framework, fitted.texts['Tensão'], fitted.texts['Insights'])
+                show_prompt_size(prompt, fitted)
+                response_text, question = stream_with_followup(prompt)
+                show_followup(question)
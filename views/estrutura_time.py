@@ -0,0 +1,16 @@
+"""Página: Estrutura de Time"""
+import streamlit as st
+from prompts import ORG_SIZES, PROJECT_SCOPES, team_structure_prompt
+from shared import show_followup, stream_with_followup
+from telemetry import tagged
+
+st.header("👥 Planejamento de Equipe")
+
+org_size = st.selectbox("Tamanho da Organização", ORG_SIZES)
+project_scope = st.selectbox("Escopo do Projeto", PROJECT_SCOPES)
+
+if st.button("👔 Recomendar Estrutura"):
+    with st.spinner('Desenhando equipe ideal...'), tagged(action="Recomendar Estrutura"):
+        prompt = team_structure_prompt(org_size, project_scope)
+        response_text, question = stream_with_followup(prompt)
+        show_followup(question)
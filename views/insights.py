@@ -0,0 +1,63 @@
+"""Página: Geração de Insights"""
+import streamlit as st
+from prompting import PromptSection
+from prompts import insights_prompt
+from shared import (
+    fit_prompt_sections,
+    get_artifact,
+    save_artifact,
+    show_followup,
+    show_prompt_size,
+    stream_with_followup,
+)
+from telemetry import tagged
+
+st.header("💡 Geração de Insights Estratégicos")
+
+tension = get_artifact('strategic_tension')
+if tension is None:
+    st.info("ℹ️ Comece definindo o problema na primeira página")
+else:
+    st.markdown("**Contexto Atual:**")
+    st.markdown(tension)
+    
+    # Seções de pesquisa, da mais para a menos prioritária no orçamento de tokens
+    research_sections = []
+    secondary = get_artifact('secondary_research')
+    if secondary is not None:
+        st.markdown("**Pesquisa Secundária:**")
+        st.markdown(secondary[:500] + "...")
+        research_sections.append(PromptSection(
+            "Pesquisa Secundária", secondary, priority=2, summarizable=True
+        ))
+    
+    quantitative = get_artifact('quantitative_analysis')
+    if quantitative is not None:
+        st.markdown("**Análise Quantitativa:**")
+        st.markdown(quantitative[:500] + "...")
+        research_sections.append(PromptSection(
+            "Análise Quantitativa", quantitative, priority=2, summarizable=True
+        ))
+    
+    qualitative = get_artifact('qualitative_guide')
+    if qualitative is not None:
+        st.markdown("**Pesquisa Qualitativa:**")
+        st.markdown(qualitative[:500] + "...")
+        research_sections.append(PromptSection(
+            "Pesquisa Qualitativa", qualitative, priority=1, summarizable=True
+        ))
+    
+    if st.button("💡 Gerar Insights Estratégicos"):
+        with st.spinner('Sintetizando dados em insights acionáveis...'), tagged(action="Gerar Insights Estratégicos"):
+            fitted = fit_prompt_sections(
+                [PromptSection("Tensão", tension, priority=3)] + research_sections,
+                "insights"
+            )
+            research_data = "".join(
+                f"\n\n{section.name}:\n{fitted.texts[section.name]}" for section in research_sections
+            )
+            prompt = insights_prompt(fitted.texts['Tensão'], research_data)
+            show_prompt_size(prompt, fitted)
+            response_text, question = stream_with_followup(prompt, unsafe_allow_html=True)
+            save_artifact('strategic_insights', response_text)
+            show_followup(question)
@@ -0,0 +1,45 @@
+"""Página: Estratégia de Marca"""
+import streamlit as st
+from prompts import benefit_ladder_prompt, brand_audit_prompt, brand_prism_prompt
+from semantic_cache import SemanticPrompt
+from shared import show_followup, stream_with_followup
+from telemetry import tagged
+
+st.header("🏷️ Estratégia de Marca")
+
+brand_name = st.text_input("Nome da Marca*")
+brand_category = st.text_input("Categoria/Setor*")
+
+if brand_name and brand_category:
+    brand_tab1, brand_tab2, brand_tab3 = st.tabs([
+        "🔍 Brand Audit",
+        "🪜 Benefit Ladder",
+        "🔮 Brand Prism"
+    ])
+    
+    with brand_tab1:
+        if st.button("🔄 Realizar Brand Audit"):
+            with st.spinner('Analisando identidade da marca...'), tagged(action="Realizar Brand Audit"):
+                prompt = brand_audit_prompt(brand_name, brand_category)
+                response_text, question = stream_with_followup(
+                    prompt, semantic=SemanticPrompt(brand_audit_prompt, (brand_name, brand_category))
+                )
+                show_followup(question)
+    
+    with brand_tab2:
+        if st.button("🪜 Construir Benefit Ladder"):
+            with st.spinner('Criando hierarquia de benefícios...'), tagged(action="Construir Benefit Ladder"):
+                prompt = benefit_ladder_prompt(brand_name, brand_category)
+                response_text, question = stream_with_followup(
+                    prompt, semantic=SemanticPrompt(benefit_ladder_prompt, (brand_name, brand_category))
+                )
+                show_followup(question)
+    
+    with brand_tab3:
+        if st.button("🔮 Definir Brand Prism"):
+            with st.spinner('Desenhando identidade da marca...'), tagged(action="Definir Brand Prism"):
+                prompt = brand_prism_prompt(brand_name, brand_category)
+                response_text, question = stream_with_followup(
+                    prompt, semantic=SemanticPrompt(brand_prism_prompt, (brand_name, brand_category))
+                )
+                show_followup(question)
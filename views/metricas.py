@@ -0,0 +1,43 @@
+"""Página: Métricas e KPIs"""
+import streamlit as st
+from prompts import KPI_GOALS, MARKET_POSITIONS, entry_points_prompt, esov_prompt, kpi_prompt
+from semantic_cache import SemanticPrompt
+from shared import show_followup, stream_with_followup
+from telemetry import tagged
+
+st.header("📈 Métricas e Performance")
+
+goal_tab1, goal_tab2, goal_tab3 = st.tabs([
+    "📊 KPIs por Objetivo",
+    "🔄 ESOV Analysis",
+    "📍 Entry Points"
+])
+
+with goal_tab1:
+    business_goal = st.selectbox("Selecione o Objetivo de Negócio", KPI_GOALS, key="kpi_goal")
+    
+    if st.button("🎯 Gerar Recomendações de KPIs"):
+        with st.spinner('Selecionando métricas relevantes...'), tagged(action="Gerar Recomendações de KPIs"):
+            prompt = kpi_prompt(business_goal)
+            response_text, question = stream_with_followup(prompt)
+            show_followup(question)
+
+with goal_tab2:
+    st.info("ESOV = Share of Voice vs. Share of Market")
+    market_position = st.selectbox("Posição no Mercado", MARKET_POSITIONS)
+    
+    if st.button("📢 Analisar ESOV"):
+        with st.spinner('Calculando relação voz/market share...'), tagged(action="Analisar ESOV"):
+            prompt = esov_prompt(market_position)
+            response_text, question = stream_with_followup(prompt)
+            show_followup(question)
+
+with goal_tab3:
+    st.info("Category Entry Points = Momentos de decisão")
+    product_category = st.text_input("Categoria de Produto", key="cep_category")
+    
+    if st.button("📍 Mapear Entry Points"):
+        with st.spinner('Identificando momentos-chave...'), tagged(action="Mapear Entry Points"):
+            prompt = entry_points_prompt(product_category)
+            response_text, question = stream_with_followup(prompt, semantic=SemanticPrompt(entry_points_prompt, (product_category,)))
+            show_followup(question)
@@ -0,0 +1,175 @@
+"""Respostas pré-computadas das análises cujas entradas são só selectbox.
+
+KPIs, ESOV, estrutura de time e plano de comunicação têm poucas combinações
+possíveis. O job gera cada uma uma única vez e grava um artefato JSON:
+
+    python warm_cache.py --workers 4 [--force]
+
+Em tempo de execução a resposta sai do artefato, sem chamar o modelo. As
+chaves são as do cache de respostas (modelo + configuração + prompt), então
+mudar o template ou o modelo invalida a entrada; o job regenera só o que falta.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import GEMINI_GENERATION_CONFIG, GEMINI_MODEL, WARM_CACHE_PATH, WARM_CACHE_WORKERS
+from llm_cache import cache_key
+from prompts import (
+    BUDGET_RANGES,
+    CAMPAIGN_GOALS,
+    KPI_GOALS,
+    MARKET_POSITIONS,
+    ORG_SIZES,
+    PROJECT_SCOPES,
+    communication_plan_prompt,
+    esov_prompt,
+    followup_instruction,
+    kpi_prompt,
+    team_structure_prompt,
+)
+
+ARTIFACT_FORMAT = 1
+
+# Análise -> (construtor do prompt, opções de cada argumento)
+FINITE_ANALYSES: Dict[str, Tuple[Callable[..., str], Tuple[List[str], ...]]] = {
+    "kpi": (kpi_prompt, (KPI_GOALS,)),
+    "esov": (esov_prompt, (MARKET_POSITIONS,)),
+    "estrutura_time": (team_structure_prompt, (ORG_SIZES, PROJECT_SCOPES)),
+    "comunicacao": (communication_plan_prompt, (CAMPAIGN_GOALS, BUDGET_RANGES)),
+}
+
+
+def enumerate_prompts() -> Dict[str, Dict]:
+    """Chave do cache -> análise, entradas e prompt exato enviado pela página (com o envelope da pergunta)"""
+    prompts = {}
+    for name, (builder, options) in FINITE_ANALYSES.items():
+        for inputs in itertools.product(*options):
+            prompt = builder(*inputs) + followup_instruction()
+            prompts[cache_key(GEMINI_MODEL, GEMINI_GENERATION_CONFIG, prompt)] = {
+                "analysis": name, "inputs": list(inputs), "prompt": prompt,
+            }
+    return prompts
+
+
+class WarmCache:
+    """Leitura do artefato; recarrega quando o arquivo muda (ex.: job rodou com o app no ar)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, str] = {}
+        self._mtime: Optional[float] = None
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            self._entries, self._mtime = {}, None
+            return
+        if mtime == self._mtime:
+            return
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        entries = data.get("entries", {}) if data.get("format") == ARTIFACT_FORMAT else {}
+        self._entries = {key: entry["text"] for key, entry in entries.items()}
+        self._mtime = mtime
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            self._refresh()
+            text = self._entries.get(key)
+            if text is not None:
+                self.hits += 1
+            return text
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._refresh()
+            return {"entries": len(self._entries), "hits": self.hits}
+
+
+@lru_cache(maxsize=None)
+def get_warm_cache() -> WarmCache:
+    """Instância única por processo"""
+    return WarmCache(WARM_CACHE_PATH)
+
+
+def _write_artifact(path: str, entries: Dict[str, Dict]):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    artifact = {
+        "format": ARTIFACT_FORMAT,
+        "model": GEMINI_MODEL,
+        "generation_config": GEMINI_GENERATION_CONFIG,
+        "created_at": time.time(),
+        "entries": entries,
+    }
+    # Escrita atômica: o app nunca lê um arquivo pela metade
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False)
+    os.replace(temporary, path)
+
+
+def warm(path: str = WARM_CACHE_PATH, workers: int = WARM_CACHE_WORKERS, force: bool = False) -> Dict:
+    """Gera as combinações que faltam no artefato e descarta as que não existem mais"""
+    from generation import generate_cached
+    from rate_limit import PRIORITY_BATCH, set_default_priority
+
+    set_default_priority(PRIORITY_BATCH)
+    wanted = enumerate_prompts()
+    existing = {}
+    if not force and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") == ARTIFACT_FORMAT:
+            existing = {key: entry for key, entry in data.get("entries", {}).items() if key in wanted}
+    missing = [key for key in wanted if key not in existing]
+    entries = dict(existing)
+    failed = 0
+    started = time.perf_counter()
+
+    def generate(key: str) -> str:
+        return generate_cached(wanted[key]["prompt"], bypass_cache=force)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(generate, key): key for key in missing}
+        for count, future in enumerate(as_completed(futures), start=1):
+            key = futures[future]
+            try:
+                entries[key] = {"analysis": wanted[key]["analysis"], "inputs": wanted[key]["inputs"],
+                                "text": future.result()}
+            except Exception as e:
+                failed += 1
+                print(f"{wanted[key]['analysis']} {wanted[key]['inputs']}: {type(e).__name__}: {e}", file=sys.stderr)
+            print(f"[{count}/{len(missing)}] {wanted[key]['analysis']} {' · '.join(wanted[key]['inputs'])}",
+                  file=sys.stderr)
+    _write_artifact(path, entries)
+    return {
+        "combinations": len(wanted),
+        "reused": len(existing),
+        "generated": len(missing) - failed,
+        "failed": failed,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pré-computa as análises com entradas finitas")
+    parser.add_argument("--output", default=WARM_CACHE_PATH, help="Arquivo JSON do artefato")
+    parser.add_argument("--workers", type=int, default=WARM_CACHE_WORKERS, help="Gerações simultâneas")
+    parser.add_argument("--force", action="store_true", help="Regenera tudo, ignorando artefato e cache")
+    args = parser.parse_args()
+    print(json.dumps(warm(args.output, args.workers, args.force), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()